@@ -5,13 +5,19 @@ Skoda Connect integration
 Read more at https://github.com/skodaconnect/homeassistant-skodaconnect/
 """
 import re
+import time
+import random
+import uuid
 import asyncio
+import contextvars
 import logging
+from collections import deque
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Union
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigEntry, SOURCE_REAUTH, SOURCE_IMPORT
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState, SOURCE_REAUTH, SOURCE_IMPORT
 from homeassistant.const import (
     CONF_NAME,
     CONF_PASSWORD,
@@ -19,17 +25,32 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
     EVENT_HOMEASSISTANT_STOP,
+    ATTR_AREA_ID,
+    ATTR_DEVICE_ID,
+    ATTR_FLOOR_ID,
+    ATTR_LABEL_ID,
+)
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+    ServiceValidationError,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv, device_registry
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.icon import icon_for_battery_level
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from skodaconnect import Connection
+from skodaconnect.__version__ import __version__ as lib_version
+from skodaconnect.dashboard import Dashboard
 from skodaconnect.vehicle import Vehicle
 from skodaconnect.exceptions import (
     SkodaConfigException,
@@ -45,6 +66,7 @@ from skodaconnect.exceptions import (
     SkodaRequestInProgressException
 )
 
+from .cassette import CASSETTE_SUFFIX, REDACTED_USERNAME, CassetteRecorder
 from .const import (
     PLATFORMS,
     CONF_MUTABLE,
@@ -58,33 +80,112 @@ from .const import (
     CONF_NO_CONVERSION,
     CONF_IMPERIAL_UNITS,
     CONF_SAVESESSION,
+    CONF_FLEET_MODE,
+    CONF_FLEET_CONCURRENCY,
+    CONF_ADAPTIVE_POLLING,
+    CONF_REFRESH_SETTLE,
+    CONF_RECORD,
+    ADAPTIVE_ACTIVE_ATTRS,
+    ADAPTIVE_ACTIVE_INTERVAL,
+    ADAPTIVE_IDLE_INTERVAL,
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    BACKOFF_THROTTLED,
+    BREAKER_CLOSED,
+    BREAKER_COOLDOWN,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    BREAKER_THRESHOLD,
     DATA,
     DATA_KEY,
+    HUBS,
+    DEVICES,
     MIN_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_DEBUG,
+    DEFAULT_FLEET_CONCURRENCY,
+    DEFAULT_REFRESH_SETTLE,
+    FLEET_STAGGER,
     DOMAIN,
     SIGNAL_STATE_UPDATED,
+    SIGNAL_API_STATUS,
+    OPTIMISTIC_TIMEOUT,
+    DATA_GROUPS,
+    DATA_GROUP_STATUS,
+    DATA_GROUP_PREFIXES,
+    ATTR_DATA_GROUPS,
+    FULL_UPDATE_INTERVAL,
+    DATA_GROUP_INTERVALS,
+    SERVICE_DATA_GROUPS,
+    TIMER_CHARGE_LIMITS,
+    TIMER_LIBRARY_VERSION,
+    ATTR_WAIT,
+    EVENT_COMMAND_PROGRESS,
+    EVENT_COMMAND_COMPLETED,
+    EVENT_COMMAND_FAILED,
+    REQUEST_QUEUED,
+    REQUEST_RUNNING,
+    REQUEST_COMPLETED,
+    REQUEST_FAILED,
+    SIGNAL_COMMAND_QUEUE,
+    SNAPSHOT_INSTRUMENT_ATTRS,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_VEHICLE_ATTRS,
+    STORAGE_VERSION,
     UNDO_UPDATE_LISTENER,
     REMOVE_LISTENER,
     UPDATE_CALLBACK,
     SERVICE_SET_SCHEDULE,
+    SERVICE_SET_SCHEDULES,
     SERVICE_SET_MAX_CURRENT,
     SERVICE_SET_CHARGE_LIMIT,
     SERVICE_SET_CLIMATER,
     SERVICE_SET_PHEATER_DURATION,
 )
 
-SERVICE_SET_SCHEDULE_SCHEMA = vol.Schema(
+# Services target one or more vehicles by device, area, floor or label
+SERVICE_TARGETS = (ATTR_DEVICE_ID, ATTR_AREA_ID, ATTR_FLOOR_ID, ATTR_LABEL_ID)
+SERVICE_TARGET_FIELDS = {
+    vol.Optional(target): vol.All(cv.ensure_list, [cv.string])
+    for target in SERVICE_TARGETS
+}
+# Return right away with request IDs instead of waiting for completion
+SERVICE_TARGET_FIELDS[vol.Optional(ATTR_WAIT, default=True)] = cv.boolean
+SERVICE_SET_SCHEDULE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **SERVICE_TARGET_FIELDS,
+            vol.Required("id"): vol.In([1,2,3]),
+            vol.Required("time"): cv.string,
+            vol.Required("enabled"): cv.boolean,
+            vol.Required("recurring"): cv.boolean,
+            vol.Optional("date"): cv.string,
+            vol.Optional("days"): cv.string,
+            vol.Optional("temp"): vol.All(vol.Coerce(float), vol.Range(min=16, max=30)),
+            vol.Optional("climatisation"): cv.boolean,
+            vol.Optional("charging"): cv.boolean,
+            vol.Optional("charge_current"): vol.Any(
+                vol.Range(min=1, max=254),
+                vol.In(['Maximum', 'maximum', 'Max', 'max', 'Minimum', 'minimum', 'Min', 'min', 'Reduced', 'reduced'])
+            ),
+            vol.Optional("charge_target"): vol.In([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]),
+            vol.Optional("heater_source"): cv.boolean,
+            vol.Optional("spin"): vol.All(cv.string, vol.Match(r"^[0-9]{4}$")),
+            vol.Optional("off_peak_active"): cv.boolean,
+            vol.Optional("off_peak_start"): cv.string,
+            vol.Optional("off_peak_end"): cv.string,
+        }
+    ),
+    cv.has_at_least_one_key(*SERVICE_TARGETS),
+)
+SERVICE_DEPARTURE_TIMER_SCHEMA = vol.Schema(
     {
-        vol.Required("device_id"): vol.All(cv.string, vol.Length(min=32, max=32)),
         vol.Required("id"): vol.In([1,2,3]),
         vol.Required("time"): cv.string,
         vol.Required("enabled"): cv.boolean,
         vol.Required("recurring"): cv.boolean,
         vol.Optional("date"): cv.string,
         vol.Optional("days"): cv.string,
-        vol.Optional("temp"): vol.All(vol.Coerce(float), vol.Range(min=16, max=30)),
         vol.Optional("climatisation"): cv.boolean,
         vol.Optional("charging"): cv.boolean,
         vol.Optional("charge_current"): vol.Any(
@@ -92,43 +193,68 @@ SERVICE_SET_SCHEDULE_SCHEMA = vol.Schema(
             vol.In(['Maximum', 'maximum', 'Max', 'max', 'Minimum', 'minimum', 'Min', 'min', 'Reduced', 'reduced'])
         ),
         vol.Optional("charge_target"): vol.In([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]),
-        vol.Optional("heater_source"): cv.boolean,
-        vol.Optional("spin"): vol.All(cv.string, vol.Match(r"^[0-9]{4}$")),
-        vol.Optional("off_peak_active"): cv.boolean,
-        vol.Optional("off_peak_start"): cv.string,
-        vol.Optional("off_peak_end"): cv.string,
     }
 )
-SERVICE_SET_MAX_CURRENT_SCHEMA = vol.Schema(
-    {
-        vol.Required("device_id"): vol.All(cv.string, vol.Length(min=32, max=32)),
-        vol.Required("current"): vol.Any(
-            vol.Range(min=1, max=255),
-            vol.In(['Maximum', 'maximum', 'Max', 'max', 'Minimum', 'minimum', 'Min', 'min', 'Reduced', 'reduced'])
-        ),
-    }
+SERVICE_SET_SCHEDULES_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **SERVICE_TARGET_FIELDS,
+            vol.Required("timers"): vol.All(
+                cv.ensure_list, [SERVICE_DEPARTURE_TIMER_SCHEMA], vol.Length(min=1, max=3)
+            ),
+            vol.Optional("temp"): vol.All(vol.Coerce(float), vol.Range(min=16, max=30)),
+            vol.Optional("heater_source"): cv.boolean,
+            vol.Optional("spin"): vol.All(cv.string, vol.Match(r"^[0-9]{4}$")),
+            vol.Optional("off_peak_active"): cv.boolean,
+            vol.Optional("off_peak_start"): cv.string,
+            vol.Optional("off_peak_end"): cv.string,
+            vol.Optional("charge_limit"): vol.In([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]),
+        }
+    ),
+    cv.has_at_least_one_key(*SERVICE_TARGETS),
 )
-SERVICE_SET_CHARGE_LIMIT_SCHEMA = vol.Schema(
-    {
-        vol.Required("device_id"): vol.All(cv.string, vol.Length(min=32, max=32)),
-        vol.Required("limit"): vol.In([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]),
-    }
+SERVICE_SET_MAX_CURRENT_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **SERVICE_TARGET_FIELDS,
+            vol.Required("current"): vol.Any(
+                vol.Range(min=1, max=255),
+                vol.In(['Maximum', 'maximum', 'Max', 'max', 'Minimum', 'minimum', 'Min', 'min', 'Reduced', 'reduced'])
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(*SERVICE_TARGETS),
 )
-SERVICE_SET_CLIMATER_SCHEMA = vol.Schema(
-    {
-        vol.Required("device_id"): vol.All(cv.string, vol.Length(min=32, max=32)),
-        vol.Required("enabled", default=True): cv.boolean,
-        vol.Optional("temp"): vol.All(vol.Coerce(float), vol.Range(min=16, max=30)),
-        vol.Optional("battery_power"): cv.boolean,
-        vol.Optional("aux_heater"): cv.boolean,
-        vol.Optional("spin"): vol.All(cv.string, vol.Match(r"^[0-9]{4}$"))
-    }
+SERVICE_SET_CHARGE_LIMIT_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **SERVICE_TARGET_FIELDS,
+            vol.Required("limit"): vol.In([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]),
+        }
+    ),
+    cv.has_at_least_one_key(*SERVICE_TARGETS),
 )
-SERVICE_SET_PHEATER_DURATION_SCHEMA = vol.Schema(
-    {
-        vol.Required("device_id"): vol.All(cv.string, vol.Length(min=32, max=32)),
-        vol.Required("duration"): vol.In([10, 20, 30, 40, 50, 60]),
-    }
+SERVICE_SET_CLIMATER_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **SERVICE_TARGET_FIELDS,
+            vol.Required("enabled", default=True): cv.boolean,
+            vol.Optional("temp"): vol.All(vol.Coerce(float), vol.Range(min=16, max=30)),
+            vol.Optional("battery_power"): cv.boolean,
+            vol.Optional("aux_heater"): cv.boolean,
+            vol.Optional("spin"): vol.All(cv.string, vol.Match(r"^[0-9]{4}$"))
+        }
+    ),
+    cv.has_at_least_one_key(*SERVICE_TARGETS),
+)
+SERVICE_SET_PHEATER_DURATION_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **SERVICE_TARGET_FIELDS,
+            vol.Required("duration"): vol.In([10, 20, 30, 40, 50, 60]),
+        }
+    ),
+    cv.has_at_least_one_key(*SERVICE_TARGETS),
 )
 
 # Set max parallel updates to 2 simultaneous (1 poll and 1 request waiting)
@@ -139,34 +265,19 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Setup Skoda Connect component from a config entry."""
+    setup_started = time.monotonic()
     hass.data.setdefault(DOMAIN, {})
 
-    if entry.options.get(CONF_SCAN_INTERVAL):
-        update_interval = timedelta(seconds=entry.options[CONF_SCAN_INTERVAL])
-    else:
-        update_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
-    if update_interval < timedelta(seconds=MIN_SCAN_INTERVAL):
-        update_interval = timedelta(seconds=MIN_SCAN_INTERVAL)
-
-    coordinator = SkodaCoordinator(hass, entry, update_interval)
-
-    try:
-        if not await coordinator.async_login():
-            await hass.config_entries.flow.async_init(
-                DOMAIN,
-                context={"source": SOURCE_REAUTH},
-                data=entry,
-            )
-            return False
-    except (SkodaAuthenticationException, SkodaAccountLockedException, SkodaLoginFailedException) as e:
-        raise ConfigEntryAuthFailed(e) from e
-    except Exception as e:
-        raise ConfigEntryNotReady(e) from e
+    coordinator = SkodaCoordinator(hass, entry, get_scan_interval(entry))
 
-    # Do a first update of all vehicles
-    await coordinator.async_refresh()
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+    if await coordinator.async_restore_snapshot():
+        # Set up from last known state, login and refresh in the background
+        _LOGGER.debug(f"Restored last known state for {coordinator.vin}")
+        entry.async_create_background_task(
+            hass, coordinator.async_connect(), f"{DOMAIN}_connect_{coordinator.vin}"
+        )
+    elif not await _async_connect_entry(hass, entry, coordinator):
+        return False
 
     # Get parent device
     try:
@@ -190,8 +301,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     new_instruments = {}
 
     def is_enabled(attr):
-        """Return true if the user has enabled the resource."""
-        return attr in entry.data.get(CONF_RESOURCES, [attr])
+        """Return true if the user has enabled the resource, all are if never set."""
+        # Resources changed in the options take precedence
+        resources = entry.options.get(CONF_RESOURCES, entry.data.get(CONF_RESOURCES))
+        return resources is None or attr in resources
 
     components = set()
 
@@ -250,239 +363,449 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             EVENT_HOMEASSISTANT_STOP, coordinator.async_logout
         ),
     }
+    async_invalidate_devices(hass)
 
-    for component in components:
-        coordinator.platforms.append(component)
-        await hass.config_entries.async_forward_entry_setup(entry, component)
-
-    # Service functions
-    async def get_car(service_call):
-        """Get VIN associated with HomeAssistant device ID."""
-        # Get device entry
-        dev_id = service_call.data.get("device_id")
-        dev_reg = device_registry.async_get(hass)
-        dev_entry = dev_reg.async_get(dev_id)
-
-        # Get vehicle VIN from device identifiers
-        skoda_identifiers = [
-            identifier
-            for identifier in dev_entry.identifiers
-            if identifier[0] == DOMAIN
-        ]
-        vin_identifier = next(iter(skoda_identifiers))
-        vin = vin_identifier[1]
+    if coordinator.fleet_mode:
+        coordinator.async_join_fleet()
 
-        # Get coordinator handling the device entry
-        conf_entry = next(iter(dev_entry.config_entries))
-        try:
-            dev_coordinator = hass.data[DOMAIN][conf_entry]['data'].coordinator
-        except:
-            raise SkodaConfigException('Could not find associated coordinator for given vehicle')
+    # Diagnostic sensors are always added
+    components.add(PLATFORMS["sensor"])
 
-        # Return with associated Vehicle class object
-        return dev_coordinator.connection.vehicle(vin)
+    # Forward all platforms in one batch
+    coordinator.platforms.extend(
+        platform for platform in PLATFORMS if platform in components
+    )
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
+    coordinator.setup_time = time.monotonic() - setup_started
+    _LOGGER.debug(
+        f"Setup of {coordinator.vin} with {len(coordinator.platforms)} platforms took {coordinator.setup_time:.2f}s"
+    )
 
+    # Service functions, each runs for all targeted vehicles
     async def set_schedule(service_call=None):
         """Set departure schedule."""
         try:
             # Prepare data
             id = service_call.data.get("id", 0)
-            temp = None
             spin = service_call.data.get("spin", None)
+            schedule = departure_schedule(service_call.data, service_call.data)
+        except (SkodaInvalidRequestException) as e:
+            _LOGGER.warning(f"Service call 'set_schedule' failed. {e}")
+            raise ServiceValidationError(str(e)) from e
 
-
-            # Convert datetime objects to simple strings or check that strings are correctly formatted
-            try:
-                time = service_call.data.get("time").strftime("%H:%M")
-            except:
-                if re.match('^[0-9]{2}:[0-9]{2}$', service_call.data.get('time', '')):
-                    time = service_call.data.get("time", "08:00")
-                else:
-                    raise SkodaInvalidRequestException(f"Invalid time string: {service_call.data.get('time')}")
-            if service_call.data.get("off_peak_start", False):
-                try:
-                    peakstart = service_call.data.get("off_peak_start").strftime("%H:%M")
-                except:
-                    if re.match('^[0-9]{2}:[0-9]{2}$', service_call.data.get("off_peak_start", "")):
-                        peakstart = service_call.data.get("off_peak_start", "00:00")
-                    else:
-                        raise SkodaInvalidRequestException(f"Invalid value for off peak start hours: {service_call.data.get('off_peak_start')}")
-            if service_call.data.get("off_peak_end", False):
-                try:
-                    peakend = service_call.data.get("off_peak_end").strftime("%H:%M")
-                except:
-                    if re.match('^[0-9]{2}:[0-9]{2}$', service_call.data.get("off_peak_end", "")):
-                        peakend = service_call.data.get("off_peak_end", "00:00")
-                    else:
-                        raise SkodaInvalidRequestException(f"Invalid value for off peak end hours: {service_call.data.get('off_peak_end')}")
-
-            # Convert to parseable data
-            schedule = {
-                "id": service_call.data.get("id", 1),
-                "enabled": service_call.data.get("enabled"),
-                "recurring": service_call.data.get("recurring"),
-                "date": service_call.data.get("date"),
-                "time": time,
-                "days": service_call.data.get("days", "nnnnnnn"),
-            }
-            # Set optional values
-            # Heater source
-            if service_call.data.get("heater_source", None) is not None:
-                if service_call.data.get("heater_source", False) is True:
-                    if spin is None:
-                        raise SkodaInvalidRequestException("S-PIN is required when using auxiliary heater.")
-                    schedule["heaterSource"] = "automatic"
-                else:
-                    schedule["heaterSource"] = "electric"
-            # Night rate
-            if service_call.data.get("off_peak_active", None) is not None:
-                schedule["nightRateActive"] = service_call.data.get("off_peak_active")
-            if service_call.data.get("off_peak_start", None) is not None:
-                schedule["nightRateTimeStart"] = service_call.data.get("off_peak_start")
-            if service_call.data.get("off_peak_end", None) is not None:
-                schedule["nightRateTimeEnd"] = service_call.data.get("off_peak_end")
-            # Climatisation and charging options
-            if service_call.data.get("climatisation", None) is not None:
-                schedule["operationClimatisation"] = service_call.data.get("climatisation")
-            if service_call.data.get("charging", None) is not None:
-                schedule["operationCharging"] = service_call.data.get("charging")
-            if service_call.data.get("charge_target", None) is not None:
-                schedule["targetChargeLevel"] = service_call.data.get("charge_target")
-            if service_call.data.get("charge_current", None) is not None:
-                schedule["chargeMaxCurrent"] = service_call.data.get("charge_current")
-            # Global optional options
-            if service_call.data.get("temp", None) is not None:
-                schedule["targetTemp"] = service_call.data.get("temp")
-
-            # Find the correct car and execute service call
-            car = await get_car(service_call)
+        async def action(car_coordinator, car):
             _LOGGER.info(f'Set departure schedule {id} with data {schedule} for car {car.vin}')
-            state = await car.set_timer_schedule(id, schedule, spin)
+            state = await car_coordinator.commands.async_run(
+                SERVICE_SET_SCHEDULE, car.set_timer_schedule, id, timer_schedule(car, schedule), spin
+            )
             if state is not False:
                 _LOGGER.debug(f"Service call 'set_schedule' executed without error")
-                await coordinator.async_request_refresh()
+                car_coordinator.async_schedule_refresh(SERVICE_DATA_GROUPS[SERVICE_SET_SCHEDULE])
             else:
                 _LOGGER.warning(f"Failed to execute service call 'set_schedule' with data '{service_call}'")
+            return state
+
+        return await async_call_vehicles(hass, service_call, SERVICE_SET_SCHEDULE, action)
+
+    async def set_schedules(service_call=None):
+        """Set all departure schedules and their shared settings."""
+        try:
+            spin = service_call.data.get("spin", None)
+            limit = service_call.data.get("charge_limit", None)
+            # Every timer request sends the shared settings of all timers
+            schedules = [
+                departure_schedule(timer, service_call.data)
+                for timer in service_call.data["timers"]
+            ]
         except (SkodaInvalidRequestException) as e:
-            _LOGGER.warning(f"Service call 'set_schedule' failed. {e}")
-        except Exception as e:
-            raise
+            _LOGGER.warning(f"Service call 'set_schedules' failed. {e}")
+            raise ServiceValidationError(str(e)) from e
+
+        async def action(car_coordinator, car):
+            _LOGGER.info(f'Set departure schedules with data {schedules} for car {car.vin}')
+            # The API takes one timer per request, queue them back to back
+            for schedule in schedules:
+                schedule = timer_schedule(car, schedule)
+                state = await car_coordinator.commands.async_run(
+                    SERVICE_SET_SCHEDULE, car.set_timer_schedule, schedule["id"], schedule, spin
+                )
+                if state is False:
+                    _LOGGER.warning(f"Failed to set departure schedule {schedule['id']} for car {car.vin}")
+                    break
+            else:
+                if limit is not None:
+                    state = await car_coordinator.commands.async_run(
+                        SERVICE_SET_CHARGE_LIMIT, set_timer_charge_limit, car, limit, service_call.data.get("temp")
+                    )
+            car_coordinator.async_schedule_refresh(SERVICE_DATA_GROUPS[SERVICE_SET_SCHEDULES])
+            if state is not False:
+                _LOGGER.debug(f"Service call 'set_schedules' executed without error")
+            return state
+
+        return await async_call_vehicles(hass, service_call, SERVICE_SET_SCHEDULES, action)
 
     async def set_charge_limit(service_call=None):
         """Set minimum charge limit."""
-        try:
-            car = await get_car(service_call)
+        # Get charge limit
+        limit = service_call.data.get("limit", 50)
 
-            # Get charge limit and execute service call
-            limit = service_call.data.get("limit", 50)
-            state = await car.set_charge_limit(limit)
+        async def action(car_coordinator, car):
+            state = await car_coordinator.commands.async_run(
+                SERVICE_SET_CHARGE_LIMIT, car.set_charge_limit, limit
+            )
             if state is not False:
                 _LOGGER.debug(f"Service call 'set_charge_limit' executed without error")
-                await coordinator.async_request_refresh()
+                car_coordinator.async_schedule_refresh(SERVICE_DATA_GROUPS[SERVICE_SET_CHARGE_LIMIT])
             else:
                 _LOGGER.warning(f"Failed to execute service call 'set_charge_limit' with data '{service_call}'")
-        except (SkodaInvalidRequestException) as e:
-            _LOGGER.warning(f"Service call 'set_charge_limit' failed {e}")
-        except Exception as e:
-            raise
+            return state
+
+        return await async_call_vehicles(hass, service_call, SERVICE_SET_CHARGE_LIMIT, action)
 
     async def set_current(service_call=None):
-        """Set departure schedule."""
-        try:
-            car = await get_car(service_call)
+        """Set max charging current."""
+        # Get charge current
+        current = service_call.data.get('current', None)
 
-            # Get charge current and execute service call
-            current = service_call.data.get('current', None)
-            state = await car.set_charger_current(current)
+        async def action(car_coordinator, car):
+            state = await car_coordinator.commands.async_run(
+                SERVICE_SET_MAX_CURRENT, car.set_charger_current, current
+            )
             if state is not False:
                 _LOGGER.debug(f"Service call 'set_current' executed without error")
-                await coordinator.async_request_refresh()
+                car_coordinator.async_schedule_refresh(SERVICE_DATA_GROUPS[SERVICE_SET_MAX_CURRENT])
             else:
                 _LOGGER.warning(f"Failed to execute service call 'set_current' with data '{service_call}'")
-        except (SkodaInvalidRequestException) as e:
-            _LOGGER.warning(f"Service call 'set_current' failed {e}")
-        except Exception as e:
-            raise
+            return state
+
+        return await async_call_vehicles(hass, service_call, SERVICE_SET_MAX_CURRENT, action)
 
     async def set_pheater_duration(service_call=None):
         """Set duration for parking heater."""
-        try:
-            car = await get_car(service_call)
+        async def action(car_coordinator, car):
             car.pheater_duration = service_call.data.get("duration", car.pheater_duration)
             _LOGGER.debug(f"Service call 'set_pheater_duration' executed without error")
-            await coordinator.async_request_refresh()
-        except (SkodaInvalidRequestException) as e:
-            _LOGGER.warning(f"Service call 'set_pheater_duration' failed {e}")
-        except Exception as e:
-            raise
+            # Only stored locally, nothing to fetch
+            car_coordinator.async_update_listeners()
+            return True
+
+        return await async_call_vehicles(hass, service_call, SERVICE_SET_PHEATER_DURATION, action)
 
     async def set_climater(service_call=None):
         """Start or stop climatisation with options."""
-        try:
-            car = await get_car(service_call)
+        if service_call.data.get('enabled'):
+            mode = 'auxiliary' if service_call.data.get('aux_heater', False) else 'electric'
+            temp = service_call.data.get('temp', None)
+            hvpower = service_call.data.get('battery_power', None)
+            spin = service_call.data.get('spin', None)
+        else:
+            mode = 'off'
+            temp = hvpower = spin = None
 
-            if service_call.data.get('enabled'):
-                action = 'auxiliary' if service_call.data.get('aux_heater', False) else 'electric'
-                temp = service_call.data.get('temp', None)
-                hvpower = service_call.data.get('battery_power', None)
-                spin = service_call.data.get('spin', None)
-            else:
-                action = 'off'
-                temp = hvpower = spin = None
-            # Execute service call
-            if await car.set_climatisation(action, temp, hvpower, spin) is True:
+        async def action(car_coordinator, car):
+            state = await car_coordinator.commands.async_run(
+                SERVICE_SET_CLIMATER, car.set_climatisation, mode, temp, hvpower, spin
+            )
+            if state is True:
                 _LOGGER.debug("Service call 'set_climater' executed without error")
-                await coordinator.async_request_refresh()
+                car_coordinator.async_schedule_refresh(SERVICE_DATA_GROUPS[SERVICE_SET_CLIMATER])
             else:
                 _LOGGER.warning(f"Failed to execute service call 'set_climater' with data '{service_call}'")
-        except (SkodaInvalidRequestException) as e:
-            _LOGGER.warning(f"Service call 'set_climater' failed {e}")
-        except Exception as e:
-            raise
+            return state is True
+
+        return await async_call_vehicles(hass, service_call, SERVICE_SET_CLIMATER, action)
 
     # Register services
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_SCHEDULE,
         set_schedule,
+        supports_response=SupportsResponse.OPTIONAL,
         schema = SERVICE_SET_SCHEDULE_SCHEMA
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SCHEDULES,
+        set_schedules,
+        supports_response=SupportsResponse.OPTIONAL,
+        schema = SERVICE_SET_SCHEDULES_SCHEMA
+    )
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_MAX_CURRENT,
         set_current,
+        supports_response=SupportsResponse.OPTIONAL,
         schema = SERVICE_SET_MAX_CURRENT_SCHEMA
     )
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_CHARGE_LIMIT,
         set_charge_limit,
+        supports_response=SupportsResponse.OPTIONAL,
         schema = SERVICE_SET_CHARGE_LIMIT_SCHEMA
     )
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_CLIMATER,
         set_climater,
+        supports_response=SupportsResponse.OPTIONAL,
         schema = SERVICE_SET_CLIMATER_SCHEMA
     )
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_PHEATER_DURATION,
         set_pheater_duration,
+        supports_response=SupportsResponse.OPTIONAL,
         schema = SERVICE_SET_PHEATER_DURATION_SCHEMA
     )
     return True
 
-def update_callback(hass, coordinator):
+async def _async_connect_entry(hass: HomeAssistant, entry: ConfigEntry, coordinator):
+    """Login and do a first update before the entry is set up."""
+    try:
+        if not await coordinator.async_login():
+            await coordinator.async_release()
+            await hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_REAUTH},
+                data=entry,
+            )
+            return False
+    except (SkodaAuthenticationException, SkodaAccountLockedException, SkodaLoginFailedException) as e:
+        await coordinator.async_release()
+        raise ConfigEntryAuthFailed(e) from e
+    except Exception as e:
+        await coordinator.async_release()
+        raise ConfigEntryNotReady(e) from e
+
+    # Do a first update of all vehicles
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        await coordinator.async_release()
+        raise ConfigEntryNotReady
+    return True
+
+def service_time(data, key, default=None):
+    """Return a time from service data as HH:MM string."""
+    # Convert datetime objects to simple strings or check that strings are correctly formatted
+    value = data.get(key, default)
+    try:
+        return value.strftime("%H:%M")
+    except AttributeError:
+        if isinstance(value, str) and re.match('^[0-9]{2}:[0-9]{2}$', value):
+            return value
+    raise SkodaInvalidRequestException(f"Invalid time string for {key}: {value}")
+
+def departure_schedule(timer, settings=None):
+    """Return the library schedule for a departure timer.
+
+    Settings shared by all timers (night rate, heater source and temperature)
+    are added when given.
+    """
+    schedule = {
+        "id": timer.get("id", 1),
+        "enabled": timer.get("enabled"),
+        "recurring": timer.get("recurring"),
+        "date": timer.get("date"),
+        "time": service_time(timer, "time"),
+        "days": timer.get("days", "nnnnnnn"),
+    }
+    # Climatisation and charging options
+    if timer.get("climatisation", None) is not None:
+        schedule["operationClimatisation"] = timer.get("climatisation")
+    if timer.get("charging", None) is not None:
+        schedule["operationCharging"] = timer.get("charging")
+    if timer.get("charge_target", None) is not None:
+        schedule["targetChargeLevel"] = timer.get("charge_target")
+    if timer.get("charge_current", None) is not None:
+        schedule["chargeMaxCurrent"] = timer.get("charge_current")
+    if settings is None:
+        return schedule
+
+    # Heater source
+    if settings.get("heater_source", None) is not None:
+        if settings.get("heater_source", False) is True:
+            if settings.get("spin", None) is None:
+                raise SkodaInvalidRequestException("S-PIN is required when using auxiliary heater.")
+            schedule["heaterSource"] = "automatic"
+        else:
+            schedule["heaterSource"] = "electric"
+    # Night rate
+    if settings.get("off_peak_active", None) is not None:
+        schedule["nightRateActive"] = settings.get("off_peak_active")
+    if settings.get("off_peak_start", None):
+        schedule["nightRateTimeStart"] = service_time(settings, "off_peak_start")
+    if settings.get("off_peak_end", None):
+        schedule["nightRateTimeEnd"] = service_time(settings, "off_peak_end")
+    # Global optional options
+    if settings.get("temp", None) is not None:
+        schedule["targetTemp"] = settings.get("temp")
+    return schedule
+
+def timer_temperature(car):
+    """Return the target temperature of the departure timers, None if unknown."""
+    settings = (
+        car.attrs.get("departuretimer", {}).get("timersAndProfiles", {}).get("timerBasicSetting", {})
+    )
+    temperature = settings.get("targetTemperature")
+    if temperature is None:
+        return None
+    # Kelvin in tenths, rounded to the half degrees the API takes
+    return round((temperature / 10 - 273) * 2) / 2
+
+def timer_schedule(car, schedule):
+    """Return a schedule that keeps the current timer temperature if it sets none.
+
+    Every timer request carries the target temperature of all timers, the
+    library sends the climatisation temperature for requests without one.
+    """
+    temperature = timer_temperature(car)
+    if schedule.get("targetTemp") is not None or temperature is None:
+        return schedule
+    return {**schedule, "targetTemp": temperature}
+
+async def set_timer_charge_limit(car, limit, temp=None):
+    """Set the minimum charge limit after the departure timers, keeping their temperature.
+
+    skodaconnect 1.3.11 sends the climatisation temperature with the limit,
+    replacing the temperature just set for the timers. Only for that version
+    the timer request of the library is used directly.
+    """
+    if temp is None:
+        temp = timer_temperature(car)
+    if lib_version != TIMER_LIBRARY_VERSION or temp is None or limit not in TIMER_CHARGE_LIMITS:
+        # Native API, or a limit the library rejects with its own error
+        return await car.set_charge_limit(limit)
+    return await car._set_timers({"action": "chargelimit", "limit": limit, "temp": temp})
+
+def update_callback(hass, coordinator, groups=None):
     _LOGGER.debug("CALLBACK!")
-    hass.async_create_task(
-        coordinator.async_request_refresh()
+    coordinator.async_schedule_refresh(groups)
+
+@callback
+def async_invalidate_devices(hass: HomeAssistant):
+    """Drop the device map, it is rebuilt on the next service call."""
+    hass.data.get(DOMAIN, {}).pop(DEVICES, None)
+
+@callback
+def async_get_devices(hass: HomeAssistant) -> dict:
+    """Return the coordinators of loaded vehicles by device ID."""
+    devices = hass.data[DOMAIN].get(DEVICES)
+    if devices is None:
+        devices = hass.data[DOMAIN][DEVICES] = {}
+        dev_reg = device_registry.async_get(hass)
+        for entry_data in hass.data[DOMAIN].values():
+            if not isinstance(entry_data, dict) or DATA not in entry_data:
+                continue
+            coordinator = entry_data[DATA].coordinator
+            for dev_entry in device_registry.async_entries_for_config_entry(
+                dev_reg, coordinator.entry.entry_id
+            ):
+                if (DOMAIN, coordinator.vin) in {
+                    (domain, str(identifier).upper())
+                    for domain, identifier in dev_entry.identifiers
+                }:
+                    devices[dev_entry.id] = coordinator
+    return devices
+
+@callback
+def async_resolve_targets(hass: HomeAssistant, service_call) -> list:
+    """Return the coordinators of all vehicles targeted by a service call."""
+    devices = async_get_devices(hass)
+    unknown = [
+        device_id
+        for device_id in service_call.data.get(ATTR_DEVICE_ID, [])
+        if device_id not in devices
+    ]
+    if unknown:
+        raise ServiceValidationError(
+            f"Device {', '.join(unknown)} is not a vehicle of a loaded Skoda Connect entry"
+        )
+    # Areas, floors and labels may contain other devices, these are skipped
+    selected = async_extract_referenced_entity_ids(hass, service_call)
+    coordinators = {}
+    for device_id in selected.referenced_devices:
+        if device_id in devices:
+            coordinators.setdefault(devices[device_id].vin, devices[device_id])
+    if not coordinators:
+        raise ServiceValidationError("No Skoda Connect vehicles found in service target")
+    return list(coordinators.values())
+
+async def async_call_vehicles(hass: HomeAssistant, service_call, name, action):
+    """Run a service action for all targeted vehicles.
+
+    Accounts run in parallel, vehicles of one account run up to the fleet
+    concurrency at a time. Returns a result per vehicle, or a request ID per
+    vehicle when the caller does not wait for completion.
+    """
+    accounts = {}
+    for coordinator in async_resolve_targets(hass, service_call):
+        accounts.setdefault(coordinator.hub, []).append(coordinator)
+
+    async def run(semaphore, coordinator, started=None):
+        async with semaphore:
+            if started is not None:
+                started()
+            try:
+                vehicle = None
+                if coordinator.hub is not None and coordinator.hub.logged_in:
+                    vehicle = coordinator.connection.vehicle(coordinator.vin)
+                if not vehicle:
+                    raise HomeAssistantError(f"Vehicle {coordinator.vin} is not connected yet")
+                state = await action(coordinator, vehicle)
+            except Exception as e:
+                _LOGGER.warning(f"Service call '{name}' failed for {coordinator.vin}: {e}")
+                return coordinator.vin, {"success": False, "error": str(e)}
+            if state is False:
+                return coordinator.vin, {"success": False, "error": "Request failed"}
+            return coordinator.vin, {"success": True, "error": None}
+
+    targets = []
+    for coordinators in accounts.values():
+        semaphore = asyncio.Semaphore(
+            min(coordinator.fleet_concurrency for coordinator in coordinators)
+        )
+        targets.extend((semaphore, coordinator) for coordinator in coordinators)
+
+    if not service_call.data.get(ATTR_WAIT, True):
+        # Return right away, completion is reported with events
+        return {
+            "vehicles": {
+                coordinator.vin: {
+                    "request_id": coordinator.async_track_request(
+                        name,
+                        lambda started, semaphore=semaphore, coordinator=coordinator: run(
+                            semaphore, coordinator, started
+                        ),
+                    )
+                }
+                for semaphore, coordinator in targets
+            }
+        }
+
+    results = dict(
+        await asyncio.gather(*(run(semaphore, coordinator) for semaphore, coordinator in targets))
     )
 
+    failed = [vin for vin, result in results.items() if not result["success"]]
+    if failed and len(failed) == len(results):
+        errors = "; ".join(f"{vin}: {results[vin]['error']}" for vin in failed)
+        raise HomeAssistantError(f"Service call '{name}' failed: {errors}")
+    return {"vehicles": results}
+
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the component from configuration.yaml."""
     hass.data.setdefault(DOMAIN, {})
 
+    @callback
+    def device_registry_updated(event):
+        """Rebuild the device map after devices changed."""
+        async_invalidate_devices(hass)
+
+    hass.bus.async_listen(
+        device_registry.EVENT_DEVICE_REGISTRY_UPDATED, device_registry_updated
+    )
+
     if hass.config_entries.async_entries(DOMAIN):
         return True
 
@@ -500,32 +823,40 @@ async def async_setup(hass: HomeAssistant, config: dict):
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
-    _LOGGER.debug("Unloading services")
-    hass.services.async_remove(DOMAIN, SERVICE_SET_SCHEDULE)
-    hass.services.async_remove(DOMAIN, SERVICE_SET_MAX_CURRENT)
-    hass.services.async_remove(DOMAIN, SERVICE_SET_CHARGE_LIMIT)
-    hass.services.async_remove(DOMAIN, SERVICE_SET_CLIMATER)
-    hass.services.async_remove(DOMAIN, SERVICE_SET_PHEATER_DURATION)
+    # Services act on all vehicles, keep them while other entries are loaded
+    if not any(
+        other.entry_id != entry.entry_id and other.state is ConfigEntryState.LOADED
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        _LOGGER.debug("Unloading services")
+        hass.services.async_remove(DOMAIN, SERVICE_SET_SCHEDULE)
+        hass.services.async_remove(DOMAIN, SERVICE_SET_SCHEDULES)
+        hass.services.async_remove(DOMAIN, SERVICE_SET_MAX_CURRENT)
+        hass.services.async_remove(DOMAIN, SERVICE_SET_CHARGE_LIMIT)
+        hass.services.async_remove(DOMAIN, SERVICE_SET_CLIMATER)
+        hass.services.async_remove(DOMAIN, SERVICE_SET_PHEATER_DURATION)
     return await async_unload_coordinator(hass, entry)
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the stored last known state of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
 async def async_unload_coordinator(hass: HomeAssistant, entry: ConfigEntry):
     """Unload auth token based entry."""
     _LOGGER.debug("Unloading update listener")
     hass.data[DOMAIN][entry.entry_id][UNDO_UPDATE_LISTENER]()
     hass.data[DOMAIN][entry.entry_id].pop(UNDO_UPDATE_LISTENER, None)
 
+    _LOGGER.debug("Unloading stop listener")
+    hass.data[DOMAIN][entry.entry_id].pop(REMOVE_LISTENER)()
+
     _LOGGER.debug("Unloading coordinator")
     coordinator = hass.data[DOMAIN][entry.entry_id][DATA].coordinator
+    async_invalidate_devices(hass)
     await coordinator.async_logout()
     _LOGGER.debug("Waiting for shutdown to complete")
-    unloaded = all(
-        await asyncio.gather(
-            *[
-                hass.config_entries.async_forward_entry_unload(entry, platform)
-                for platform in PLATFORMS
-                if platform in coordinator.platforms
-            ]
-        )
+    unloaded = await hass.config_entries.async_unload_platforms(
+        entry, coordinator.platforms
     )
     if unloaded:
         _LOGGER.debug("Unloading entry")
@@ -539,8 +870,51 @@ async def async_unload_coordinator(hass: HomeAssistant, entry: ConfigEntry):
 
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
     """Handle options update."""
-    # Do a lazy reload of integration when configuration changed
-    await hass.config_entries.async_reload(entry.entry_id)
+    data = hass.data[DOMAIN][entry.entry_id][DATA]
+    coordinator = data.coordinator
+    resources = get_resources(entry)
+    if (
+        coordinator.credentials != get_credentials(entry)
+        or coordinator.command_options != get_command_options(entry)
+        or data.missing_platforms(resources)
+    ):
+        # Reload integration when account or vehicle changed, when commands
+        # were enabled or disabled and when a platform was not set up
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # Apply other options to the running integration
+    _LOGGER.debug(f"Applying changed options for {data.coordinator.vin}")
+    await coordinator.async_apply_options()
+    data.async_update_resources(resources)
+
+def get_scan_interval(entry: ConfigEntry) -> timedelta:
+    """Return the configured update interval."""
+    if entry.options.get(CONF_SCAN_INTERVAL):
+        update_interval = timedelta(seconds=entry.options[CONF_SCAN_INTERVAL])
+    else:
+        update_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+    if update_interval < timedelta(seconds=MIN_SCAN_INTERVAL):
+        update_interval = timedelta(seconds=MIN_SCAN_INTERVAL)
+    return update_interval
+
+def get_credentials(entry: ConfigEntry):
+    """Return the account and vehicle an entry is set up for."""
+    return (
+        entry.data[CONF_USERNAME],
+        entry.data[CONF_PASSWORD],
+        entry.data[CONF_VEHICLE].upper(),
+    )
+
+def get_command_options(entry: ConfigEntry):
+    """Return the options that decide which commands entities can send."""
+    return (entry.options.get(CONF_MUTABLE), entry.options.get(CONF_SPIN))
+
+def get_resources(entry: ConfigEntry):
+    """Return the resources enabled by the user."""
+    if CONF_RESOURCES in entry.options:
+        return entry.options[CONF_RESOURCES]
+    return entry.data.get(CONF_RESOURCES, [])
 
 def get_convert_conf(entry: ConfigEntry):
     return CONF_SCANDINAVIAN_MILES if entry.options.get(
@@ -595,6 +969,305 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry):
     return True
 
 
+class QueuedCommand:
+    """Remote action waiting in a vehicle command queue."""
+
+    def __init__(self, name, func, args, future):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.future = future
+        self.queued = time.monotonic()
+
+
+class CommandQueue:
+    """Run remote actions for one vehicle in order, collapsing duplicates."""
+
+    def __init__(self, hass: HomeAssistant, vin):
+        self.hass = hass
+        self.vin = vin
+        self.last_wait = None
+        self.max_wait = 0.0
+        self.processed = 0
+        self.collapsed = 0
+        self._pending = deque()
+        self._running = None
+        self._worker = None
+        self._idle = []
+
+    @property
+    def depth(self):
+        """Return the number of queued and running commands."""
+        return len(self._pending) + (1 if self._running is not None else 0)
+
+    async def async_run(self, name, func, *args, replace=False):
+        """Queue a command and wait for its result.
+
+        Identical commands that are queued or running are collapsed. With
+        replace, a queued command with the same name gets the new arguments.
+        """
+        command = self._find(name, args, replace)
+        if command is not None:
+            _LOGGER.debug(f"Collapsing duplicate command {name} for {self.vin}")
+            self.collapsed += 1
+            if replace:
+                command.func, command.args = func, args
+        else:
+            command = QueuedCommand(name, func, args, self.hass.loop.create_future())
+            self._pending.append(command)
+            if self._worker is None or self._worker.done():
+                self._worker = self.hass.async_create_background_task(
+                    self._async_work(), f"{DOMAIN}_commands_{self.vin}"
+                )
+        self._async_notify()
+        return await asyncio.shield(command.future)
+
+    @callback
+    def async_when_idle(self, func):
+        """Call func once all queued commands have finished, failed or not."""
+        if not self.depth:
+            func()
+        elif func not in self._idle:
+            self._idle.append(func)
+
+    def _find(self, name, args, replace):
+        """Return a queued or running command the new one can be collapsed into."""
+        running = self._running
+        if running is not None and running.name == name and running.args == args:
+            return running
+        for command in self._pending:
+            if command.name == name and (replace or command.args == args):
+                return command
+        return None
+
+    async def _async_work(self):
+        """Run queued commands one at a time."""
+        while self._pending:
+            command = self._running = self._pending.popleft()
+            self.last_wait = time.monotonic() - command.queued
+            self.max_wait = max(self.max_wait, self.last_wait)
+            self._async_notify()
+            try:
+                result = await command.func(*command.args)
+            except Exception as err:
+                if not command.future.done():
+                    command.future.set_exception(err)
+            else:
+                if not command.future.done():
+                    command.future.set_result(result)
+            finally:
+                self._running = None
+                self.processed += 1
+        self._async_notify()
+        idle, self._idle = self._idle, []
+        for func in idle:
+            func()
+
+    @callback
+    def _async_notify(self):
+        """Update the command queue diagnostics."""
+        async_dispatcher_send(self.hass, SIGNAL_COMMAND_QUEUE.format(self.vin))
+
+    async def async_shutdown(self):
+        """Cancel queued commands and the worker."""
+        self._idle = []
+        while self._pending:
+            command = self._pending.popleft()
+            command.future.cancel()
+        if self._running is not None:
+            self._running.future.cancel()
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+
+
+class FetchResults:
+    """Results of the API requests of one fetch.
+
+    The library logs failed requests and carries on with the data it has, the
+    results tell whether anything arrived.
+    """
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = []
+        self.retry_after = None
+
+    def add(self, response):
+        """Count the response of the library to a GET request."""
+        # The library returns None for requests without response and the
+        # status code for HTTP errors
+        status = response.get("status_code") if isinstance(response, dict) else None
+        if response is not None and not (isinstance(status, int) and status >= 400):
+            self.succeeded += 1
+            return
+        self.failed.append(status)
+        if status == 429:
+            retry_after = str((response.get("response_headers") or {}).get("Retry-After", ""))
+            if retry_after.isdigit():
+                self.retry_after = int(retry_after)
+
+    def error(self):
+        """Return the error of a throttled or failed fetch, None if data arrived."""
+        if 429 in self.failed:
+            error = SkodaThrottledException(429)
+            error.retry_after = self.retry_after
+            return error
+        if self.failed and not self.succeeded:
+            return SkodaException(
+                f"All requests failed, HTTP status {', '.join(str(status) for status in self.failed)}"
+            )
+        return None
+
+
+# Results of the fetch running in the current task
+CURRENT_FETCH = contextvars.ContextVar("skodaconnect_fetch", default=None)
+
+
+class UpdateBackoff:
+    """Exponential back off with jitter and a circuit breaker for updates."""
+
+    def __init__(self):
+        self.failures = 0
+        self.throttled = False
+        self.last_error = None
+        self.retry_at = None
+        self._retry_at = 0.0
+
+    @property
+    def state(self):
+        """Return the circuit breaker state."""
+        if self.failures < BREAKER_THRESHOLD:
+            return BREAKER_CLOSED
+        if time.monotonic() < self._retry_at:
+            return BREAKER_OPEN
+        return BREAKER_HALF_OPEN
+
+    @property
+    def delay(self) -> timedelta:
+        """Return the time left until the next attempt."""
+        return timedelta(seconds=max(0.0, self._retry_at - time.monotonic()))
+
+    def allow(self) -> bool:
+        """Return true if an update may be attempted."""
+        return time.monotonic() >= self._retry_at
+
+    def success(self):
+        """Close the circuit breaker after a successful update."""
+        self.failures = 0
+        self.throttled = False
+        self.last_error = None
+        self.retry_at = None
+        self._retry_at = 0.0
+
+    def failure(self, error=None, throttled=False):
+        """Schedule the next attempt after a failed update."""
+        self.failures += 1
+        self.throttled = throttled
+        self.last_error = str(error) if error is not None else "No data returned"
+        if self.failures >= BREAKER_THRESHOLD:
+            # Circuit breaker open, one attempt after the cooldown (half open)
+            delay = BREAKER_COOLDOWN
+        else:
+            base = BACKOFF_THROTTLED if throttled else BACKOFF_BASE
+            delay = min(BACKOFF_MAX, base * 2 ** (self.failures - 1))
+            # Jitter only adds to the delay, throttled accounts wait at least the base
+            delay = random.uniform(delay, delay * 1.5)
+        # Honour a retry hint if the library provides one
+        retry_after = getattr(error, "retry_after", None)
+        if isinstance(retry_after, (int, float)):
+            delay = max(delay, retry_after)
+        self._set_retry(delay)
+
+    def defer(self, retry_at):
+        """Postpone the next attempt without counting a failure."""
+        if retry_at is None:
+            return
+        delay = (retry_at - dt_util.utcnow()).total_seconds()
+        if time.monotonic() + delay > self._retry_at:
+            self.throttled = True
+            self._set_retry(delay)
+
+    def _set_retry(self, delay):
+        self._retry_at = time.monotonic() + delay
+        self.retry_at = dt_util.utcnow() + timedelta(seconds=delay)
+
+
+def supported_attr(vehicle, attr):
+    """Return a vehicle attribute if the vehicle supports it, else None."""
+    try:
+        if getattr(vehicle, f"is_{attr}_supported", False):
+            return getattr(vehicle, attr)
+    except Exception:
+        pass
+    return None
+
+
+def attr_data_groups(attr):
+    """Return the data groups a resource reads from."""
+    if attr in ATTR_DATA_GROUPS:
+        return ATTR_DATA_GROUPS[attr]
+    for prefix, group in DATA_GROUP_PREFIXES.items():
+        if attr.startswith(prefix):
+            return [group]
+    return [DATA_GROUP_STATUS]
+
+
+def snapshot_value(value):
+    """Return a value that can be stored as JSON."""
+    if value is None or isinstance(value, (str, int, float, bool, datetime)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): snapshot_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [snapshot_value(item) for item in value]
+    return str(value)
+
+
+def snapshot_attrs(obj, attrs):
+    """Return the supported attributes of a library object for a snapshot."""
+    snapshot = {}
+    for attr in attrs:
+        try:
+            value = getattr(obj, attr)
+        except Exception:
+            continue
+        # Methods on some instruments, like is_on of switches
+        if not callable(value):
+            snapshot[attr] = snapshot_value(value)
+    return snapshot
+
+
+class SnapshotVehicle:
+    """Vehicle restored from the last known state."""
+
+    def __init__(self, data):
+        self.__dict__.update(data)
+
+    def __getattr__(self, name):
+        return None
+
+
+class SnapshotInstrument:
+    """Instrument restored from the last known state of a vehicle."""
+
+    def __init__(self, vehicle, data):
+        self.attributes = {}
+        self.__dict__.update(data)
+        self.vehicle = vehicle
+        self.callback = None
+
+    def __getattr__(self, name):
+        return None
+
+    async def _not_connected(self, *args, **kwargs):
+        raise HomeAssistantError(
+            f"Vehicle {self.vehicle.vin} is not connected to Skoda Connect yet"
+        )
+
+    lock = unlock = turn_on = turn_off = _not_connected
+    set_temperature = set_hvac_mode = _not_connected
+
+
 class SkodaData:
     """Hold component state."""
 
@@ -605,24 +1278,80 @@ class SkodaData:
         self.config = config.get(DOMAIN, config)
         self.name = name
         self.coordinator = coordinator
+        self.entities = {}
+        self.entity_factories = {}
+        self._index = {}
+        self._indexed = None
+        self._indexed_len = 0
+
+    def _source(self):
+        """Return the instruments to look up from."""
+        return self.coordinator.data if self.coordinator is not None else self.instruments
+
+    def _update_index(self):
+        """Rebuild the (vin, component, attr) index when the instruments change."""
+        source = self._source() or ()
+        if source is self._indexed and len(source) == self._indexed_len:
+            return
+        self._index = {
+            (instrument.vehicle.vin, instrument.component, instrument.attr): instrument
+            for instrument in source
+        }
+        self._indexed = source
+        self._indexed_len = len(source)
 
     def instrument(self, vin, component, attr):
         """Return corresponding instrument."""
-        return next(
-            (
-                instrument
-                for instrument in (
-                    self.coordinator.data
-                    if self.coordinator is not None
-                    else self.instruments
-                )
-                if instrument.vehicle.vin == vin
-                and instrument.component == component
-                and instrument.attr == attr
-            ),
-            None,
+        self._update_index()
+        return self._index.get((vin, component, attr), None)
+
+    @callback
+    def async_add_entities(self, component, factory, async_add_entities, resources):
+        """Add entities for the enabled instruments of a platform."""
+        self.entity_factories[component] = (factory, async_add_entities)
+        async_add_entities(
+            factory(instrument)
+            for instrument in self.instruments
+            if instrument.component == component and instrument.attr in resources
         )
 
+    def missing_platforms(self, resources):
+        """Return the platforms enabled resources need that were not set up."""
+        return {
+            PLATFORMS[instrument.component]
+            for instrument in self.coordinator.data or []
+            if instrument.attr in resources
+            and instrument.component in PLATFORMS
+            and instrument.component not in self.entity_factories
+        }
+
+    @callback
+    def async_remove_entity(self, entity):
+        """Remove an entity, once."""
+        key = (entity.component, entity.attribute)
+        if self.entities.get(key) is entity:
+            self.entities.pop(key)
+            self.coordinator.hass.async_create_task(entity.async_remove())
+
+    @callback
+    def async_update_resources(self, resources):
+        """Add and remove entities after the enabled resources changed."""
+        for (component, attr), entity in list(self.entities.items()):
+            if attr not in resources:
+                _LOGGER.debug(f"Removing disabled resource {attr}")
+                self.async_remove_entity(entity)
+        for instrument in self.coordinator.data or []:
+            key = (instrument.component, instrument.attr)
+            if (
+                instrument.attr in resources
+                and key not in self.entities
+                and instrument.component in self.entity_factories
+            ):
+                _LOGGER.debug(f"Adding enabled resource {instrument.attr}")
+                self.instruments.add(instrument)
+                factory, async_add_entities = self.entity_factories[instrument.component]
+                async_add_entities([factory(instrument)])
+
     def vehicle_name(self, vehicle):
         """Provide a friendly name for a vehicle."""
         try:
@@ -652,15 +1381,21 @@ class SkodaEntity(Entity):
 
         def update_callbacks():
             if callback is not None:
-                callback(self.hass, data.coordinator)
+                callback(self.hass, data.coordinator, self.data_groups)
 
         self.data = data
         self.vin = vin
         self.component = component
         self.attribute = attribute
+        self.data_groups = attr_data_groups(attribute)
         self.coordinator = data.coordinator
+        self._instrument = data.instrument(vin, component, attribute)
         self.instrument.callback = update_callbacks
         self.callback = callback
+        self._update_callbacks = update_callbacks
+        self._written_fingerprint = None
+        self._optimistic = None
+        self._optimistic_unsub = None
 
     async def async_update(self) -> None:
         """Update the entity.
@@ -676,21 +1411,137 @@ class SkodaEntity(Entity):
 
     async def async_added_to_hass(self):
         """Register update dispatcher."""
+        key = (self.component, self.attribute)
+        self.data.entities[key] = self
+
+        def remove_entity():
+            if self.data.entities.get(key) is self:
+                self.data.entities.pop(key)
+
+        self.async_on_remove(remove_entity)
+        self.async_on_remove(self._async_clear_optimistic)
         if self.coordinator is not None:
             self.async_on_remove(
-                self.coordinator.async_add_listener(self.async_write_ha_state)
+                self.coordinator.async_add_listener(self._handle_coordinator_update)
             )
         else:
             self.async_on_remove(
                 async_dispatcher_connect(
-                    self.hass, SIGNAL_STATE_UPDATED, self.async_write_ha_state
+                    self.hass, SIGNAL_STATE_UPDATED, self._handle_coordinator_update
                 )
             )
 
+    async def async_command(self, name, func, *args, replace=False, expected=None):
+        """Run a remote action through the command queue of the vehicle.
+
+        With an expected state it is shown right away and reconciled against
+        the following updates, it is rolled back if the command fails.
+        """
+        if expected is not None:
+            self.async_set_optimistic(expected)
+        try:
+            result = await self.coordinator.commands.async_run(
+                f"{self.attribute}.{name}", func, *args, replace=replace
+            )
+        except Exception:
+            self._async_rollback_optimistic(expected)
+            raise
+        if result is False:
+            # Some library commands report failure without raising
+            self._async_rollback_optimistic(expected)
+            return result
+        # Only refresh the data this entity reads from
+        self.coordinator.async_schedule_refresh(self.data_groups)
+        return result
+
+    @property
+    def actual_state(self):
+        """Return the state reported by the vehicle, used to reconcile expected state."""
+        return None
+
+    def optimistic_state(self, actual):
+        """Return the expected state while a command is pending, else the actual state."""
+        return actual if self._optimistic is None else self._optimistic
+
+    @callback
+    def async_set_optimistic(self, expected):
+        """Show an expected state until an update confirms it or it times out."""
+        self._async_clear_optimistic()
+        self._optimistic = expected
+        self._optimistic_unsub = async_call_later(
+            self.hass, OPTIMISTIC_TIMEOUT, self._async_optimistic_expired
+        )
+        self.async_write_ha_state()
+
+    @callback
+    def _async_clear_optimistic(self):
+        """Drop the expected state."""
+        self._optimistic = None
+        if self._optimistic_unsub is not None:
+            self._optimistic_unsub()
+            self._optimistic_unsub = None
+
+    @callback
+    def _async_rollback_optimistic(self, expected):
+        """Drop the expected state of a failed command, unless a later command replaced it."""
+        if expected is not None and self._optimistic == expected:
+            self._async_clear_optimistic()
+            self.async_write_ha_state()
+
+    @callback
+    def _async_optimistic_expired(self, _now=None):
+        """Roll back an expected state that was never confirmed."""
+        self._optimistic_unsub = None
+        if self._optimistic is None:
+            return
+        _LOGGER.debug(f"Expected state of {self.entity_id} not confirmed, rolling back")
+        self._optimistic = None
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Refresh the instrument handle and write state if it changed."""
+        instrument = self.data.instrument(self.vin, self.component, self.attribute)
+        if instrument is None and self.coordinator is not None and self.coordinator.data:
+            # Not in the rebuilt dashboard, the old handle would keep sending commands
+            _LOGGER.debug(f"Removing {self.entity_id}, the vehicle no longer provides it")
+            self.data.async_remove_entity(self)
+            return
+        if instrument is not None and instrument is not self._instrument:
+            instrument.callback = self._update_callbacks
+            self._instrument = instrument
+
+        if self._optimistic is not None and self.actual_state == self._optimistic:
+            _LOGGER.debug(f"Expected state of {self.entity_id} confirmed")
+            self._async_clear_optimistic()
+
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._written_fingerprint and not self.force_update:
+            return
+        super().async_write_ha_state()
+        self._written_fingerprint = fingerprint
+
+    def _state_fingerprint(self):
+        """Return what would be written to the state machine."""
+        return (
+            self.available,
+            self.state,
+            self.name,
+            self.icon,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write state, the next coordinator update always writes again."""
+        self._written_fingerprint = None
+        super().async_write_ha_state()
+
     @property
     def instrument(self):
         """Return corresponding instrument."""
-        return self.data.instrument(self.vin, self.component, self.attribute)
+        return self._instrument
 
     @property
     def icon(self):
@@ -776,6 +1627,215 @@ class SkodaEntity(Entity):
         return f"{self.vin}-{self.component}-{self.attribute}"
 
 
+class SkodaHub:
+    """Account level connection shared by all config entries of a username."""
+
+    def __init__(self, hass: HomeAssistant, username, password, fulldebug=False):
+        self.hass = hass
+        self.username = username
+        self.password = password
+        self.fulldebug = fulldebug
+        self.coordinators = set()
+        self.logged_in = False
+        self.keep_session = False
+        self.fleet = None
+        self.recorder = None
+        self._lock = asyncio.Lock()
+        self.connection = self._create_connection()
+
+    def _create_connection(self):
+        """Create the library connection for the account."""
+        connection = Connection(
+            session=self.recorder or async_get_clientsession(self.hass),
+            username=self.username,
+            password=self.password,
+            fulldebug=self.fulldebug,
+        )
+        # Data requests return errors instead of raising, count them for the fetch
+        get = connection.get
+
+        async def get_counted(url, vin=""):
+            response = await get(url, vin)
+            fetch = CURRENT_FETCH.get()
+            if fetch is not None:
+                fetch.add(response)
+            return response
+
+        connection.get = get_counted
+        return connection
+
+    def set_password(self, password):
+        """Use new credentials unless the current session is still in use."""
+        if password == self.password or self.logged_in:
+            return
+        _LOGGER.debug(f"Credentials changed for {self.username}, recreating connection")
+        self.password = password
+        self.connection = self._create_connection()
+
+    def set_fulldebug(self, fulldebug):
+        """Change full API debug logging of the connection."""
+        self.fulldebug = fulldebug
+        # The library reads the flag from the connection for every response
+        if hasattr(self.connection, "_session_fulldebug"):
+            self.connection._session_fulldebug = fulldebug
+
+    @callback
+    def async_update_recording(self):
+        """Record the API traffic to a cassette while an attached entry asks for it."""
+        record = any(
+            coordinator.entry.options.get(CONF_RECORD, False)
+            for coordinator in self.coordinators
+        )
+        if record == (self.recorder is not None):
+            return
+        if record:
+            name = f"cassette-{dt_util.utcnow():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+            path = Path(self.hass.config.path(DOMAIN, name + CASSETTE_SUFFIX))
+            _LOGGER.info(f"Recording API traffic of {self.username} to {path}")
+            self.recorder = CassetteRecorder(
+                self.hass,
+                async_get_clientsession(self.hass),
+                path,
+                secrets={self.username: REDACTED_USERNAME},
+            )
+            session = self.recorder
+        else:
+            recorder, self.recorder = self.recorder, None
+            _LOGGER.info(f"Stopped recording API traffic to {recorder.path}")
+            self.hass.async_create_task(recorder.async_close())
+            session = async_get_clientsession(self.hass)
+        # The library keeps the session it was created with
+        if hasattr(self.connection, "_session"):
+            self.connection._session = session
+
+    def attach(self, coordinator):
+        """Attach a vehicle coordinator to the hub."""
+        self.coordinators.add(coordinator)
+        self.async_update_recording()
+
+    @callback
+    def async_get_fleet(self):
+        """Return the fleet coordinator of the account, create it if needed."""
+        if self.fleet is None:
+            self.fleet = SkodaFleetCoordinator(self.hass, self)
+        return self.fleet
+
+    async def async_login(self, tokens=None) -> bool:
+        """Login once for all attached coordinators."""
+        async with self._lock:
+            if self.logged_in:
+                _LOGGER.debug(f"Reusing Skoda Connect session for {self.username}")
+                return True
+            restore = False
+            if tokens:
+                restore = await self.connection.restore_tokens(tokens)
+            if restore is False:
+                if await self.connection.doLogin() is False:
+                    return False
+            # Get associated vehicles before we continue
+            await self.connection.get_vehicles()
+            self.logged_in = True
+            return True
+
+    async def async_detach(self, coordinator, keep_session=False, terminate=True):
+        """Detach a coordinator, terminate the session when the last one leaves."""
+        self.coordinators.discard(coordinator)
+        self.keep_session = self.keep_session or keep_session
+        if self.coordinators:
+            self.async_update_recording()
+            return
+        hubs = self.hass.data.get(DOMAIN, {}).get(HUBS, {})
+        if hubs.get(self.username) is self:
+            hubs.pop(self.username)
+            if not hubs:
+                self.hass.data[DOMAIN].pop(HUBS, None)
+        if self.logged_in and terminate and not self.keep_session:
+            # Revoke tokens
+            _LOGGER.debug("Terminate connection")
+            await self.connection.terminate()
+        self.logged_in = False
+        # Stop recording after the revocation, a replay terminates the session too
+        self.async_update_recording()
+
+
+class SkodaFleetCoordinator(DataUpdateCoordinator):
+    """Refresh all fleet mode vehicles of an account in one cycle."""
+
+    def __init__(self, hass: HomeAssistant, hub: SkodaHub):
+        self.hub = hub
+        self.members = {}
+        self.concurrency = DEFAULT_FLEET_CONCURRENCY
+
+        super().__init__(hass, _LOGGER, name=f"{DOMAIN}_fleet", update_interval=None)
+
+    @callback
+    def async_add_member(self, coordinator):
+        """Add a vehicle coordinator to the fleet."""
+        self.members[coordinator.vin] = coordinator
+        self.async_update_settings()
+
+    async def async_remove_member(self, coordinator):
+        """Remove a vehicle coordinator, shut down the fleet when empty."""
+        if self.members.get(coordinator.vin) is coordinator:
+            self.members.pop(coordinator.vin)
+        if self.members:
+            self.async_update_settings()
+            return
+        await self.async_shutdown()
+        if self.hub.fleet is self:
+            self.hub.fleet = None
+
+    @callback
+    def async_update_settings(self):
+        """Use the most conservative settings among the members."""
+        self.update_interval = min(
+            member.poll_interval for member in self.members.values()
+        )
+        self.concurrency = min(
+            member.fleet_concurrency for member in self.members.values()
+        )
+
+    async def _async_update_data(self):
+        """Update all member vehicles with bounded concurrency."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def update(index, member):
+            # Stagger start times so the account is not hit in one burst
+            await asyncio.sleep((index % self.concurrency) * FLEET_STAGGER)
+            async with semaphore:
+                return await member.update()
+
+        members = list(self.members.values())
+        _LOGGER.debug(
+            f"Updating {len(members)} vehicles for {self.hub.username}, {self.concurrency} at a time"
+        )
+        results = await asyncio.gather(
+            *(update(index, member) for index, member in enumerate(members)),
+            return_exceptions=True,
+        )
+        return {
+            member.vin: result if not isinstance(result, BaseException) else False
+            for member, result in zip(members, results)
+        }
+
+
+def async_get_hub(hass: HomeAssistant, entry: ConfigEntry) -> SkodaHub:
+    """Return the account hub for a config entry, create it if needed."""
+    hubs = hass.data.setdefault(DOMAIN, {}).setdefault(HUBS, {})
+    username = entry.data[CONF_USERNAME]
+    hub = hubs.get(username)
+    if hub is None:
+        hub = hubs[username] = SkodaHub(
+            hass,
+            username,
+            entry.data[CONF_PASSWORD],
+            fulldebug=entry.options.get(CONF_DEBUG, entry.data.get(CONF_DEBUG, DEFAULT_DEBUG)),
+        )
+    else:
+        hub.set_password(entry.data[CONF_PASSWORD])
+    return hub
+
+
 class SkodaCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
@@ -784,21 +1844,69 @@ class SkodaCoordinator(DataUpdateCoordinator):
         self.hass = hass
         self.entry = entry
         self.platforms = []
+        self.setup_time = None
         self.report_last_updated = None
-        self.connection = Connection(
-            session=async_get_clientsession(hass),
-            username=self.entry.data[CONF_USERNAME],
-            password=self.entry.data[CONF_PASSWORD],
-            fulldebug=self.entry.options.get(CONF_DEBUG, self.entry.data.get(CONF_DEBUG, DEFAULT_DEBUG)),
+        self.credentials = get_credentials(entry)
+        self.command_options = get_command_options(entry)
+        self.hub = async_get_hub(hass, entry)
+        self.hub.attach(self)
+        self.scan_interval = update_interval
+        self.poll_interval = update_interval
+        self.adaptive_polling = entry.options.get(CONF_ADAPTIVE_POLLING, False)
+        self._last_position = None
+        self._last_odometer = None
+        self._dashboard = None
+        self._dashboard_key = None
+        self._data_groups = None
+        self._data_groups_key = None
+        self._last_full_update = None
+        self.data_updated = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+        self._stored_snapshot = None
+        self.backoff = UpdateBackoff()
+        self.refresh_settle = entry.options.get(CONF_REFRESH_SETTLE, DEFAULT_REFRESH_SETTLE)
+        self._settle_unsub = None
+        self._refresh_groups = set()
+        self._forced_groups = None
+        self.commands = CommandQueue(hass, self.vin)
+        self.requests = {}
+        self.fleet_mode = entry.options.get(CONF_FLEET_MODE, False)
+        self.fleet_concurrency = entry.options.get(
+            CONF_FLEET_CONCURRENCY, DEFAULT_FLEET_CONCURRENCY
+        )
+        self._remove_fleet_listener = None
+
+        # In fleet mode the account fleet coordinator schedules updates
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=None if self.fleet_mode else update_interval,
         )
 
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
+    @property
+    def connection(self):
+        """Return the shared library connection."""
+        return self.hub.connection if self.hub is not None else None
 
     async def _async_update_data(self):
         """Update data via library."""
         vehicle = await self.update()
+        if not vehicle and not self.fleet_mode:
+            # Wait at least the back off delay before the next attempt
+            self.update_interval = max(self.poll_interval, self.backoff.delay)
+        return self._process_update(vehicle)
 
+    def _process_update(self, vehicle):
+        """Return the instruments for an updated vehicle."""
         if not vehicle:
+            if self.data and self.backoff.state == BREAKER_CLOSED:
+                # Entities keep the last data while updates back off, the
+                # API status sensor reports the failures
+                return self.data
+            if self.data:
+                # Paused for the cooldown, the data may be hours old
+                raise UpdateFailed(f"Updates paused after {self.backoff.failures} failures")
             raise UpdateFailed("No vehicles found.")
 
         # Backward compatibility
@@ -812,14 +1920,402 @@ class SkodaCoordinator(DataUpdateCoordinator):
             )
         )
 
-        dashboard = vehicle.dashboard(
+        config = dict(
             mutable=self.entry.options.get(CONF_MUTABLE),
             spin=self.entry.options.get(CONF_SPIN),
             miles=convert_conf == CONF_IMPERIAL_UNITS,
             scandinavian_miles=convert_conf == CONF_SCANDINAVIAN_MILES,
         )
+        instruments = self._dashboard_instruments(vehicle, config)
+
+        if self.adaptive_polling:
+            self._adapt_poll_interval(vehicle)
+        if not self.fleet_mode:
+            self.update_interval = self.poll_interval
 
-        return dashboard.instruments
+        self._async_schedule_snapshot()
+        return instruments
+
+    @callback
+    def _async_schedule_snapshot(self):
+        """Save the last known state after the save delay, if it changed."""
+        snapshot = self._snapshot()
+        if snapshot == self._stored_snapshot:
+            return
+        self._stored_snapshot = snapshot
+        self._store.async_delay_save(lambda: snapshot, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot(self):
+        """Return the last known state of the vehicle to store."""
+        if not self._dashboard:
+            return {}
+        return {
+            "vehicle": snapshot_attrs(self._dashboard[0].vehicle, SNAPSHOT_VEHICLE_ATTRS),
+            "instruments": [
+                snapshot_attrs(instrument, SNAPSHOT_INSTRUMENT_ATTRS)
+                for instrument in self._dashboard
+            ],
+        }
+
+    async def async_save_snapshot(self):
+        """Write the last known state now instead of after the save delay."""
+        # A pending delayed save keeps a final write listener and the coordinator alive
+        if self._dashboard:
+            self._stored_snapshot = self._snapshot()
+            await self._store.async_save(self._stored_snapshot)
+
+    async def async_restore_snapshot(self) -> bool:
+        """Populate data from the last known state, if stored."""
+        try:
+            snapshot = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning(f"Could not load last known state for {self.vin}: {e}")
+            return False
+        if not snapshot or not snapshot.get("instruments"):
+            return False
+        vehicle = SnapshotVehicle(snapshot.get("vehicle", {}))
+        if vehicle.vin is None:
+            return False
+        instruments = [SnapshotInstrument(vehicle, data) for data in snapshot["instruments"]]
+        if self.entry.options.get(CONF_MUTABLE) is False:
+            # Saved before the vehicle was made read-only
+            instruments = [instrument for instrument in instruments if not instrument.is_mutable]
+        self.async_set_updated_data(instruments)
+        return True
+
+    async def async_connect(self):
+        """Login and refresh after the entry was set up from last known state."""
+        try:
+            if not await self.async_login():
+                self.entry.async_start_reauth(self.hass)
+                return
+        except (ConfigEntryAuthFailed, SkodaLoginFailedException):
+            self.entry.async_start_reauth(self.hass)
+            return
+        except Exception as e:
+            _LOGGER.warning(f"Could not connect to Skoda Connect, retrying on next update: {e}")
+        await self.async_refresh()
+
+    def _dashboard_instruments(self, vehicle, config):
+        """Return the cached dashboard, rebuild when options or capabilities change."""
+        # Instruments read from the vehicle object so they can be reused across
+        # updates. The library timestamps (re)discovery of vehicle capabilities.
+        # Support of single instruments follows the fetched data and flaps with
+        # failing requests, that alone does not rebuild.
+        key = (vehicle, getattr(vehicle, "_discovered", None), tuple(config.items()))
+        if self._dashboard is None or key != self._dashboard_key:
+            _LOGGER.debug(f"Building dashboard for {self.vin}")
+            # vehicle.dashboard() keeps its own until the config changes
+            instruments = Dashboard(vehicle, **config).instruments
+            if config.get("mutable") is False:
+                # The library sets up instruments that send commands regardless
+                instruments = [
+                    instrument for instrument in instruments if not instrument.is_mutable
+                ]
+            self._dashboard = instruments
+            self._dashboard_key = key
+        return self._dashboard
+
+    @property
+    def data_groups(self):
+        """Return the data groups needed by the enabled resources, None for all."""
+        resources = get_resources(self.entry)
+        key = (tuple(resources), self.adaptive_polling)
+        if key != self._data_groups_key:
+            self._data_groups_key = key
+            if not resources:
+                self._data_groups = None
+            else:
+                attrs = list(resources)
+                if self.adaptive_polling:
+                    attrs += ADAPTIVE_ACTIVE_ATTRS + ["position", "distance", "door_locked"]
+                groups = {DATA_GROUP_STATUS}
+                for attr in attrs:
+                    groups.update(attr_data_groups(attr))
+                self._data_groups = None if groups >= DATA_GROUPS.keys() else groups
+            _LOGGER.debug(
+                f"Data groups for {self.vin}: {sorted(self._data_groups or DATA_GROUPS)}"
+            )
+        return self._data_groups
+
+    def group_interval(self, group) -> timedelta:
+        """Return how often a data group is refreshed."""
+        return max(
+            self.poll_interval, timedelta(seconds=DATA_GROUP_INTERVALS.get(group, 0))
+        )
+
+    def due_groups(self, groups, now):
+        """Return the data groups that are stale at the given time."""
+        due = set()
+        for group in groups:
+            updated = self.data_updated.get(group)
+            # Round to the nearest poll so timer jitter does not skip a cycle
+            if updated is None or now - updated + self.poll_interval / 2 >= self.group_interval(group):
+                due.add(group)
+        return due
+
+    async def _async_fetch(self, vehicle) -> bool:
+        """Fetch the stale data groups needed by the enabled resources."""
+        groups = self.data_groups or set(DATA_GROUPS)
+        forced, self._forced_groups = self._forced_groups, None
+        now = dt_util.utcnow()
+        # Full updates discover new instruments and rediscover capabilities
+        if (
+            self._last_full_update is None
+            or now - self._last_full_update >= timedelta(seconds=FULL_UPDATE_INTERVAL)
+        ):
+            fetch = FetchResults()
+            token = CURRENT_FETCH.set(fetch)
+            try:
+                updated = await vehicle.update()
+            finally:
+                CURRENT_FETCH.reset(token)
+            if not updated:
+                return False
+            error = fetch.error()
+            if error is not None:
+                raise error
+            self._last_full_update = now
+            self.data_updated = dict.fromkeys(DATA_GROUPS, now)
+            return True
+
+        if getattr(vehicle, "deactivated", False):
+            _LOGGER.info(f"Vehicle with VIN {self.vin} is deactivated.")
+            return False
+        # A refresh after a command fetches what it affected, fresh or not
+        due = [
+            group
+            for group in (groups & forced if forced else self.due_groups(groups, now))
+            if hasattr(vehicle, DATA_GROUPS[group])
+        ]
+        if not due:
+            return True
+        _LOGGER.debug(f"Fetching {', '.join(sorted(due))} for {self.vin}")
+        results = await asyncio.gather(
+            *(self._async_fetch_group(vehicle, group) for group in due),
+            return_exceptions=True,
+        )
+        errors = []
+        for group, result in zip(due, results):
+            error = result if isinstance(result, Exception) else result.error()
+            if error is not None:
+                # Failed groups stay stale and are retried on the next poll
+                errors.append(error)
+            else:
+                self.data_updated[group] = now
+        for error in errors:
+            if isinstance(error, SkodaThrottledException):
+                raise error
+        if errors and len(errors) == len(results):
+            raise errors[0]
+        return True
+
+    async def _async_fetch_group(self, vehicle, group) -> FetchResults:
+        """Fetch a data group and return the results of its requests."""
+        # Gathered coroutines run in their own task, the results stay per group
+        fetch = FetchResults()
+        CURRENT_FETCH.set(fetch)
+        await getattr(vehicle, DATA_GROUPS[group])()
+        return fetch
+
+    def _adapt_poll_interval(self, vehicle):
+        """Poll fast while the vehicle is active and back off while parked."""
+        position = supported_attr(vehicle, "position")
+        odometer = supported_attr(vehicle, "distance")
+        moved = (
+            self._last_position is not None and position != self._last_position
+        ) or (self._last_odometer is not None and odometer != self._last_odometer)
+        self._last_position = position
+        self._last_odometer = odometer
+
+        # Some states are not booleans, charging is 1 or 0
+        active = moved or any(
+            bool(supported_attr(vehicle, attr)) for attr in ADAPTIVE_ACTIVE_ATTRS
+        )
+        if active:
+            interval = min(self.scan_interval, timedelta(seconds=ADAPTIVE_ACTIVE_INTERVAL))
+        elif bool(supported_attr(vehicle, "door_locked")):
+            interval = max(self.scan_interval, timedelta(seconds=ADAPTIVE_IDLE_INTERVAL))
+        else:
+            interval = self.scan_interval
+
+        if interval != self.poll_interval:
+            _LOGGER.debug(
+                f"Vehicle {self.vin} is {'active' if active else 'idle'}, polling every {interval}"
+            )
+        self.poll_interval = interval
+        if self.fleet_mode and self.hub is not None and self.hub.fleet is not None:
+            self.hub.fleet.async_update_settings()
+
+    @callback
+    def async_schedule_refresh(self, groups=None):
+        """Refresh once commands have settled, a burst of commands gives one refresh.
+
+        Only the given data groups are fetched, all needed groups if not given.
+        """
+        self._refresh_groups.update(groups or DATA_GROUPS)
+        self._async_settle()
+
+    @callback
+    def _async_settle(self):
+        """Start the settle window of a scheduled refresh again."""
+        if not self._refresh_groups:
+            # Cancelled while commands were running
+            return
+        if self._settle_unsub is not None:
+            self._settle_unsub()
+        self._settle_unsub = async_call_later(
+            self.hass, self.refresh_settle, self._async_settled_refresh
+        )
+
+    async def _async_settled_refresh(self, _now=None):
+        """Refresh after the settle window passed without new commands."""
+        self._settle_unsub = None
+        if self.commands.depth:
+            # Settle again once the queue drained, the remaining commands may fail
+            self.commands.async_when_idle(self._async_settle)
+            return
+        self._forced_groups, self._refresh_groups = self._refresh_groups, set()
+        if self.hub is not None:
+            await self.async_refresh()
+
+    @callback
+    def async_cancel_scheduled_refresh(self):
+        """Cancel a pending post-command refresh."""
+        if self._settle_unsub is not None:
+            self._settle_unsub()
+            self._settle_unsub = None
+        self._refresh_groups = set()
+
+    @callback
+    def async_track_request(self, name, run) -> str:
+        """Run a service action in the background and report its progress.
+
+        The action is created with a callback to call once it starts.
+        """
+        request_id = uuid.uuid4().hex
+        self.requests[request_id] = {
+            "service": name,
+            "status": REQUEST_QUEUED,
+            "created": dt_util.utcnow().isoformat(),
+        }
+        self._async_request_event(EVENT_COMMAND_PROGRESS, request_id)
+        self.entry.async_create_background_task(
+            self.hass,
+            self._async_run_request(request_id, run),
+            f"{DOMAIN} {name} {self.vin}",
+        )
+        return request_id
+
+    async def _async_run_request(self, request_id, run):
+        """Await a tracked service action and fire its result event."""
+        @callback
+        def started():
+            self.requests[request_id]["status"] = REQUEST_RUNNING
+            self._async_request_event(EVENT_COMMAND_PROGRESS, request_id)
+
+        result = {"success": False, "error": "Request failed"}
+        try:
+            _vin, result = await run(started)
+        except asyncio.CancelledError:
+            result = {"success": False, "error": "Cancelled"}
+            raise
+        finally:
+            request = self.requests.pop(request_id)
+            request["status"] = REQUEST_COMPLETED if result["success"] else REQUEST_FAILED
+            request["error"] = result["error"]
+            self._async_request_event(
+                EVENT_COMMAND_COMPLETED if result["success"] else EVENT_COMMAND_FAILED,
+                request_id,
+                request,
+            )
+
+    @callback
+    def _async_request_event(self, event, request_id, request=None):
+        """Fire a command event and update the in flight requests."""
+        request = request or self.requests[request_id]
+        self.hass.bus.async_fire(
+            event, {"request_id": request_id, "vin": self.vin, **request}
+        )
+        async_dispatcher_send(self.hass, SIGNAL_COMMAND_QUEUE.format(self.vin))
+
+    async def async_apply_options(self):
+        """Apply changed options without logging in again."""
+        options = self.entry.options
+        self.scan_interval = get_scan_interval(self.entry)
+        self.adaptive_polling = options.get(CONF_ADAPTIVE_POLLING, False)
+        if not self.adaptive_polling:
+            self.poll_interval = self.scan_interval
+        self.fleet_concurrency = options.get(
+            CONF_FLEET_CONCURRENCY, DEFAULT_FLEET_CONCURRENCY
+        )
+        self.refresh_settle = options.get(CONF_REFRESH_SETTLE, DEFAULT_REFRESH_SETTLE)
+        if self.hub is not None:
+            self.hub.set_fulldebug(
+                options.get(CONF_DEBUG, self.entry.data.get(CONF_DEBUG, DEFAULT_DEBUG))
+            )
+            self.hub.async_update_recording()
+
+        fleet_mode = options.get(CONF_FLEET_MODE, False)
+        if fleet_mode and not self.fleet_mode:
+            self.fleet_mode = True
+            self.update_interval = None
+            self.async_join_fleet()
+        elif self.fleet_mode and not fleet_mode:
+            await self.async_leave_fleet()
+            self.fleet_mode = False
+        if self.fleet_mode:
+            self.hub.fleet.async_update_settings()
+        else:
+            self.update_interval = self.poll_interval
+
+        # Rebuild instruments for new conversion settings
+        vehicle = None
+        if self.hub is not None and self.hub.logged_in and self.last_update_success:
+            vehicle = self.connection.vehicle(self.vin)
+        if vehicle:
+            self.async_set_updated_data(self._process_update(vehicle))
+        else:
+            await self.async_request_refresh()
+
+    @callback
+    def async_join_fleet(self):
+        """Let the account fleet coordinator schedule updates for this vehicle."""
+        fleet = self.hub.async_get_fleet()
+        fleet.async_add_member(self)
+        self._remove_fleet_listener = fleet.async_add_listener(
+            self._handle_fleet_update
+        )
+
+    async def async_leave_fleet(self):
+        """Stop receiving updates from the account fleet coordinator."""
+        if self._remove_fleet_listener is None:
+            return
+        self._remove_fleet_listener()
+        self._remove_fleet_listener = None
+        if self.hub is not None and self.hub.fleet is not None:
+            await self.hub.fleet.async_remove_member(self)
+
+    @callback
+    def _handle_fleet_update(self):
+        """Handle the result of a fleet update cycle."""
+        vehicle = (self.hub.fleet.data or {}).get(self.vin, False)
+        try:
+            data = self._process_update(vehicle)
+        except UpdateFailed as err:
+            self.async_set_update_error(err)
+            return
+        self.async_set_updated_data(data)
+
+    async def async_release(self):
+        """Detach from the account hub without touching stored tokens."""
+        self.async_cancel_scheduled_refresh()
+        await self.commands.async_shutdown()
+        await self.async_leave_fleet()
+        await self.async_save_snapshot()
+        hub, self.hub = self.hub, None
+        if hub is not None:
+            await hub.async_detach(self, terminate=False)
 
     async def async_logout(self, event=None):
         """Logout from Skoda Connect"""
@@ -837,42 +2333,52 @@ class SkodaCoordinator(DataUpdateCoordinator):
                 # If config is only reloaded this will throw an exception
                 pass
 
-            if entry_options.get(CONF_SAVESESSION, False):
-                try:
-                    # Save session is true, save tokens for all clients
-                    tokens = await self.connection.save_tokens()
-                    if tokens is not False:
-                        _LOGGER.debug('Successfully fetched tokens to save')
-                        entry_data[CONF_TOKENS] = tokens
-                        _LOGGER.debug("Saving tokens to config registry")
+            if self.hub is None:
+                return True
+            self.async_cancel_scheduled_refresh()
+            await self.commands.async_shutdown()
+            await self.async_leave_fleet()
+            await self.async_save_snapshot()
+            keep_session = entry_options.get(CONF_SAVESESSION, False)
+            try:
+                if keep_session:
+                    try:
+                        # Save session is true, save tokens for all clients
+                        tokens = await self.connection.save_tokens()
+                        if tokens is not False:
+                            _LOGGER.debug('Successfully fetched tokens to save')
+                            entry_data[CONF_TOKENS] = tokens
+                            _LOGGER.debug("Saving tokens to config registry")
+                            self.hass.config_entries.async_update_entry(
+                                self.entry,
+                                data=entry_data,
+                                options=entry_options
+                            )
+                            _LOGGER.debug("Save complete.")
+                        else:
+                            _LOGGER.debug(f'Save tokens failed.')
+                    except Exception as e:
+                        raise SkodaException(f'Save tokens failed: {e}')
+                else:
+                    try:
+                        # Save session is false, remove any saved tokens
+                        entry_data[CONF_TOKENS] = {}
+                        _LOGGER.debug("Removing tokens from config registry")
                         self.hass.config_entries.async_update_entry(
                             self.entry,
                             data=entry_data,
                             options=entry_options
                         )
-                        _LOGGER.debug("Save complete.")
-                    else:
-                        _LOGGER.debug(f'Save tokens failed.')
-                except Exception as e:
-                    raise SkodaException(f'Save tokens failed: {e}')
-            else:
+                    except Exception as e:
+                        raise SkodaException(f'Removal of tokens failed: {e}')
+            finally:
+                # Detach from the shared account connection, revokes tokens if last user
+                _LOGGER.debug('Unloading library connection')
+                hub, self.hub = self.hub, None
                 try:
-                    # Save session is false, remove any saved tokens
-                    entry_data[CONF_TOKENS] = {}
-                    _LOGGER.debug("Removing tokens from config registry")
-                    self.hass.config_entries.async_update_entry(
-                        self.entry,
-                        data=entry_data,
-                        options=entry_options
-                    )
-                    # Revoke tokens
-                    _LOGGER.debug("Terminate connection")
-                    await self.connection.terminate()
+                    await hub.async_detach(self, keep_session)
                 except Exception as e:
                     raise SkodaException(f'Revocation of tokens failed: {e}')
-            # Clear connection session
-            _LOGGER.debug('Unloading library connection')
-            self.connection = None
         except (SkodaException) as e:
             _LOGGER.error(e)
             return False
@@ -885,19 +2391,15 @@ class SkodaCoordinator(DataUpdateCoordinator):
         """Login to Skoda Connect"""
         # Check if we can login
         try:
-            restore = False
+            tokens = None
             if self.entry.options.get(CONF_SAVESESSION, False):
                 if len(self.entry.data.get(CONF_TOKENS, {})) != 0:
-                    if await self.connection.restore_tokens(self.entry.data.get(CONF_TOKENS, None)):
-                        restore = True
-            if restore is False:
-                if await self.connection.doLogin() is False:
-                    _LOGGER.warning(
-                        "Could not login to Skoda Connect, please check your credentials and verify that the service is working"
-                    )
-                    return False
-            # Get associated vehicles before we continue
-            await self.connection.get_vehicles()
+                    tokens = self.entry.data.get(CONF_TOKENS, None)
+            if await self.hub.async_login(tokens) is False:
+                _LOGGER.warning(
+                    "Could not login to Skoda Connect, please check your credentials and verify that the service is working"
+                )
+                return False
             return True
         except (SkodaAccountLockedException, SkodaAuthenticationException) as e:
             # Raise auth failed error in config flow
@@ -908,16 +2410,59 @@ class SkodaCoordinator(DataUpdateCoordinator):
     async def update(self) -> Union[bool, Vehicle]:
         """Update status from Skoda Connect"""
 
+        if not self.backoff.allow():
+            _LOGGER.debug(
+                f"Skipping update of {self.vin}, backing off until {self.backoff.retry_at}"
+            )
+            return False
+
         # Update vehicle data
         _LOGGER.debug("Updating data from Skoda Connect")
         try:
+            # Login if setup continued from last known state
+            if not self.hub.logged_in and not await self.async_login():
+                self._update_failed()
+                return False
             # Get Vehicle object matching VIN number
             vehicle = self.connection.vehicle(self.vin)
-            if await vehicle.update():
+            if await self._async_fetch(vehicle):
+                self._update_succeeded()
                 return vehicle
             else:
                 _LOGGER.warning("Could not query update from Skoda Connect")
+                self._update_failed()
                 return False
+        except SkodaThrottledException as error:
+            _LOGGER.warning(f"Skoda Connect is throttling requests, backing off: {error}")
+            self._update_failed(error, throttled=True)
+            return False
         except Exception as error:
             _LOGGER.warning(f"An error occured while requesting update from Skoda Connect: {error}")
+            self._update_failed(error)
             return False
+
+    def _update_succeeded(self):
+        """Reset back off after a successful update."""
+        state = self.backoff.state
+        backed_off = self.backoff.failures or self.backoff.retry_at is not None
+        self.backoff.success()
+        if state != self.backoff.state:
+            _LOGGER.info(f"Updates for {self.vin} recovered, circuit breaker closed")
+        if backed_off:
+            async_dispatcher_send(self.hass, SIGNAL_API_STATUS.format(self.vin))
+
+    def _update_failed(self, error=None, throttled=False):
+        """Back off after a failed update."""
+        state = self.backoff.state
+        self.backoff.failure(error, throttled)
+        if throttled and self.hub is not None:
+            # Throttling applies to the whole account
+            for coordinator in self.hub.coordinators:
+                if coordinator is not self:
+                    coordinator.backoff.defer(self.backoff.retry_at)
+                    async_dispatcher_send(self.hass, SIGNAL_API_STATUS.format(coordinator.vin))
+        if state != self.backoff.state and self.backoff.state == BREAKER_OPEN:
+            _LOGGER.warning(
+                f"Updates for {self.vin} failed {self.backoff.failures} times, pausing until {self.backoff.retry_at}"
+            )
+        async_dispatcher_send(self.hass, SIGNAL_API_STATUS.format(self.vin))
@@ -27,16 +27,12 @@ async def async_setup_entry(hass, entry, async_add_devices):
         else:
             resources = entry.data[CONF_RESOURCES]
 
-        async_add_devices(
-            SkodaBinarySensor(
+        def entity(instrument):
+            return SkodaBinarySensor(
                 data, instrument.vehicle_name, instrument.component, instrument.attr, hass.data[DOMAIN][entry.entry_id][UPDATE_CALLBACK]
             )
-            for instrument in (
-                instrument
-                for instrument in data.instruments
-                if instrument.component == "binary_sensor" and instrument.attr in resources
-            )
-        )
+
+        data.async_add_entities("binary_sensor", entity, async_add_devices, resources)
 
     return True
 
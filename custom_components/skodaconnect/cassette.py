@@ -0,0 +1,467 @@
+"""
+Record and replay of the API traffic of a Skoda Connect connection
+
+The recorder wraps the client session of a connection and stores every request
+with its response in a cassette: a gzip compressed file with one JSON object per
+line. Request bodies are never stored, credentials, tokens, VINs and positions in
+URLs and responses are redacted before anything is written.
+
+The player answers the requests of a connection from a cassette, with the
+recorded latency or faster, so recorded sessions can be replayed through the
+integration without a car or account.
+"""
+import asyncio
+import base64
+import gzip
+import json
+import logging
+import re
+import time
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qsl, urlencode
+
+from aiohttp import ClientError, ClientResponseError, RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+CASSETTE_SUFFIX = ".jsonl.gz"
+# Recorded requests kept in memory before they are appended to the file
+CASSETTE_FLUSH_SIZE = 50
+
+REDACTED = "REDACTED"
+REDACTED_USERNAME = "user@example.com"
+REDACTED_VIN = "TMBREDACTED{:06d}"
+# JSON keys and query parameters with secret values
+SECRET_KEYS = {
+    "access_token",
+    "accesstoken",
+    "authorization",
+    "email",
+    "hmac",
+    "id_token",
+    "idtoken",
+    "nonce",
+    "password",
+    "refresh_token",
+    "refreshtoken",
+    "securitypin",
+    "securitytoken",
+    "spin",
+    "userid",
+    "username",
+}
+# OAuth parameters of login redirects, vehicle data uses the same names in JSON
+SECRET_PARAMS = SECRET_KEYS | {"code", "state"}
+# JSON keys with coordinates, numbers are replaced by zero
+POSITION_KEYS = {"lat", "latitude", "lng", "lon", "longitude"}
+# Token claims identifying the user, their values are redacted everywhere
+SECRET_CLAIMS = {"email", "family_name", "given_name", "jti", "name", "sid", "sub"}
+# Response headers used by the library, all others are left out
+RESPONSE_HEADERS = {"content-type", "location", "retry-after"}
+
+JWT = re.compile(r"\beyJ[\w-]+\.eyJ[\w-]+\.[\w-]*")
+VIN = re.compile(
+    r"\b(?=[A-HJ-NPR-Z0-9]*[A-HJ-NPR-Z])(?=[A-HJ-NPR-Z0-9]*[0-9])[A-HJ-NPR-Z0-9]{17}\b"
+)
+DIGITS = re.compile(r"\d+")
+# Request keys the player tries in turn, as (template, query)
+MATCH_ORDER = ((False, True), (False, False), (True, False))
+
+
+def _b64decode(value):
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _b64encode(value):
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode()
+
+
+class Redactor:
+    """Replace secrets in recorded traffic by stable placeholders."""
+
+    def __init__(self, secrets=None):
+        # Known secrets like the username with their placeholder
+        self.secrets = {secret: placeholder for secret, placeholder in (secrets or {}).items() if secret}
+        self.vins = {}
+
+    def vin(self, match):
+        """Return the placeholder of a VIN."""
+        vin = match.group(0)
+        if vin.startswith(REDACTED_VIN[:11]):
+            return vin
+        if vin not in self.vins:
+            self.vins[vin] = REDACTED_VIN.format(len(self.vins) + 1)
+        return self.vins[vin]
+
+    def jwt(self, match):
+        """Return a token without signature and with the user claims redacted.
+
+        The library reads the expiry from the tokens, so they stay valid JWTs.
+        Redacted claim values are redacted in all later traffic, for example a
+        user id in request URLs.
+        """
+        header, payload, _ = match.group(0).split(".")
+        try:
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            return REDACTED
+        if not isinstance(claims, dict):
+            return REDACTED
+        for claim in SECRET_CLAIMS.intersection(claims):
+            value = claims[claim]
+            if isinstance(value, str) and len(value) >= 6:
+                self.secrets.setdefault(value, REDACTED)
+            claims[claim] = REDACTED
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        return f"{header}.{payload}.{REDACTED}"
+
+    def text(self, text):
+        """Redact a text, a response body or part of a URL."""
+        for secret, placeholder in self.secrets.items():
+            text = text.replace(secret, placeholder)
+        text = JWT.sub(self.jwt, text)
+        return VIN.sub(self.vin, text)
+
+    def data(self, data, key=None):
+        """Redact decoded JSON data."""
+        if isinstance(data, dict):
+            return {name: self.data(value, name) for name, value in data.items()}
+        if isinstance(data, list):
+            return [self.data(value, key) for value in data]
+        key = key.lower() if isinstance(key, str) else None
+        if key in POSITION_KEYS and isinstance(data, (int, float)) and not isinstance(data, bool):
+            return type(data)(0)
+        if isinstance(data, str):
+            return self.value(key, data)
+        return data
+
+    def value(self, key, value, secrets=SECRET_KEYS):
+        """Redact the string value of a JSON key or query parameter."""
+        if key in secrets and not JWT.fullmatch(value):
+            return REDACTED
+        return self.text(value)
+
+    def query(self, query):
+        """Redact a query string or URL fragment."""
+        if "=" not in query:
+            return self.text(query)
+        return urlencode(
+            [
+                (name, self.value(name.lower(), value, SECRET_PARAMS))
+                for name, value in parse_qsl(query, keep_blank_values=True)
+            ]
+        )
+
+    def url(self, url):
+        """Redact a URL, login redirects carry tokens in the query or fragment."""
+        url, _, fragment = str(url).partition("#")
+        url, _, query = url.partition("?")
+        url = self.text(url)
+        if query:
+            url += "?" + self.query(query)
+        if fragment:
+            url += "#" + self.query(fragment)
+        return url
+
+    def body(self, body):
+        """Return the cassette fields of a redacted response body."""
+        if not body:
+            return {}
+        try:
+            text = body.decode("utf-8")
+        except UnicodeDecodeError:
+            # Images and other binary content
+            return {"b64": base64.b64encode(body).decode()}
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return {"b": self.text(text)}
+        return {"b": json.dumps(self.data(data), separators=(",", ":"))}
+
+
+def request_key(method, url, template=False, query=False):
+    """Return the key a request is matched on, the fragment is ignored.
+
+    The query is only part of the key when asked for, the template key also
+    ignores numbers in the path, like timestamps.
+    """
+    url, _, params = str(url).partition("#")[0].partition("?")
+    if template:
+        url = DIGITS.sub("#", url)
+    if query and params:
+        url = f"{url}?{params}"
+    return (template, query and bool(params), method.upper(), url)
+
+
+def read_cassette(path):
+    """Return the header and recorded requests of a cassette file."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+    if not lines or lines[0].get("cassette") != CASSETTE_VERSION:
+        raise ValueError(f"{path} is not a cassette")
+    return lines[0], lines[1:]
+
+
+class RequestContext:
+    """Awaitable and async context manager for a response, like aiohttp returns."""
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, *args):
+        self._response.release()
+
+
+class CassetteRecorder:
+    """Client session that records all requests and responses to a cassette.
+
+    Wraps an aiohttp ClientSession, responses are read completely before they
+    are returned to the library so the body can be recorded.
+    """
+
+    def __init__(self, hass: HomeAssistant, session, path, secrets=None):
+        self.hass = hass
+        self.path = path
+        self.count = 0
+        self.redactor = Redactor(secrets)
+        self._session = session
+        self._started = time.monotonic()
+        self._pending = [
+            json.dumps({"cassette": CASSETTE_VERSION, "recorded": dt_util.utcnow().isoformat()})
+        ]
+        self._lock = asyncio.Lock()
+
+    def request(self, method, url, **kwargs):
+        """Send a request and record it."""
+        return RequestContext(self._request(method, url, **kwargs))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    async def _request(self, method, url, **kwargs):
+        started = time.monotonic()
+        entry = {
+            "t": round(started - self._started, 3),
+            "m": method.upper(),
+            "u": self.redactor.url(url),
+        }
+        try:
+            response = await self._session.request(method, url, **kwargs)
+            body = await response.read()
+        except (ClientError, asyncio.TimeoutError) as e:
+            entry["d"] = round(time.monotonic() - started, 3)
+            entry["e"] = type(e).__name__
+            entry["x"] = self.redactor.text(str(e))
+            self._record(entry)
+            raise
+        entry["d"] = round(time.monotonic() - started, 3)
+        entry.update(self._response(response))
+        if response.history:
+            entry["r"] = [self._response(redirect, True) for redirect in response.history]
+            entry["f"] = self.redactor.url(response.url)
+        entry.update(self.redactor.body(body))
+        self._record(entry)
+        return response
+
+    def _response(self, response, redirect=False):
+        headers = {
+            name: self.redactor.url(value) if name.lower() == "location" else value
+            for name, value in response.headers.items()
+            if name.lower() in RESPONSE_HEADERS
+        }
+        data = {"s": response.status, "h": headers}
+        if redirect:
+            data["u"] = self.redactor.url(response.url)
+        return data
+
+    def _record(self, entry):
+        self.count += 1
+        self._pending.append(json.dumps(entry, separators=(",", ":")))
+        if len(self._pending) >= CASSETTE_FLUSH_SIZE:
+            self.hass.async_create_task(self.async_flush())
+
+    def _write(self, lines):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Every flush appends a gzip member, readers see one stream
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    async def async_flush(self):
+        """Append the recorded requests to the cassette file."""
+        async with self._lock:
+            lines, self._pending = self._pending, []
+            if lines:
+                await self.hass.async_add_executor_job(self._write, lines)
+
+    async def async_close(self):
+        """Write the remaining requests."""
+        await self.async_flush()
+        _LOGGER.debug(f"Recorded {self.count} requests to {self.path}")
+
+
+class CassetteResponse:
+    """Recorded response with the parts of an aiohttp ClientResponse the library uses."""
+
+    def __init__(self, method, entry):
+        self.method = method.upper()
+        self.status = entry["s"]
+        self.url = self.real_url = URL(entry.get("f", entry["u"]))
+        self.headers = CIMultiDictProxy(CIMultiDict(entry.get("h", {})))
+        self.history = tuple(CassetteResponse(method, redirect) for redirect in entry.get("r", []))
+        self.cookies = SimpleCookie()
+        self.request_info = RequestInfo(self.url, self.method, CIMultiDictProxy(CIMultiDict()), self.url)
+        if "b64" in entry:
+            self._body = base64.b64decode(entry["b64"])
+        else:
+            self._body = entry.get("b", "").encode("utf-8")
+
+    @property
+    def ok(self):
+        return self.status < 400
+
+    @property
+    def reason(self):
+        try:
+            return HTTPStatus(self.status).phrase
+        except ValueError:
+            return None
+
+    @property
+    def content_type(self):
+        return self.headers.get("Content-Type", "application/octet-stream").split(";")[0]
+
+    def get_encoding(self):
+        return "utf-8"
+
+    async def read(self):
+        return self._body
+
+    async def text(self, encoding=None, errors="strict"):
+        return self._body.decode(encoding or "utf-8", errors)
+
+    async def json(self, *, encoding=None, loads=json.loads, content_type="application/json"):
+        if not self._body.strip():
+            return None
+        return loads(self._body.decode(encoding or "utf-8"))
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise ClientResponseError(
+                self.request_info,
+                self.history,
+                status=self.status,
+                message=self.reason or "",
+                headers=self.headers,
+            )
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.release()
+
+
+class CassettePlayer:
+    """Client session that answers requests from a cassette.
+
+    Requests are matched on method and URL in recorded order, first with the
+    query, then without it and then also with numbers in the path ignored. The last response of a request is repeated
+    once the recorded ones are used up. With speed 1 every response takes as long
+    as it did when recorded, higher speeds divide the latency and speed 0 answers
+    immediately. Other attributes are passed on to the wrapped session, if any.
+    """
+
+    def __init__(self, entries, speed=1.0, session=None):
+        self.speed = speed
+        self.replayed = 0
+        self.unmatched = []
+        self._session = session
+        self._entries = {}
+        self._positions = {}
+        for entry in entries:
+            # Without a query the first two keys are the same
+            for key in dict.fromkeys(request_key(entry["m"], entry["u"], *match) for match in MATCH_ORDER):
+                self._entries.setdefault(key, []).append(entry)
+
+    def request(self, method, url, **kwargs):
+        """Answer a request with the next recorded response."""
+        return RequestContext(self._request(method, url))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def __getattr__(self, name):
+        if self._session is None:
+            raise AttributeError(name)
+        return getattr(self._session, name)
+
+    def _next(self, key):
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        position = self._positions.get(key, 0)
+        self._positions[key] = position + 1
+        return entries[min(position, len(entries) - 1)]
+
+    async def _request(self, method, url):
+        # Only the first key with recorded responses moves on to the next one
+        entry = next(
+            filter(None, (self._next(request_key(method, url, *match)) for match in MATCH_ORDER)),
+            None,
+        )
+        if entry is None:
+            _LOGGER.warning(f"No recorded response for {method.upper()} {url}")
+            self.unmatched.append(f"{method.upper()} {url}")
+            entry = {"s": 404, "u": str(url)}
+        else:
+            self.replayed += 1
+        # Always yield like network I/O, eager tasks would otherwise finish before
+        # their caller continues
+        await asyncio.sleep(entry["d"] / self.speed if self.speed and entry.get("d") else 0)
+        if "e" in entry:
+            if entry["e"] in ("TimeoutError", "ServerTimeoutError"):
+                raise asyncio.TimeoutError(entry.get("x"))
+            raise ClientError(entry.get("x"))
+        return CassetteResponse(method, entry)
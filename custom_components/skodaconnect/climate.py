@@ -18,9 +18,13 @@ from homeassistant.const import (
     CONF_RESOURCES
 )
 
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
 SUPPORT_HVAC = [HVAC_MODE_COOL, HVAC_MODE_HEAT, HVAC_MODE_OFF]
 
 from . import DATA, DATA_KEY, DOMAIN, SkodaEntity
+from .const import CLIMATE_TEMPERATURE_DEBOUNCE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,16 +45,12 @@ async def async_setup_entry(hass, entry, async_add_devices):
         else:
             resources = entry.data[CONF_RESOURCES]
 
-        async_add_devices(
-            SkodaClimate(
+        def entity(instrument):
+            return SkodaClimate(
                 data, instrument.vehicle_name, instrument.component, instrument.attr
             )
-            for instrument in (
-                instrument
-                for instrument in data.instruments
-                if instrument.component == "climate" and instrument.attr in resources
-            )
-        )
+
+        data.async_add_entities("climate", entity, async_add_devices, resources)
 
     return True
 
@@ -58,6 +58,17 @@ async def async_setup_entry(hass, entry, async_add_devices):
 class SkodaClimate(SkodaEntity, ClimateEntity):
     """Representation of a Skoda Connect Climate."""
 
+    def __init__(self, *args, **kwargs):
+        """Initialize the climate entity."""
+        super().__init__(*args, **kwargs)
+        self._pending_temperature = None
+        self._temperature_unsub = None
+
+    async def async_added_to_hass(self):
+        """Register update dispatcher."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_temperature)
+
     @property
     def supported_features(self):
         """Return the list of supported features."""
@@ -68,6 +79,11 @@ class SkodaClimate(SkodaEntity, ClimateEntity):
         """Return hvac operation ie. heat, cool mode.
         Need to be one of HVAC_MODE_*.
         """
+        return self.optimistic_state(self.actual_state)
+
+    @property
+    def actual_state(self):
+        """Return the hvac mode reported by the vehicle."""
         if not self.instrument.hvac_mode:
             return HVAC_MODE_OFF
 
@@ -92,6 +108,8 @@ class SkodaClimate(SkodaEntity, ClimateEntity):
     @property
     def target_temperature(self):
         """Return the temperature we try to reach."""
+        if self._pending_temperature is not None:
+            return self._pending_temperature
         if self.instrument.target_temperature:
             return float(self.instrument.target_temperature)
         else:
@@ -101,11 +119,55 @@ class SkodaClimate(SkodaEntity, ClimateEntity):
         """Set new target temperatures."""
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature:
-            await self.instrument.set_temperature(temperature)
+            # Show the pending target until it is sent, only the last target
+            # is sent once the user stopped changing it
+            self._pending_temperature = float(temperature)
+            self.async_write_ha_state()
+            self._async_cancel_temperature()
+            self._temperature_unsub = async_call_later(
+                self.hass, CLIMATE_TEMPERATURE_DEBOUNCE, self._async_temperature_settled
+            )
+
+    @callback
+    def _async_cancel_temperature(self):
+        """Cancel a pending target temperature timer."""
+        if self._temperature_unsub is not None:
+            self._temperature_unsub()
+            self._temperature_unsub = None
+
+    @callback
+    def _async_temperature_settled(self, _now=None):
+        """Send the pending target temperature in the background."""
+        self._temperature_unsub = None
+        if self._pending_temperature is None:
+            return
+        # A send can wait long for the vehicle, later targets must not wait for it
+        self.coordinator.entry.async_create_background_task(
+            self.hass,
+            self._async_send_temperature(self._pending_temperature),
+            f"{DOMAIN}_set_temperature_{self.vin}",
+        )
+
+    async def _async_send_temperature(self, temperature):
+        """Send a target temperature, a queued older one is replaced."""
+        try:
+            await self.async_command(
+                "set_temperature", self.instrument.set_temperature, temperature, replace=True
+            )
+        except Exception as e:
+            _LOGGER.warning(f"Failed to set target temperature of {self.entity_id}: {e}")
+        finally:
+            if self._pending_temperature == temperature:
+                self._pending_temperature = None
+            self.async_write_ha_state()
 
     async def async_set_hvac_mode(self, hvac_mode):
         """Set new target hvac mode."""
         if hvac_mode == HVAC_MODE_OFF:
-            await self.instrument.set_hvac_mode(False)
+            await self.async_command(
+                "set_hvac_mode", self.instrument.set_hvac_mode, False, expected=HVAC_MODE_OFF
+            )
         elif hvac_mode == HVAC_MODE_HEAT:
-            await self.instrument.set_hvac_mode(True)
+            await self.async_command(
+                "set_hvac_mode", self.instrument.set_hvac_mode, True, expected=HVAC_MODE_HEAT
+            )
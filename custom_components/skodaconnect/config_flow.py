@@ -25,8 +25,17 @@ from .const import (
     CONF_INSTRUMENTS,
     CONF_SAVESESSION,
     CONF_TOKENS,
+    CONF_FLEET_MODE,
+    CONF_FLEET_CONCURRENCY,
+    CONF_ADAPTIVE_POLLING,
+    CONF_REFRESH_SETTLE,
+    CONF_RECORD,
     MIN_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_FLEET_CONCURRENCY,
+    MAX_FLEET_CONCURRENCY,
+    DEFAULT_REFRESH_SETTLE,
+    MAX_REFRESH_SETTLE,
     DOMAIN,
     DEFAULT_DEBUG,
 )
@@ -73,6 +82,10 @@ class SkodaConnectConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_SPIN: None,
                 CONF_SAVESESSION: False,
                 CONF_RESOURCES: [],
+                CONF_FLEET_MODE: False,
+                CONF_FLEET_CONCURRENCY: DEFAULT_FLEET_CONCURRENCY,
+                CONF_ADAPTIVE_POLLING: False,
+                CONF_REFRESH_SETTLE: DEFAULT_REFRESH_SETTLE,
             }
 
             _LOGGER.debug("Creating connection to Skoda Connect")
@@ -330,6 +343,10 @@ class SkodaConnectConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_SPIN: None,
             CONF_SAVESESSION: False,
             CONF_RESOURCES: [],
+            CONF_FLEET_MODE: False,
+            CONF_FLEET_CONCURRENCY: DEFAULT_FLEET_CONCURRENCY,
+            CONF_ADAPTIVE_POLLING: False,
+            CONF_REFRESH_SETTLE: DEFAULT_REFRESH_SETTLE,
         }
         self._init_info = {}
 
@@ -445,12 +462,21 @@ class SkodaConnectOptionsFlowHandler(config_entries.OptionsFlow):
 
             options = self._config_entry.options.copy()
             options[CONF_SCAN_INTERVAL] = user_input.get(CONF_SCAN_INTERVAL, 1)
+            options[CONF_ADAPTIVE_POLLING] = user_input.get(CONF_ADAPTIVE_POLLING, False)
+            options[CONF_REFRESH_SETTLE] = user_input.get(
+                CONF_REFRESH_SETTLE, DEFAULT_REFRESH_SETTLE
+            )
             options[CONF_SPIN] = user_input.get(CONF_SPIN, None)
             options[CONF_MUTABLE] = user_input.get(CONF_MUTABLE, True)
             options[CONF_SAVESESSION] = user_input.get(CONF_SAVESESSION, True)
             options[CONF_DEBUG] = user_input.get(CONF_DEBUG, False)
+            options[CONF_RECORD] = user_input.get(CONF_RECORD, False)
             options[CONF_RESOURCES] = user_input.get(CONF_RESOURCES, [])
             options[CONF_CONVERT] = user_input.get(CONF_CONVERT, CONF_NO_CONVERSION)
+            options[CONF_FLEET_MODE] = user_input.get(CONF_FLEET_MODE, False)
+            options[CONF_FLEET_CONCURRENCY] = user_input.get(
+                CONF_FLEET_CONCURRENCY, DEFAULT_FLEET_CONCURRENCY
+            )
             return self.async_create_entry(
                 title=self._config_entry,
                 data={
@@ -494,6 +520,18 @@ class SkodaConnectOptionsFlowHandler(config_entries.OptionsFlow):
                     ): vol.All(
                         vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=900)
                     ),
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self._config_entry.options.get(CONF_ADAPTIVE_POLLING, False),
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_REFRESH_SETTLE,
+                        default=self._config_entry.options.get(
+                            CONF_REFRESH_SETTLE, DEFAULT_REFRESH_SETTLE
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_REFRESH_SETTLE)
+                    ),
                     vol.Optional(
                         CONF_SPIN,
                         default=self._config_entry.options.get(
@@ -520,6 +558,10 @@ class SkodaConnectOptionsFlowHandler(config_entries.OptionsFlow):
                             CONF_DEBUG, self._config_entry.data.get(CONF_DEBUG, False)
                         ),
                     ): cv.boolean,
+                    vol.Optional(
+                        CONF_RECORD,
+                        default=self._config_entry.options.get(CONF_RECORD, False),
+                    ): cv.boolean,
                     vol.Optional(
                         CONF_RESOURCES,
                         default=self._config_entry.options.get(
@@ -528,6 +570,18 @@ class SkodaConnectOptionsFlowHandler(config_entries.OptionsFlow):
                         ),
                     ): cv.multi_select(instruments_dict),
                     vol.Required(CONF_CONVERT, default=convert): vol.In(CONVERT_DICT),
+                    vol.Optional(
+                        CONF_FLEET_MODE,
+                        default=self._config_entry.options.get(CONF_FLEET_MODE, False),
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_FLEET_CONCURRENCY,
+                        default=self._config_entry.options.get(
+                            CONF_FLEET_CONCURRENCY, DEFAULT_FLEET_CONCURRENCY
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=MAX_FLEET_CONCURRENCY)
+                    ),
                 }
             ),
         )
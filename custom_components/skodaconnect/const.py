@@ -14,9 +14,15 @@ CONF_INSTRUMENTS = "instruments"
 CONF_DEBUG = "debug"
 CONF_SAVESESSION = "store_tokens"
 CONF_TOKENS = "tokens"
+CONF_FLEET_MODE = "fleet_mode"
+CONF_FLEET_CONCURRENCY = "fleet_concurrency"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_REFRESH_SETTLE = "refresh_settle"
+CONF_RECORD = "record_cassette"
 
 # Service definitions
 SERVICE_SET_SCHEDULE = "set_departure_schedule"
+SERVICE_SET_SCHEDULES = "set_departure_schedules"
 SERVICE_SET_MAX_CURRENT = "set_charger_max_current"
 SERVICE_SET_CHARGE_LIMIT = "set_charge_limit"
 SERVICE_SET_CLIMATER = "set_climater"
@@ -24,14 +30,167 @@ SERVICE_SET_PHEATER_DURATION = "set_pheater_duration"
 
 UPDATE_CALLBACK = "update_callback"
 DATA = "data"
+HUBS = "hubs"
+DEVICES = "devices"
 UNDO_UPDATE_LISTENER = "undo_update_listener"
 REMOVE_LISTENER = "remove_listener"
 
+# Events and states of service calls tracked in the background
+ATTR_WAIT = "wait"
+EVENT_COMMAND_PROGRESS = f"{DOMAIN}_command_progress"
+EVENT_COMMAND_COMPLETED = f"{DOMAIN}_command_completed"
+EVENT_COMMAND_FAILED = f"{DOMAIN}_command_failed"
+REQUEST_QUEUED = "queued"
+REQUEST_RUNNING = "running"
+REQUEST_COMPLETED = "completed"
+REQUEST_FAILED = "failed"
+
 SIGNAL_STATE_UPDATED = f"{DOMAIN}.updated"
+SIGNAL_API_STATUS = f"{DOMAIN}.api_status.{{}}"
+SIGNAL_COMMAND_QUEUE = f"{DOMAIN}.command_queue.{{}}"
+
+# Seconds to show the expected state after a command before rolling back
+OPTIMISTIC_TIMEOUT = 300
+# Switches that trigger an action and always report off, they have no expected state
+MOMENTARY_SWITCHES = ["request_flash", "request_honkandflash", "refresh_data"]
+
+# Seconds to wait for more target temperature changes before sending one
+CLIMATE_TEMPERATURE_DEBOUNCE = 3
+
+# Back off and circuit breaker for failing or throttled updates (seconds)
+BACKOFF_BASE = 60
+BACKOFF_THROTTLED = 900
+BACKOFF_MAX = 3600
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 3600
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Last known state, stored to set up entities before the API answers
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30
+SNAPSHOT_VEHICLE_ATTRS = [
+    "vin",
+    "model",
+    "model_year",
+    "nickname",
+    "is_nickname_supported",
+    "charging",
+    "model_image_small",
+    "is_model_image_small_supported",
+    "model_image_large",
+    "is_model_image_large_supported",
+]
+SNAPSHOT_INSTRUMENT_ATTRS = [
+    "component",
+    "attr",
+    "slug_attr",
+    "name",
+    "icon",
+    "vehicle_name",
+    "state",
+    "attributes",
+    "unit",
+    "device_class",
+    "is_on",
+    "is_locked",
+    "assumed_state",
+    "is_mutable",
+    "hvac_mode",
+    "target_temperature",
+]
+
+# Library getter for each data group, only groups needed by enabled resources are fetched
+DATA_GROUP_STATUS = "status"
+DATA_GROUPS = {
+    DATA_GROUP_STATUS: "get_statusreport",
+    "position": "get_position",
+    "charging": "get_charger",
+    "climater": "get_climater",
+    "preheater": "get_preheater",
+    "timers": "get_timerprogramming",
+    "trips": "get_trip_statistic",
+}
+# Data groups read by each resource, resources not listed here read the status report
+ATTR_DATA_GROUPS = {
+    "position": ["position"],
+    "parking_time": ["position"],
+    "vehicle_moving": ["position"],
+    "charging": ["charging"],
+    "battery_level": ["charging"],
+    "charge_max_ampere": ["charging"],
+    "charging_cable_connected": ["charging"],
+    "charging_cable_locked": ["charging"],
+    "charging_time_left": ["charging"],
+    "charge_rate": ["charging"],
+    "charging_power": ["charging"],
+    "charging_state": ["charging"],
+    "energy_flow": ["charging"],
+    "external_power": ["charging"],
+    "min_charge_level": ["charging", "timers"],
+    "plug_autounlock": ["charging"],
+    "electric_range": ["charging", DATA_GROUP_STATUS],
+    "combined_range": ["charging", DATA_GROUP_STATUS],
+    "climatisation_target_temperature": ["climater"],
+    "climatisation_without_external_power": ["climater"],
+    "electric_climatisation": ["climater"],
+    "auxiliary_climatisation": ["climater"],
+    "window_heater": ["climater"],
+    "seat_heating": ["climater"],
+    "aircon_at_unlock": ["climater"],
+}
+# Prefixes of resources that read a single data group
+DATA_GROUP_PREFIXES = {
+    "pheater_": "preheater",
+    "departure": "timers",
+    "trip_": "trips",
+}
+# Minimum seconds between refreshes of slow changing data groups, others follow the poll frequency
+DATA_GROUP_INTERVALS = {
+    "timers": 1800,
+    "trips": 900,
+}
+# Data groups affected by each service, refreshed after the service call
+SERVICE_DATA_GROUPS = {
+    SERVICE_SET_SCHEDULE: ["timers"],
+    SERVICE_SET_SCHEDULES: ["timers", "charging"],
+    SERVICE_SET_MAX_CURRENT: ["charging"],
+    SERVICE_SET_CHARGE_LIMIT: ["charging", "timers"],
+    SERVICE_SET_CLIMATER: ["climater"],
+}
+# Minimum charge limits of the VW-Group departure timers
+TIMER_CHARGE_LIMITS = [0, 10, 20, 30, 40, 50]
+# Library version whose departure timer request set_timer_charge_limit uses
+TIMER_LIBRARY_VERSION = "1.3.11"
+# Seconds between full updates, these also rediscover vehicle capabilities
+FULL_UPDATE_INTERVAL = 3600
 
 MIN_SCAN_INTERVAL = 30
 DEFAULT_SCAN_INTERVAL = 120
 
+# Seconds without new commands before refreshing after a command
+DEFAULT_REFRESH_SETTLE = 10
+MAX_REFRESH_SETTLE = 300
+
+# Fleet mode, all vehicles of an account updated in one cycle
+DEFAULT_FLEET_CONCURRENCY = 2
+MAX_FLEET_CONCURRENCY = 10
+FLEET_STAGGER = 1
+
+# Adaptive polling, fast while active and slow while parked and locked
+ADAPTIVE_ACTIVE_INTERVAL = 60
+ADAPTIVE_IDLE_INTERVAL = 900
+ADAPTIVE_ACTIVE_ATTRS = [
+    "charging",
+    "electric_climatisation",
+    "auxiliary_climatisation",
+    "pheater_heating",
+    "pheater_ventilation",
+    "window_heater",
+    "vehicle_moving",
+]
+
 CONVERT_DICT = {
     CONF_NO_CONVERSION: "No conversion",
     CONF_IMPERIAL_UNITS: "Imperial units",
@@ -23,16 +23,12 @@ async def async_setup_entry(hass, entry, async_add_devices):
         else:
             resources = entry.data[CONF_RESOURCES]
 
-        async_add_devices(
-            SkodaDeviceTracker(
+        def entity(instrument):
+            return SkodaDeviceTracker(
                 data, instrument.vehicle_name, instrument.component, instrument.attr
             )
-            for instrument in (
-                instrument
-                for instrument in data.instruments
-                if instrument.component == "device_tracker" and instrument.attr in resources
-            )
-        )
+
+        data.async_add_entities("device_tracker", entity, async_add_devices, resources)
 
     return True
 
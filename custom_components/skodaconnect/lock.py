@@ -28,14 +28,12 @@ async def async_setup_entry(hass, entry, async_add_devices):
         else:
             resources = entry.data[CONF_RESOURCES]
 
-        async_add_devices(
-            SkodaLock(data, instrument.vehicle_name, instrument.component, instrument.attr)
-            for instrument in (
-                instrument
-                for instrument in data.instruments
-                if instrument.component == "lock" and instrument.attr in resources
+        def entity(instrument):
+            return SkodaLock(
+                data, instrument.vehicle_name, instrument.component, instrument.attr
             )
-        )
+
+        data.async_add_entities("lock", entity, async_add_devices, resources)
 
     return True
 
@@ -43,15 +41,20 @@ async def async_setup_entry(hass, entry, async_add_devices):
 class SkodaLock(SkodaEntity, LockEntity):
     """Represents a Skoda Connect Lock."""
 
+    @property
+    def actual_state(self):
+        """Return the lock state reported by the vehicle."""
+        return self.instrument.is_locked
+
     @property
     def is_locked(self):
         """Return true if lock is locked."""
-        return self.instrument.is_locked
+        return self.optimistic_state(self.actual_state)
 
     async def async_lock(self, **kwargs):
         """Lock the car."""
-        await self.instrument.lock()
+        await self.async_command("lock", self.instrument.lock, expected=True)
 
     async def async_unlock(self, **kwargs):
         """Unlock the car."""
-        await self.instrument.unlock()
+        await self.async_command("unlock", self.instrument.unlock, expected=False)
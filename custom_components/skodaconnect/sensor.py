@@ -4,9 +4,17 @@ Support for Skoda Connect Platform
 import logging
 
 from . import DATA_KEY, DOMAIN, SkodaEntity
-from .const import DATA
-from homeassistant.components.sensor import DEVICE_CLASSES, SensorEntity
-from homeassistant.const import CONF_RESOURCES
+from .const import (
+    DATA,
+    SIGNAL_API_STATUS,
+    SIGNAL_COMMAND_QUEUE,
+    BREAKER_CLOSED,
+    BREAKER_OPEN,
+    BREAKER_HALF_OPEN,
+)
+from homeassistant.components.sensor import DEVICE_CLASSES, SensorDeviceClass, SensorEntity
+from homeassistant.const import CONF_RESOURCES, EntityCategory
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,16 +35,13 @@ async def async_setup_entry(hass, entry, async_add_devices):
         else:
             resources = entry.data[CONF_RESOURCES]
 
-        async_add_devices(
-            SkodaSensor(
+        def entity(instrument):
+            return SkodaSensor(
                 data, instrument.vehicle_name, instrument.component, instrument.attr
             )
-            for instrument in (
-                instrument
-                for instrument in data.instruments
-                if instrument.component == "sensor" and instrument.attr in resources
-            )
-        )
+
+        data.async_add_entities("sensor", entity, async_add_devices, resources)
+        async_add_devices([SkodaApiStatusSensor(data), SkodaCommandQueueSensor(data)])
 
     return True
 
@@ -77,3 +82,104 @@ class SkodaSensor(SkodaEntity, SensorEntity):
             state_class = None
         return state_class
 
+
+class SkodaDiagnosticSensor(SensorEntity):
+    """Base class for diagnostic sensors of the integration itself."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+    key = None
+    label = None
+    signal = None
+
+    def __init__(self, data):
+        """Initialize the sensor."""
+        self.data = data
+        self.coordinator = data.coordinator
+        self.vin = data.coordinator.vin
+
+    async def async_added_to_hass(self):
+        """Register update listeners."""
+        # Written when what they report changes, not on every coordinator update
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.signal.format(self.vin), self.async_write_ha_state
+            )
+        )
+
+    @property
+    def name(self):
+        """Return full name of the entity."""
+        vehicle = next(
+            (instrument.vehicle for instrument in self.coordinator.data or []), None
+        )
+        vehicle_name = self.data.vehicle_name(vehicle) if vehicle is not None else None
+        return f"{vehicle_name or self.vin} {self.label}"
+
+    @property
+    def device_info(self):
+        """Return the device_info of the device."""
+        return {"identifiers": {(DOMAIN, self.vin)}}
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID."""
+        return f"{self.vin}-sensor-{self.key}"
+
+
+class SkodaApiStatusSensor(SkodaDiagnosticSensor):
+    """Diagnostic sensor for the update back off and circuit breaker."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_icon = "mdi:api"
+    _attr_options = [BREAKER_CLOSED, BREAKER_OPEN, BREAKER_HALF_OPEN]
+    key = "api_status"
+    label = "API status"
+    signal = SIGNAL_API_STATUS
+
+    @property
+    def native_value(self):
+        """Return the circuit breaker state."""
+        return self.coordinator.backoff.state
+
+    @property
+    def extra_state_attributes(self):
+        """Return back off details."""
+        backoff = self.coordinator.backoff
+        return {
+            "consecutive_failures": backoff.failures,
+            "throttled": backoff.throttled,
+            "retry_at": backoff.retry_at.isoformat() if backoff.retry_at else None,
+            "last_error": backoff.last_error,
+        }
+
+
+class SkodaCommandQueueSensor(SkodaDiagnosticSensor):
+    """Diagnostic sensor for the command queue of a vehicle."""
+
+    _attr_icon = "mdi:tray-full"
+    _attr_native_unit_of_measurement = "commands"
+    _attr_state_class = "measurement"
+    key = "command_queue"
+    label = "Command queue"
+    signal = SIGNAL_COMMAND_QUEUE
+
+    @property
+    def native_value(self):
+        """Return the number of queued and running commands."""
+        return self.coordinator.commands.depth
+
+    @property
+    def extra_state_attributes(self):
+        """Return command queue statistics."""
+        commands = self.coordinator.commands
+        return {
+            "last_wait": round(commands.last_wait, 2) if commands.last_wait is not None else None,
+            "max_wait": round(commands.max_wait, 2),
+            "processed": commands.processed,
+            "collapsed": commands.collapsed,
+            "requests": {
+                request_id: request["status"]
+                for request_id, request in self.coordinator.requests.items()
+            },
+        }
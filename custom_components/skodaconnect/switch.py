@@ -10,6 +10,7 @@ from homeassistant.helpers import config_validation as cv, entity_platform, serv
 from homeassistant.const import CONF_RESOURCES
 
 from . import DATA, DATA_KEY, DOMAIN, SkodaEntity, UPDATE_CALLBACK
+from .const import MOMENTARY_SWITCHES
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,16 +31,12 @@ async def async_setup_entry(hass, entry, async_add_devices):
         else:
             resources = entry.data[CONF_RESOURCES]
 
-        async_add_devices(
-            SkodaSwitch(
+        def entity(instrument):
+            return SkodaSwitch(
                 data, instrument.vehicle_name, instrument.component, instrument.attr, hass.data[DOMAIN][entry.entry_id][UPDATE_CALLBACK]
             )
-            for instrument in (
-                instrument
-                for instrument in data.instruments
-                if instrument.component == "switch" and instrument.attr in resources
-            )
-        )
+
+        data.async_add_entities("switch", entity, async_add_devices, resources)
 
     return True
 
@@ -47,20 +44,32 @@ async def async_setup_entry(hass, entry, async_add_devices):
 class SkodaSwitch(SkodaEntity, ToggleEntity):
     """Representation of a Skoda Connect Switch."""
 
+    @property
+    def actual_state(self):
+        """Return the switch state reported by the vehicle."""
+        return self.instrument.state
+
     @property
     def is_on(self):
         """Return true if switch is on."""
-        return self.instrument.state
+        return self.optimistic_state(self.actual_state)
+
+    @property
+    def momentary(self):
+        """Return true if the switch triggers an action instead of holding a state."""
+        return self.attribute in MOMENTARY_SWITCHES
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
-        await self.instrument.turn_on()
-        self.async_write_ha_state()
+        await self.async_command(
+            "turn_on", self.instrument.turn_on, expected=None if self.momentary else True
+        )
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
-        await self.instrument.turn_off()
-        self.async_write_ha_state()
+        await self.async_command(
+            "turn_off", self.instrument.turn_off, expected=None if self.momentary else False
+        )
 
     @property
     def assumed_state(self):
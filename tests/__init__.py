@@ -0,0 +1 @@
+"""Tests for the Skoda Connect integration."""
@@ -0,0 +1,52 @@
+"""Fixtures for the Skoda Connect tests."""
+import pytest
+from aiohttp import ClientSession
+import custom_components.skodaconnect as integration
+from custom_components.skodaconnect import config_flow
+from tools.harness import async_add_entry, coordinator
+from tools.standin import SkodaStandin, StandinSession
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
+
+
+@pytest.fixture
+async def standin(socket_enabled):
+    """Return a running stand-in with two vehicles that complete commands at once."""
+    standin = SkodaStandin(vehicles=2, command_delay=0)
+    await standin.async_start(port=0)
+    yield standin
+    await standin.async_stop()
+
+
+@pytest.fixture
+async def standin_session(standin):
+    """Return a client session that sends all API requests to the stand-in."""
+    async with ClientSession() as session:
+        yield StandinSession(session, standin.url)
+
+
+@pytest.fixture
+async def setup_vehicle(hass, standin, standin_session, monkeypatch):
+    """Return a function that sets up a stand-in vehicle and returns its coordinator.
+
+    The first stand-in vehicle is electric, the second has a combustion engine.
+    """
+    # The shared session of Home Assistant starts a resolver thread
+    monkeypatch.setattr(integration, "async_get_clientsession", lambda hass: standin_session)
+    monkeypatch.setattr(config_flow, "async_get_clientsession", lambda hass: standin_session)
+
+    entries = []
+
+    async def setup(index=0, **options):
+        entry = await async_add_entry(hass, list(standin.vehicles)[index], options)
+        entries.append(entry)
+        return coordinator(hass, entry)
+
+    yield setup
+    # Unload while the stand-in session is still open
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,211 @@
+"""Tests of the update back off and the detection of failed fetches."""
+from types import SimpleNamespace
+
+import pytest
+
+import custom_components.skodaconnect as integration
+from custom_components.skodaconnect import FetchResults, UpdateBackoff
+from custom_components.skodaconnect.const import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    BACKOFF_THROTTLED,
+    BREAKER_CLOSED,
+    BREAKER_COOLDOWN,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    BREAKER_THRESHOLD,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Return a monotonic clock for the back off that only moves when told."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(integration, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    """Use the shortest delay of every back off step."""
+    monkeypatch.setattr(integration.random, "uniform", lambda low, high: low)
+
+
+def test_backoff_steps(clock, no_jitter):
+    """The delay doubles with every failure up to the maximum."""
+    backoff = UpdateBackoff()
+
+    for failures in range(1, BREAKER_THRESHOLD):
+        backoff.failure(Exception("failed"))
+        expected = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (failures - 1))
+        assert backoff.delay.total_seconds() == expected
+        assert backoff.state == BREAKER_CLOSED
+        assert not backoff.allow()
+        clock.now += expected
+        assert backoff.allow()
+    assert backoff.last_error == "failed"
+
+
+def test_backoff_jitter(clock):
+    """The jitter adds up to half of a delay."""
+    delays = set()
+    for _ in range(20):
+        backoff = UpdateBackoff()
+        backoff.failure()
+        delays.add(backoff.delay.total_seconds())
+
+    assert all(BACKOFF_BASE <= delay <= BACKOFF_BASE * 1.5 for delay in delays)
+    assert len(delays) > 1
+
+
+def test_backoff_throttled_minimum(clock, no_jitter):
+    """Throttling waits at least the throttled base and the retry hint."""
+    backoff = UpdateBackoff()
+
+    backoff.failure(throttled=True)
+    assert backoff.throttled
+    assert backoff.delay.total_seconds() == BACKOFF_THROTTLED
+
+    error = Exception("Too many requests")
+    error.retry_after = BACKOFF_THROTTLED * 2
+    backoff.failure(error, throttled=True)
+    assert backoff.delay.total_seconds() == BACKOFF_THROTTLED * 2
+
+    # Other vehicles of the account wait as well, without counting a failure
+    other = UpdateBackoff()
+    other.defer(backoff.retry_at)
+    assert other.throttled
+    assert other.failures == 0
+    assert not other.allow()
+
+
+def test_breaker_opens_and_closes(clock, no_jitter):
+    """The breaker opens after repeated failures and closes after a success."""
+    backoff = UpdateBackoff()
+    for _ in range(BREAKER_THRESHOLD):
+        backoff.failure()
+
+    assert backoff.state == BREAKER_OPEN
+    assert backoff.delay.total_seconds() == BREAKER_COOLDOWN
+
+    # One attempt after the cooldown, a failure opens it again
+    clock.now += BREAKER_COOLDOWN
+    assert backoff.state == BREAKER_HALF_OPEN
+    assert backoff.allow()
+    backoff.failure()
+    assert backoff.state == BREAKER_OPEN
+
+    clock.now += BREAKER_COOLDOWN
+    backoff.success()
+    assert backoff.state == BREAKER_CLOSED
+    assert backoff.failures == 0
+    assert backoff.retry_at is None
+    assert backoff.allow()
+
+
+def test_fetch_results():
+    """Fetches fail when no request succeeded or one was throttled."""
+    fetch = FetchResults()
+    assert fetch.error() is None
+
+    fetch.add({"status_code": 500})
+    fetch.add(None)
+    assert "500" in str(fetch.error())
+
+    fetch.add({"status_code": 204})
+    assert fetch.error() is None
+
+    fetch.add({"status_code": 429, "response_headers": {"Retry-After": "60"}})
+    error = fetch.error()
+    assert isinstance(error, integration.SkodaThrottledException)
+    assert error.retry_after == 60
+
+
+async def test_failed_update_keeps_data(hass, standin, setup_vehicle):
+    """Failed and skipped updates keep the last data and back off."""
+    coordinator = await setup_vehicle()
+    data = coordinator.data
+
+    standin.error_rate = 1.0
+    coordinator.data_updated = {}
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data is data
+    assert coordinator.backoff.failures == 1
+    # Failed data groups stay stale
+    assert coordinator.data_updated == {}
+
+    # Skipped while backing off, no requests are sent
+    requests = sum(standin.stats.values())
+    await coordinator.async_refresh()
+    assert sum(standin.stats.values()) == requests
+    assert coordinator.last_update_success
+    assert coordinator.backoff.failures == 1
+
+    standin.error_rate = 0.0
+    coordinator.backoff._retry_at = 0.0
+    await coordinator.async_refresh()
+    assert coordinator.backoff.failures == 0
+    assert coordinator.data_updated
+
+
+async def test_throttled_update(hass, standin, setup_vehicle):
+    """A throttled request backs off all vehicles of the account."""
+    coordinator = await setup_vehicle(0)
+    other = await setup_vehicle(1)
+
+    standin.throttle_rate = 1.0
+    coordinator.data_updated = {}
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.backoff.throttled
+    assert coordinator.backoff.delay.total_seconds() >= BACKOFF_THROTTLED - 1
+    assert other.backoff.throttled
+    assert not other.backoff.allow()
+
+
+async def test_open_breaker_marks_update_failed(hass, standin, setup_vehicle):
+    """Entities are unavailable while updates are paused, and back after a success."""
+    coordinator = await setup_vehicle()
+    data = coordinator.data
+
+    standin.error_rate = 1.0
+    for _ in range(BREAKER_THRESHOLD):
+        coordinator.data_updated = {}
+        coordinator.backoff._retry_at = 0.0
+        await coordinator.async_refresh()
+    assert coordinator.backoff.state == BREAKER_OPEN
+    assert not coordinator.last_update_success
+    assert coordinator.data is data
+    assert hass.states.get("lock.iv_000_door_locked").state == "unavailable"
+
+    standin.error_rate = 0.0
+    coordinator.backoff._retry_at = 0.0
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.backoff.state == BREAKER_CLOSED
+    assert hass.states.get("lock.iv_000_door_locked").state == "locked"
+
+
+async def test_api_status_written_on_changes(hass, standin, setup_vehicle):
+    """The API status sensor is written when the back off changes, not on every update."""
+    coordinator = await setup_vehicle()
+    sensor = next(
+        entity
+        for entity in hass.data["entity_components"]["sensor"].entities
+        if entity.unique_id == f"{coordinator.vin}-sensor-api_status"
+    )
+    reported = hass.states.get(sensor.entity_id).last_reported
+
+    for _ in range(3):
+        coordinator.data_updated = {}
+        await coordinator.async_refresh()
+    assert hass.states.get(sensor.entity_id).last_reported == reported
+
+    standin.error_rate = 1.0
+    coordinator.data_updated = {}
+    await coordinator.async_refresh()
+    state = hass.states.get(sensor.entity_id)
+    assert state.attributes["consecutive_failures"] == 1
+    assert "data_updated" not in state.attributes
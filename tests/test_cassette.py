@@ -0,0 +1,191 @@
+"""Tests of the cassette recorder, redactor and player."""
+import asyncio
+import gzip
+import json
+
+import jwt
+import pytest
+from aiohttp import ClientError, ClientSession
+from skodaconnect import Connection
+
+from custom_components.skodaconnect.cassette import (
+    REDACTED,
+    REDACTED_USERNAME,
+    CassettePlayer,
+    CassetteRecorder,
+    Redactor,
+    read_cassette,
+)
+from tools.standin import STANDIN_PASSWORD, STANDIN_SUBJECT, STANDIN_USERNAME
+
+VIN_1 = "TMBJB9NY1AB000001"
+VIN_2 = "TMBJB9NY1AB000002"
+
+
+def entry(method, url, body="", status=200, **fields):
+    """Return a recorded request."""
+    return {"t": 0, "m": method, "u": url, "d": 0.01, "s": status, "h": {}, "b": body, **fields}
+
+
+def test_redactor_vins_are_stable():
+    """Every VIN gets its own placeholder, the same one every time."""
+    redactor = Redactor()
+
+    assert redactor.text(f"/vehicles/{VIN_1}/status") == "/vehicles/TMBREDACTED000001/status"
+    assert redactor.text(f"{VIN_2},{VIN_1}") == "TMBREDACTED000002,TMBREDACTED000001"
+    # Placeholders and words of VIN length without digits are left alone
+    assert redactor.text("TMBREDACTED000002") == "TMBREDACTED000002"
+    assert redactor.text("ABCDEFGHJKLMNPRST") == "ABCDEFGHJKLMNPRST"
+
+
+def test_redactor_tokens_and_user_claims():
+    """Tokens keep their claims but lose the signature and the user identity."""
+    redactor = Redactor({"someone@example.com": REDACTED_USERNAME})
+    token = jwt.encode({"sub": "user-id-1234", "exp": 2000000000, "typ": "refresh_token"}, "secret")
+
+    body = redactor.body(json.dumps({"refreshToken": token, "email": "someone@example.com"}).encode())
+    data = json.loads(body["b"])
+    claims = jwt.decode(data["refreshToken"], options={"verify_signature": False})
+
+    assert claims == {"sub": REDACTED, "exp": 2000000000, "typ": "refresh_token"}
+    assert data["refreshToken"].endswith("." + REDACTED)
+    assert data["email"] == REDACTED
+    # The user id from the token is redacted in later traffic
+    assert redactor.url("https://host/users/user-id-1234/profile") == "https://host/users/REDACTED/profile"
+    assert redactor.text("login as someone@example.com") == f"login as {REDACTED_USERNAME}"
+
+
+def test_redactor_body():
+    """Positions and secret keys are redacted in JSON, binary bodies are kept."""
+    redactor = Redactor()
+
+    body = redactor.body(
+        json.dumps(
+            {
+                "lat": 50123456,
+                "lng": 14.5,
+                "spin": "1234",
+                "vin": VIN_1,
+                "mileage": 1200,
+                "state": "Charging",
+                "code": "E01",
+            }
+        ).encode()
+    )
+
+    # Vehicle data with the names of OAuth parameters is kept
+    assert json.loads(body["b"]) == {
+        "lat": 0,
+        "lng": 0.0,
+        "spin": REDACTED,
+        "vin": "TMBREDACTED000001",
+        "mileage": 1200,
+        "state": "Charging",
+        "code": "E01",
+    }
+    assert redactor.body(b"\x89PNG\xff") == {"b64": "iVBOR/8="}
+    assert redactor.body(b"") == {}
+
+
+def test_redactor_url():
+    """Secret query parameters and fragments of login redirects are redacted."""
+    redactor = Redactor()
+
+    url = redactor.url("skodaconnect://oidc.login/?state=abc#code=xyz&token_type=bearer")
+
+    assert url == f"skodaconnect://oidc.login/?state={REDACTED}#code={REDACTED}&token_type=bearer"
+
+
+async def test_player_matches_query_first():
+    """Requests that only differ in the query get their own responses."""
+    url = "https://host/token"
+    player = CassettePlayer(
+        [
+            entry("POST", f"{url}?systemId=TECHNICAL", '{"t": "technical"}'),
+            entry("POST", f"{url}?systemId=CONNECT", '{"t": "connect"}'),
+        ],
+        speed=0,
+    )
+
+    for _ in range(2):
+        assert await (await player.post(f"{url}?systemId=CONNECT")).json() == {"t": "connect"}
+        assert await (await player.post(f"{url}?systemId=TECHNICAL")).json() == {"t": "technical"}
+    # An unknown query falls back to the path, in recorded order
+    assert await (await player.post(f"{url}?systemId=OTHER")).json() == {"t": "technical"}
+    assert await (await player.post(url)).json() == {"t": "connect"}
+    assert player.replayed == 6
+    assert player.unmatched == []
+
+
+async def test_player_order_templates_and_unmatched():
+    """Responses come in recorded order, numbers in the path can differ."""
+    player = CassettePlayer(
+        [
+            entry("GET", "https://host/status", '{"n": 1}'),
+            entry("GET", "https://host/status", '{"n": 2}'),
+            entry("GET", "https://host/actions/100", '{"action": 100}'),
+            entry("GET", "https://host/down", e="ClientConnectorError", x="refused"),
+        ],
+        speed=0,
+    )
+
+    # The last response is repeated once the recorded ones are used up
+    assert [await (await player.get("https://host/status")).json() for _ in range(3)] == [
+        {"n": 1},
+        {"n": 2},
+        {"n": 2},
+    ]
+    async with player.get("https://host/actions/200") as response:
+        assert await response.json() == {"action": 100}
+
+    response = await player.get("https://host/unknown")
+    assert response.status == 404
+    assert player.unmatched == ["GET https://host/unknown"]
+
+    with pytest.raises(ClientError):
+        await player.get("https://host/down")
+
+
+async def test_player_latency():
+    """The recorded latency is divided by the speed."""
+    player = CassettePlayer([entry("GET", "https://host/slow", d=0.2)], speed=10)
+
+    started = asyncio.get_running_loop().time()
+    await player.get("https://host/slow")
+
+    assert 0.02 <= asyncio.get_running_loop().time() - started < 0.2
+
+
+async def test_record_and_replay(hass, standin, standin_session, tmp_path):
+    """A recorded session replays through the library without secrets in the cassette."""
+    path = tmp_path / "cassette.jsonl.gz"
+    recorder = CassetteRecorder(
+        hass, standin_session, path, secrets={STANDIN_USERNAME: REDACTED_USERNAME}
+    )
+    connection = Connection(recorder, STANDIN_USERNAME, STANDIN_PASSWORD)
+    assert await connection.doLogin() is True
+    await connection.get_vehicles()
+    for vehicle in connection.vehicles:
+        await vehicle.update()
+    await connection.terminate()
+    await recorder.async_close()
+
+    with gzip.open(path, "rt") as file:
+        recorded = file.read()
+    for secret in (STANDIN_USERNAME, STANDIN_SUBJECT, *standin.vehicles):
+        assert secret not in recorded
+    header, entries = read_cassette(path)
+    assert len(entries) == recorder.count
+
+    # The library clears the cookies of the session it is given
+    async with ClientSession() as session:
+        player = CassettePlayer(entries, speed=0, session=session)
+        replayed = Connection(player, REDACTED_USERNAME, REDACTED)
+        assert await replayed.doLogin() is True
+        await replayed.get_vehicles()
+        assert len(replayed.vehicles) == len(standin.vehicles)
+        for vehicle in replayed.vehicles:
+            assert await vehicle.update() is True
+            assert vehicle.is_distance_supported
+        await replayed.terminate()
+    assert player.unmatched == []
@@ -0,0 +1,119 @@
+"""Tests of the command queue and the refresh after commands."""
+import asyncio
+
+import pytest
+
+from custom_components.skodaconnect import CommandQueue
+
+VIN = "TMBSTNDN000000000"
+
+
+def command(calls, result=True, delay=0.0):
+    """Return a remote action that records its calls."""
+    async def func(*args):
+        calls.append(args)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return func
+
+
+async def test_queue_runs_in_order(hass):
+    """Commands run one at a time in the order they were queued."""
+    queue = CommandQueue(hass, VIN)
+    calls = []
+
+    results = await asyncio.gather(
+        queue.async_run("lock", command(calls, delay=0.01), 1),
+        queue.async_run("climater", command(calls, result=False), 2),
+        queue.async_run("charger", command(calls), 3),
+    )
+
+    assert results == [True, False, True]
+    assert calls == [(1,), (2,), (3,)]
+    assert queue.processed == 3
+    assert queue.depth == 0
+
+
+async def test_queue_collapses_duplicates(hass):
+    """Identical commands run once, replace updates a queued command."""
+    queue = CommandQueue(hass, VIN)
+    calls = []
+    slow = command(calls, delay=0.01)
+
+    results = await asyncio.gather(
+        queue.async_run("lock", slow, 1),
+        queue.async_run("lock", slow, 1),
+        queue.async_run("limit", command(calls), 50, replace=True),
+        queue.async_run("limit", command(calls), 80, replace=True),
+    )
+
+    assert results == [True] * 4
+    assert calls == [(1,), (80,)]
+    assert queue.collapsed == 2
+
+
+async def test_queue_failure_is_per_command(hass):
+    """A failing command raises for its callers, the queue carries on."""
+    queue = CommandQueue(hass, VIN)
+    calls = []
+
+    results = await asyncio.gather(
+        queue.async_run("lock", command(calls, result=RuntimeError("failed"))),
+        queue.async_run("charger", command(calls)),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] is True
+
+
+async def test_queue_idle_callback(hass):
+    """Idle callbacks run once the queue drained, failed or not."""
+    queue = CommandQueue(hass, VIN)
+    idle = []
+
+    queue.async_when_idle(lambda: idle.append("empty"))
+    assert idle == ["empty"]
+
+    run = hass.async_create_task(
+        queue.async_run("lock", command([], result=RuntimeError("failed"), delay=0.01))
+    )
+    await asyncio.sleep(0)
+    queue.async_when_idle(lambda: idle.append("drained"))
+    assert idle == ["empty"]
+    with pytest.raises(RuntimeError):
+        await run
+    assert idle == ["empty", "drained"]
+
+
+async def test_one_refresh_after_commands(hass, setup_vehicle, monkeypatch):
+    """Two queued commands give one refresh, also when the second one fails."""
+    coordinator = await setup_vehicle(refresh_settle=0.01)
+    refreshes = []
+
+    async def refresh():
+        refreshes.append(coordinator._forced_groups)
+
+    monkeypatch.setattr(coordinator, "async_refresh", refresh)
+
+    async def service(name, func):
+        """Refresh after a successful command, like the services do."""
+        result = await coordinator.commands.async_run(name, func)
+        coordinator.async_schedule_refresh({"charger"})
+        return result
+
+    calls = []
+    results = await asyncio.gather(
+        service("charger", command(calls)),
+        # Still running when the settle window of the first command ends
+        service("climater", command(calls, result=RuntimeError("failed"), delay=0.05)),
+        return_exceptions=True,
+    )
+    assert results[0] is True
+    assert isinstance(results[1], RuntimeError)
+
+    await asyncio.sleep(0.1)
+    assert refreshes == [{"charger"}]
@@ -0,0 +1,147 @@
+"""Tests of the vehicle coordinator."""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.const import CONF_RESOURCES
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.skodaconnect import async_get_devices
+from custom_components.skodaconnect.const import (
+    ADAPTIVE_ACTIVE_ATTRS,
+    ADAPTIVE_ACTIVE_INTERVAL,
+    ADAPTIVE_IDLE_INTERVAL,
+    DATA_GROUP_INTERVALS,
+    DATA_GROUPS,
+    DOMAIN,
+    SERVICE_SET_CHARGE_LIMIT,
+)
+
+
+async def test_dashboard_is_reused(hass, standin, setup_vehicle):
+    """Updates reuse the instruments until the vehicle is discovered again."""
+    coordinator = await setup_vehicle()
+    instruments = coordinator.data
+    vehicle = instruments[0].vehicle
+
+    # Support follows the fetched data, failing requests do not rebuild
+    standin.error_rate = 1.0
+    await coordinator.async_refresh()
+    standin.error_rate = 0.0
+    await coordinator.async_refresh()
+    assert coordinator.data is instruments
+
+    vehicle._discovered = None
+    await coordinator.async_refresh()
+    assert coordinator.data is not instruments
+    assert [i.attr for i in coordinator.data] == [i.attr for i in instruments]
+
+
+def parked_vehicle(**states):
+    """Return a vehicle that supports the given states and none else."""
+    vehicle = SimpleNamespace(is_door_locked_supported=True, door_locked=True)
+    for attr, value in states.items():
+        setattr(vehicle, f"is_{attr}_supported", True)
+        setattr(vehicle, attr, value)
+    return vehicle
+
+
+# Charging is reported as 1 or 0 by the library, the others as booleans
+@pytest.mark.parametrize(
+    "attr, value", [(attr, 1 if attr == "charging" else True) for attr in ADAPTIVE_ACTIVE_ATTRS]
+)
+async def test_adaptive_polling_active(hass, setup_vehicle, attr, value):
+    """Every active state switches to the fast poll interval."""
+    coordinator = await setup_vehicle(adaptive_polling=True)
+    coordinator.scan_interval = timedelta(minutes=5)
+    # The first call compares with the odometer of the stand-in vehicle
+    for _ in range(2):
+        coordinator._adapt_poll_interval(parked_vehicle())
+    assert coordinator.poll_interval == timedelta(seconds=ADAPTIVE_IDLE_INTERVAL)
+
+    coordinator._adapt_poll_interval(parked_vehicle(**{attr: value}))
+    assert coordinator.poll_interval == timedelta(seconds=ADAPTIVE_ACTIVE_INTERVAL)
+
+    coordinator._adapt_poll_interval(parked_vehicle(**{attr: 0 if attr == "charging" else False}))
+    assert coordinator.poll_interval == timedelta(seconds=ADAPTIVE_IDLE_INTERVAL)
+
+
+async def test_adaptive_polling_moved(hass, setup_vehicle):
+    """A changed odometer counts as active, an unlocked car keeps the scan interval."""
+    coordinator = await setup_vehicle(adaptive_polling=True)
+    coordinator.scan_interval = timedelta(minutes=5)
+
+    coordinator._adapt_poll_interval(parked_vehicle(distance=1000))
+    coordinator._adapt_poll_interval(parked_vehicle(distance=1000))
+    assert coordinator.poll_interval == timedelta(seconds=ADAPTIVE_IDLE_INTERVAL)
+
+    coordinator._adapt_poll_interval(parked_vehicle(distance=1001))
+    assert coordinator.poll_interval == timedelta(seconds=ADAPTIVE_ACTIVE_INTERVAL)
+
+    vehicle = parked_vehicle(distance=1001)
+    vehicle.door_locked = False
+    coordinator._adapt_poll_interval(vehicle)
+    assert coordinator.poll_interval == timedelta(minutes=5)
+
+
+def record_fetches(coordinator, monkeypatch):
+    """Return a list that gets the data groups the vehicle fetches."""
+    vehicle = coordinator.data[0].vehicle
+    fetched = []
+    for group, getter in DATA_GROUPS.items():
+        if hasattr(vehicle, getter):
+
+            async def fetch(group=group, getter=getattr(vehicle, getter)):
+                fetched.append(group)
+                return await getter()
+
+            monkeypatch.setattr(vehicle, getter, fetch)
+    return fetched
+
+
+async def test_fetch_enabled_groups(hass, setup_vehicle, monkeypatch):
+    """Only the data groups the enabled resources read are fetched."""
+    coordinator = await setup_vehicle(0, **{CONF_RESOURCES: ["door_locked", "battery_level"]})
+    fetched = record_fetches(coordinator, monkeypatch)
+
+    coordinator.data_updated = {}
+    await coordinator.async_refresh()
+
+    assert sorted(fetched) == ["charging", "status"]
+
+
+async def test_slow_groups_wait_until_due(hass, setup_vehicle, monkeypatch):
+    """Departure timers and trips are fetched less often than the poll interval."""
+    coordinator = await setup_vehicle(0)
+    fetched = record_fetches(coordinator, monkeypatch)
+    coordinator.poll_interval = timedelta(minutes=5)
+    now = dt_util.utcnow()
+
+    coordinator.data_updated = dict.fromkeys(DATA_GROUPS, now - coordinator.poll_interval)
+    await coordinator.async_refresh()
+    assert fetched
+    assert not set(fetched) & DATA_GROUP_INTERVALS.keys()
+
+    fetched.clear()
+    coordinator.data_updated["timers"] = now - timedelta(seconds=DATA_GROUP_INTERVALS["timers"])
+    await coordinator.async_refresh()
+    assert "timers" in fetched
+    assert "trips" not in fetched
+
+
+async def test_refresh_after_charge_limit(hass, setup_vehicle, monkeypatch):
+    """The refresh after setting the charge limit fetches the groups it affects."""
+    coordinator = await setup_vehicle(0)
+    fetched = record_fetches(coordinator, monkeypatch)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_CHARGE_LIMIT,
+        {"device_id": list(async_get_devices(hass)), "limit": 40},
+        blocking=True,
+    )
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=coordinator.refresh_settle + 1))
+    await hass.async_block_till_done()
+
+    assert sorted(fetched) == ["charging", "timers"]
@@ -0,0 +1,186 @@
+"""Tests of the expected state of entities while commands are pending."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockEntityPlatform,
+    async_fire_time_changed,
+)
+
+from custom_components.skodaconnect import climate
+from custom_components.skodaconnect.const import DATA, DOMAIN, OPTIMISTIC_TIMEOUT
+
+WINDOW_HEATER = "switch.iv_000_window_heater"
+
+
+def entity(hass, entity_id):
+    """Return the entity object of an entity ID."""
+    return hass.data["entity_components"]["switch"].get_entity(entity_id)
+
+
+async def turn(hass, service):
+    """Turn the window heater on or off."""
+    await hass.services.async_call("switch", service, {"entity_id": WINDOW_HEATER}, blocking=True)
+
+
+@pytest.fixture
+def accepted(hass, monkeypatch):
+    """Make turning on the window heater a command the vehicle applies later."""
+
+    async def turn_on():
+        """Accept the command without changing the known vehicle state."""
+
+    def accept():
+        monkeypatch.setattr(entity(hass, WINDOW_HEATER).instrument, "turn_on", turn_on)
+
+    return accept
+
+
+async def test_expected_state_until_confirmed(hass, standin, setup_vehicle, accepted):
+    """The expected state shows between the command and the poll that confirms it."""
+    coordinator = await setup_vehicle(0)
+    switch = entity(hass, WINDOW_HEATER)
+    accepted()
+
+    await turn(hass, "turn_on")
+    assert hass.states.get(WINDOW_HEATER).state == "on"
+    assert switch.actual_state is False
+    # Coordinator updates before the command took effect keep it
+    coordinator.async_update_listeners()
+    assert hass.states.get(WINDOW_HEATER).state == "on"
+
+    # The vehicle applied the command by the refresh after the settle window
+    standin.vehicles[switch.vin].window_heater = True
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=coordinator.refresh_settle + 1))
+    await hass.async_block_till_done()
+    assert switch.actual_state is True
+    assert switch._optimistic is None
+    assert switch._optimistic_unsub is None
+    assert hass.states.get(WINDOW_HEATER).state == "on"
+
+
+async def test_expected_state_times_out(hass, setup_vehicle, accepted):
+    """An expected state that no update confirms is rolled back."""
+    await setup_vehicle(0)
+    accepted()
+
+    await turn(hass, "turn_on")
+    assert hass.states.get(WINDOW_HEATER).state == "on"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=OPTIMISTIC_TIMEOUT + 1))
+    await hass.async_block_till_done()
+    assert hass.states.get(WINDOW_HEATER).state == "off"
+
+
+async def test_expected_state_rolled_back_on_failure(hass, setup_vehicle, monkeypatch):
+    """Commands that fail or return False roll back the expected state."""
+    await setup_vehicle(0)
+    switch = entity(hass, WINDOW_HEATER)
+
+    async def rejected():
+        return False
+
+    monkeypatch.setattr(switch.instrument, "turn_on", rejected)
+    await turn(hass, "turn_on")
+    assert hass.states.get(WINDOW_HEATER).state == "off"
+    assert switch._optimistic_unsub is None
+
+    async def failed():
+        raise RuntimeError("failed")
+
+    monkeypatch.setattr(switch.instrument, "turn_on", failed)
+    with pytest.raises(RuntimeError):
+        await turn(hass, "turn_on")
+    assert hass.states.get(WINDOW_HEATER).state == "off"
+    assert switch._optimistic_unsub is None
+
+
+class ClimateInstrument:
+    """Climate instrument, the library does not set up one itself."""
+
+    component = "climate"
+    attr = "electric_climatisation"
+    name = "Climatisation"
+    icon = "mdi:radiator"
+    attributes = {}
+    hvac_mode = False
+    target_temperature = 21
+    assumed_state = True
+    callback = None
+
+    def __init__(self, vehicle):
+        self.vehicle = vehicle
+        self.sent = []
+        self.sending = asyncio.Event()
+        self.sending.set()
+
+    async def set_temperature(self, temperature):
+        self.sent.append(temperature)
+        await self.sending.wait()
+
+
+@pytest.fixture
+async def thermostat(hass, setup_vehicle, monkeypatch):
+    """Return a climate entity of a stand-in vehicle with a short debounce."""
+    monkeypatch.setattr(climate, "CLIMATE_TEMPERATURE_DEBOUNCE", 0.2)
+    coordinator = await setup_vehicle(0)
+    instrument = ClimateInstrument(coordinator.data[0].vehicle)
+    coordinator.data.append(instrument)
+    entity = climate.SkodaClimate(
+        hass.data[DOMAIN][coordinator.entry.entry_id][DATA],
+        coordinator.vin,
+        instrument.component,
+        instrument.attr,
+    )
+    await MockEntityPlatform(hass, domain="climate", platform_name=DOMAIN).async_add_entities([entity])
+    yield entity
+    await entity.async_remove()
+
+
+async def set_temperature(hass, entity, temperature):
+    """Change the target temperature like the climate service does."""
+    await entity.async_set_temperature(temperature=temperature)
+    assert hass.states.get(entity.entity_id).attributes["temperature"] == temperature
+
+
+async def test_temperature_sent_after_changes_stop(hass, thermostat):
+    """Only the last target is sent, once it has not changed for the debounce time."""
+    await set_temperature(hass, thermostat, 22)
+    await asyncio.sleep(0.12)
+    await set_temperature(hass, thermostat, 23)
+    await asyncio.sleep(0.12)
+    assert thermostat.instrument.sent == []
+
+    await asyncio.sleep(0.2)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert thermostat.instrument.sent == [23]
+    assert thermostat._pending_temperature is None
+
+
+async def test_temperature_changed_while_sending(hass, thermostat):
+    """A target changed while an older one is being sent is sent after it."""
+    thermostat.instrument.sending.clear()
+    await set_temperature(hass, thermostat, 22)
+    await asyncio.sleep(0.3)
+    assert thermostat.instrument.sent == [22]
+
+    await set_temperature(hass, thermostat, 23)
+    await asyncio.sleep(0.3)
+    thermostat.instrument.sending.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert thermostat.instrument.sent == [22, 23]
+    assert thermostat._pending_temperature is None
+
+
+async def test_momentary_switch_has_no_expected_state(hass, setup_vehicle):
+    """Switches that trigger an action stay off after pressing them."""
+    await setup_vehicle(0)
+    flash = "switch.iv_000_start_flashing"
+
+    await hass.services.async_call("switch", "turn_on", {"entity_id": flash}, blocking=True)
+
+    assert hass.states.get(flash).state == "off"
+    assert entity(hass, flash)._optimistic_unsub is None
@@ -0,0 +1,93 @@
+"""Tests of the account hub shared by the config entries of a username."""
+import asyncio
+
+from custom_components.skodaconnect import SkodaHub
+from custom_components.skodaconnect.const import CONF_SAVESESSION, DOMAIN, HUBS
+from tools.standin import STANDIN_PASSWORD, STANDIN_USERNAME
+
+
+def count_logins(hub, monkeypatch):
+    """Return a list that gets an entry for every login of the hub connection."""
+    logins = []
+    login = hub.connection.doLogin
+
+    async def counted():
+        logins.append(hub.username)
+        return await login()
+
+    monkeypatch.setattr(hub.connection, "doLogin", counted)
+    return logins
+
+
+def revocations(standin):
+    """Return the number of token revocations the stand-in received."""
+    return sum(count for pattern, count in standin.stats.items() if pattern.endswith("/revoke"))
+
+
+async def test_entries_share_login(hass, standin, setup_vehicle, monkeypatch):
+    """Vehicles of one account log in once, the session ends with the last entry."""
+    first = await setup_vehicle(0)
+    hub = first.hub
+    logins = count_logins(hub, monkeypatch)
+    second = await setup_vehicle(1)
+
+    assert second.hub is hub
+    assert hub.coordinators == {first, second}
+    assert logins == []
+
+    await hass.config_entries.async_unload(first.entry.entry_id)
+    assert hub.logged_in
+    assert hass.data[DOMAIN][HUBS][STANDIN_USERNAME] is hub
+    assert revocations(standin) == 0
+    # The remaining vehicle still updates with the session
+    second.data_updated = {}
+    await second.async_refresh()
+    assert second.last_update_success
+    assert logins == []
+
+    await hass.config_entries.async_unload(second.entry.entry_id)
+    assert not hub.logged_in
+    assert HUBS not in hass.data.get(DOMAIN, {})
+    assert revocations(standin) > 0
+
+
+async def test_keep_session_is_sticky(hass, standin, setup_vehicle):
+    """One entry that keeps its session keeps it for the whole account."""
+    first = await setup_vehicle(0, **{CONF_SAVESESSION: True})
+    second = await setup_vehicle(1)
+    hub = first.hub
+
+    await hass.config_entries.async_unload(first.entry.entry_id)
+    assert hub.keep_session
+    await hass.config_entries.async_unload(second.entry.entry_id)
+
+    assert not hub.logged_in
+    assert revocations(standin) == 0
+
+
+async def test_concurrent_logins(hass, setup_vehicle, monkeypatch):
+    """Logins of the same hub wait for the one in progress."""
+    coordinator = await setup_vehicle(0)
+    hub = SkodaHub(hass, STANDIN_USERNAME, STANDIN_PASSWORD)
+    hub.connection._session = coordinator.connection._session
+    logins = count_logins(hub, monkeypatch)
+
+    assert await asyncio.gather(hub.async_login(), hub.async_login()) == [True, True]
+    assert logins == [STANDIN_USERNAME]
+
+
+async def test_password_kept_while_logged_in(hass, setup_vehicle):
+    """New credentials only replace the connection once the session ended."""
+    coordinator = await setup_vehicle(0)
+    hub = coordinator.hub
+    connection = hub.connection
+
+    hub.set_password("changed")
+    assert hub.password == STANDIN_PASSWORD
+    assert hub.connection is connection
+
+    hub.logged_in = False
+    hub.set_password("changed")
+    assert hub.password == "changed"
+    assert hub.connection is not connection
+    hub.logged_in = True
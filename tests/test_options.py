@@ -0,0 +1,88 @@
+"""Tests of option changes on a running config entry."""
+from homeassistant.const import CONF_RESOURCES, CONF_SCAN_INTERVAL
+
+from custom_components.skodaconnect.const import CONF_MUTABLE, CONF_SPIN, DATA, DOMAIN
+
+WINDOW_HEATER = "switch.iv_000_window_heater"
+DOOR_LOCK = "lock.iv_000_door_locked"
+
+
+def entry_data(hass, entry):
+    """Return the integration data of a loaded config entry."""
+    return hass.data[DOMAIN][entry.entry_id][DATA]
+
+
+async def update_options(hass, entry, **options):
+    """Change the options of a config entry and wait until they are applied."""
+    hass.config_entries.async_update_entry(entry, options={**entry.options, **options})
+    # Reloaded entries set up from the last known state and connect in the background
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_options_applied_without_reload(hass, setup_vehicle):
+    """Options that only change updates are applied to the running entry."""
+    coordinator = await setup_vehicle(0)
+    entry = coordinator.entry
+
+    await update_options(hass, entry, **{CONF_SCAN_INTERVAL: 600})
+
+    assert entry_data(hass, entry).coordinator is coordinator
+    assert coordinator.scan_interval.total_seconds() == 600
+
+
+async def test_spin_change_reloads(hass, setup_vehicle):
+    """Instruments get a changed S-PIN when they are set up again."""
+    coordinator = await setup_vehicle(0)
+    entry = coordinator.entry
+
+    await update_options(hass, entry, **{CONF_SPIN: "1234"})
+
+    assert entry_data(hass, entry).coordinator is not coordinator
+
+
+async def test_read_only_removes_commands(hass, setup_vehicle):
+    """Making the vehicle read-only reloads it without locks and switches."""
+    coordinator = await setup_vehicle(0)
+    entry = coordinator.entry
+    assert hass.states.get(DOOR_LOCK).state == "locked"
+
+    await update_options(hass, entry, **{CONF_MUTABLE: False})
+
+    data = entry_data(hass, entry)
+    assert data.coordinator is not coordinator
+    assert not [key for key in data.entities if key[0] in ("lock", "switch")]
+    assert hass.states.get(DOOR_LOCK).state == "unavailable"
+
+
+async def test_missing_instrument_removes_entity(hass, setup_vehicle):
+    """Entities whose instrument is not in the rebuilt dashboard are removed."""
+    coordinator = await setup_vehicle(0)
+    data = entry_data(hass, coordinator.entry)
+
+    coordinator.async_set_updated_data(
+        [instrument for instrument in coordinator.data if instrument.attr != "window_heater"]
+    )
+    await hass.async_block_till_done()
+
+    assert ("switch", "window_heater") not in data.entities
+    assert hass.states.get(WINDOW_HEATER).state == "unavailable"
+
+
+async def test_resource_on_new_platform_reloads(hass, setup_vehicle):
+    """Enabling a resource of a platform that was not set up reloads the entry."""
+    coordinator = await setup_vehicle(0)
+    entry = coordinator.entry
+    locks = {instrument.attr for instrument in coordinator.data if instrument.component == "lock"}
+    resources = [attr for attr in entry.options[CONF_RESOURCES] if attr not in locks]
+
+    await update_options(hass, entry, **{CONF_RESOURCES: resources})
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert "lock" not in entry_data(hass, entry).coordinator.platforms
+
+    await update_options(hass, entry, **{CONF_RESOURCES: resources + ["door_locked"]})
+
+    data = entry_data(hass, entry)
+    assert "lock" in data.coordinator.platforms
+    assert ("lock", "door_locked") in data.entities
+    assert hass.states.get(DOOR_LOCK).state == "locked"
@@ -0,0 +1,151 @@
+"""Tests of the departure schedule services."""
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from skodaconnect.exceptions import SkodaInvalidRequestException
+
+import custom_components.skodaconnect as integration
+from custom_components.skodaconnect import (
+    async_get_devices,
+    departure_schedule,
+    set_timer_charge_limit,
+    timer_schedule,
+)
+from custom_components.skodaconnect.const import (
+    DOMAIN,
+    SERVICE_SET_CHARGE_LIMIT,
+    SERVICE_SET_SCHEDULES,
+    TIMER_LIBRARY_VERSION,
+)
+
+TIMER = {"id": 2, "time": "07:30", "enabled": True, "recurring": True, "days": "yyyyynn"}
+
+
+def kelvin(celsius):
+    """Return a temperature as the departure timer API sends it."""
+    return int((celsius + 273) * 10)
+
+
+def test_departure_schedule():
+    """Timer fields are always set, shared settings only when given."""
+    schedule = departure_schedule({**TIMER, "charging": True, "charge_target": 80})
+
+    assert schedule == {
+        "id": 2,
+        "enabled": True,
+        "recurring": True,
+        "date": None,
+        "time": "07:30",
+        "days": "yyyyynn",
+        "operationCharging": True,
+        "targetChargeLevel": 80,
+    }
+
+    settings = {
+        "temp": 21.5,
+        "heater_source": False,
+        "off_peak_active": True,
+        "off_peak_start": "22:00",
+        "off_peak_end": "06:00",
+    }
+    schedule = departure_schedule(TIMER, settings)
+    assert schedule["targetTemp"] == 21.5
+    assert schedule["heaterSource"] == "electric"
+    assert schedule["nightRateActive"] is True
+    assert (schedule["nightRateTimeStart"], schedule["nightRateTimeEnd"]) == ("22:00", "06:00")
+
+    with pytest.raises(SkodaInvalidRequestException):
+        departure_schedule(TIMER, {"heater_source": True})
+
+
+def test_timer_schedule_keeps_temperature():
+    """Schedules without a temperature keep the one of the timers."""
+    car = SimpleNamespace(
+        attrs={"departuretimer": {"timersAndProfiles": {"timerBasicSetting": {"targetTemperature": 2955}}}}
+    )
+
+    assert timer_schedule(car, TIMER)["targetTemp"] == 22.5
+    assert timer_schedule(car, {**TIMER, "targetTemp": 19})["targetTemp"] == 19
+    assert timer_schedule(SimpleNamespace(attrs={}), TIMER) is TIMER
+
+
+def timer_requests(standin):
+    """Return the departure timer requests the stand-in received."""
+    return [command.action for command in standin.commands.values() if command.service == "departuretimer"]
+
+
+async def test_set_schedules_payload(hass, standin, setup_vehicle):
+    """Every timer request and the charge limit carry the shared temperature."""
+    coordinator = await setup_vehicle(0)
+    device_id = next(iter(async_get_devices(hass)))
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_SCHEDULES,
+        {
+            "device_id": [device_id],
+            "timers": [TIMER, {**TIMER, "id": 3, "time": "16:00"}],
+            "temp": 25,
+            "charge_limit": 30,
+        },
+        blocking=True,
+    )
+
+    requests = timer_requests(standin)
+    assert len(requests) == 3
+    assert [request["targetTemperature"] for request in requests] == [kelvin(25)] * 3
+    assert requests[-1]["chargeMinLimit"] == 30
+    assert coordinator.commands.processed == 3
+
+
+async def test_set_schedules_keeps_timer_temperature(hass, standin, setup_vehicle):
+    """Without a temperature the timers and the limit keep the timer temperature."""
+    coordinator = await setup_vehicle(0)
+    device_id = next(iter(async_get_devices(hass)))
+    vehicle = coordinator.data[0].vehicle
+    settings = vehicle.attrs["departuretimer"]["timersAndProfiles"]["timerBasicSetting"]
+    settings["targetTemperature"] = kelvin(vehicle.climatisation_target_temperature + 3)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_SCHEDULES,
+        {"device_id": [device_id], "timers": [TIMER], "charge_limit": 40},
+        blocking=True,
+    )
+
+    requests = timer_requests(standin)
+    assert [request["targetTemperature"] for request in requests] == [settings["targetTemperature"]] * 2
+    assert requests[-1]["chargeMinLimit"] == 40
+
+
+def test_timer_charge_limit_library_version():
+    """The timer request of the library is only used for the required version."""
+    manifest = json.loads(
+        (Path(integration.__file__).parent / "manifest.json").read_text()
+    )
+
+    assert f"skodaconnect=={TIMER_LIBRARY_VERSION}" in manifest["requirements"]
+    assert integration.lib_version == TIMER_LIBRARY_VERSION
+
+
+async def test_charge_limit_uses_library(hass, setup_vehicle, monkeypatch):
+    """The charge limit service and other library versions use the public call."""
+    coordinator = await setup_vehicle(0)
+    device_id = next(iter(async_get_devices(hass)))
+    vehicle = coordinator.data[0].vehicle
+    limits = []
+
+    async def set_charge_limit(limit):
+        limits.append(limit)
+        return True
+
+    monkeypatch.setattr(vehicle, "set_charge_limit", set_charge_limit)
+    await hass.services.async_call(
+        DOMAIN, SERVICE_SET_CHARGE_LIMIT, {"device_id": [device_id], "limit": 40}, blocking=True
+    )
+    monkeypatch.setattr(integration, "lib_version", "1.4.0")
+    assert await set_timer_charge_limit(vehicle, 30, 22) is True
+
+    assert limits == [40, 30]
@@ -0,0 +1,83 @@
+"""Tests of the setup from the last known state of a vehicle."""
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.skodaconnect import SkodaCoordinator, SnapshotInstrument
+from custom_components.skodaconnect.const import DATA, DOMAIN
+
+LOCK = "lock.iv_000_door_locked"
+
+
+def lock_entity(hass):
+    """Return the door lock entity."""
+    return hass.data["entity_components"]["lock"].get_entity(LOCK)
+
+
+@pytest.fixture
+async def restored(hass, setup_vehicle, monkeypatch):
+    """Return a vehicle set up again from its snapshot, not connected yet."""
+    coordinator = await setup_vehicle(0)
+    entry = coordinator.entry
+    await hass.config_entries.async_unload(entry.entry_id)
+
+    async def connect(self):
+        """Stay on the last known state until the test connects."""
+
+    monkeypatch.setattr(SkodaCoordinator, "async_connect", connect)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    monkeypatch.undo()
+    return entry
+
+
+async def test_snapshot_values(hass, hass_storage, setup_vehicle):
+    """The snapshot is written on unload and only holds plain values."""
+    coordinator = await setup_vehicle(0)
+    await hass.config_entries.async_unload(coordinator.entry.entry_id)
+
+    snapshot = hass_storage[f"{DOMAIN}.{coordinator.entry.entry_id}"]["data"]
+    switches = [data for data in snapshot["instruments"] if data["component"] == "switch"]
+    assert switches
+    assert all("is_on" not in data for data in switches)
+    assert "bound method" not in str(snapshot)
+
+
+async def test_snapshot_saved_when_changed(hass, standin, setup_vehicle, monkeypatch):
+    """Polls that do not change the vehicle do not write the snapshot."""
+    coordinator = await setup_vehicle(0)
+    saves = []
+    monkeypatch.setattr(coordinator._store, "async_delay_save", lambda data, delay: saves.append(data()))
+
+    for _ in range(2):
+        coordinator.data_updated = {}
+        await coordinator.async_refresh()
+    assert saves == []
+
+    standin.vehicles[coordinator.vin].window_heater = True
+    coordinator.data_updated = {}
+    await coordinator.async_refresh()
+    assert len(saves) == 1
+
+
+async def test_entities_from_snapshot(hass, restored):
+    """Entities are set up from the snapshot and reject commands until connected."""
+    assert hass.states.get(LOCK).state == "locked"
+    assert isinstance(lock_entity(hass).instrument, SnapshotInstrument)
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call("lock", "unlock", {"entity_id": LOCK}, blocking=True)
+    assert hass.states.get(LOCK).state == "locked"
+
+
+async def test_snapshot_handover(hass, restored):
+    """Connecting hands the entities over to the live instruments."""
+    coordinator = hass.data[DOMAIN][restored.entry_id][DATA].coordinator
+    await coordinator.async_connect()
+    await hass.async_block_till_done()
+
+    assert not isinstance(lock_entity(hass).instrument, SnapshotInstrument)
+    assert hass.states.get(LOCK).state == "locked"
+
+    heater = "switch.iv_000_window_heater"
+    await hass.services.async_call("switch", "turn_on", {"entity_id": heater}, blocking=True)
+    assert hass.states.get(heater).state == "on"
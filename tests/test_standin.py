@@ -0,0 +1,50 @@
+"""Smoke tests of the library against the Skoda Connect stand-in."""
+import pytest
+from skodaconnect import Connection
+from skodaconnect.exceptions import SkodaAuthenticationException
+
+from tools.standin import STANDIN_PASSWORD, STANDIN_USERNAME
+
+
+async def test_login_vehicles_and_update(standin, standin_session):
+    """The library logs in, lists the vehicles and fetches all their data."""
+    connection = Connection(standin_session, STANDIN_USERNAME, STANDIN_PASSWORD)
+
+    assert await connection.doLogin() is True
+    await connection.get_vehicles()
+    assert sorted(vehicle.vin for vehicle in connection.vehicles) == sorted(standin.vehicles)
+
+    vehicle = connection.vehicles[0]
+    assert await vehicle.update() is True
+    assert vehicle.is_distance_supported
+    assert vehicle.distance == standin.vehicles[vehicle.vin].odometer
+    assert vehicle.is_position_supported
+    assert vehicle.is_trip_last_length_supported
+    assert vehicle.is_door_locked_supported
+    assert standin.unrouted == {}
+
+    # Restored tokens pass the library's signature verification
+    tokens = await connection.save_tokens()
+    restored = Connection(standin_session, STANDIN_USERNAME, STANDIN_PASSWORD)
+    assert await restored.restore_tokens(tokens) is True
+
+
+async def test_login_wrong_password(standin, standin_session):
+    """A wrong password fails the login like the sign-in service does."""
+    connection = Connection(standin_session, STANDIN_USERNAME, "wrong")
+
+    with pytest.raises(SkodaAuthenticationException):
+        await connection.doLogin()
+
+
+async def test_command_with_spin(standin, standin_session):
+    """Lock commands need the S-PIN and change the vehicle state."""
+    connection = Connection(standin_session, STANDIN_USERNAME, STANDIN_PASSWORD)
+    await connection.doLogin()
+    await connection.get_vehicles()
+    vehicle = connection.vehicles[0]
+    await vehicle.update()
+    standin.vehicles[vehicle.vin].locked = False
+
+    assert await vehicle.set_lock("lock", "1234") == "Success"
+    assert standin.vehicles[vehicle.vin].locked is True
@@ -0,0 +1,122 @@
+"""Tests of the vehicles targeted by service calls and their responses."""
+import pytest
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_LABEL_ID
+from homeassistant.core import ServiceCall
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import area_registry, device_registry, label_registry
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.skodaconnect import async_get_devices, async_resolve_targets
+from custom_components.skodaconnect.const import (
+    ATTR_WAIT,
+    DOMAIN,
+    EVENT_COMMAND_COMPLETED,
+    EVENT_COMMAND_FAILED,
+    EVENT_COMMAND_PROGRESS,
+    SERVICE_SET_CHARGE_LIMIT,
+)
+
+
+@pytest.fixture
+async def vehicles(hass, setup_vehicle):
+    """Return the device IDs of an electric and a combustion vehicle by VIN."""
+    coordinators = [await setup_vehicle(0), await setup_vehicle(1)]
+    devices = {coordinator.vin: device_id for device_id, coordinator in async_get_devices(hass).items()}
+    return {coordinator.vin: devices[coordinator.vin] for coordinator in coordinators}
+
+
+@pytest.fixture
+def other_device(hass):
+    """Return the ID of a device of another integration."""
+    entry = MockConfigEntry(domain="test")
+    entry.add_to_hass(hass)
+    return device_registry.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={("test", "other")}
+    ).id
+
+
+def resolve(hass, **data):
+    """Return the VINs of the vehicles a service call targets."""
+    call = ServiceCall(DOMAIN, SERVICE_SET_CHARGE_LIMIT, data)
+    return sorted(coordinator.vin for coordinator in async_resolve_targets(hass, call))
+
+
+async def charge_limit(hass, device_ids, **data):
+    """Call the charge limit service and return its response."""
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_CHARGE_LIMIT,
+        {ATTR_DEVICE_ID: device_ids, "limit": 40, **data},
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def test_resolve_area_and_label(hass, vehicles, other_device):
+    """Areas and labels target their vehicles, other devices are skipped."""
+    devices = device_registry.async_get(hass)
+    area = area_registry.async_get(hass).async_create("Garage")
+    label = label_registry.async_get(hass).async_create("Electric")
+    electric, combustion = vehicles
+    for device_id in (vehicles[electric], vehicles[combustion], other_device):
+        devices.async_update_device(device_id, area_id=area.id)
+    for device_id in (vehicles[electric], other_device):
+        devices.async_update_device(device_id, labels={label.label_id})
+
+    assert resolve(hass, **{ATTR_AREA_ID: [area.id]}) == sorted(vehicles)
+    assert resolve(hass, **{ATTR_LABEL_ID: [label.label_id]}) == [electric]
+    # Each vehicle once, also when several targets contain it
+    assert resolve(
+        hass, **{ATTR_AREA_ID: [area.id], ATTR_DEVICE_ID: [vehicles[electric]]}
+    ) == sorted(vehicles)
+
+    with pytest.raises(ServiceValidationError):
+        resolve(hass, **{ATTR_DEVICE_ID: [other_device]})
+    empty = area_registry.async_get(hass).async_create("Shed")
+    with pytest.raises(ServiceValidationError):
+        resolve(hass, **{ATTR_AREA_ID: [empty.id]})
+
+
+async def test_response_per_vehicle(hass, vehicles):
+    """Every vehicle gets its own result, one failure does not fail the call."""
+    electric, combustion = vehicles
+
+    response = await charge_limit(hass, list(vehicles.values()))
+
+    results = response["vehicles"]
+    assert results[electric] == {"success": True, "error": None}
+    assert results[combustion]["success"] is False
+    assert results[combustion]["error"]
+
+
+async def test_all_vehicles_failed(hass, vehicles):
+    """The call fails when it failed for every targeted vehicle."""
+    combustion = list(vehicles)[1]
+
+    with pytest.raises(HomeAssistantError, match=combustion):
+        await charge_limit(hass, [vehicles[combustion]])
+
+
+async def test_background_request_events(hass, vehicles):
+    """Without waiting the call returns request IDs, events report the progress."""
+    events = []
+    for event_type in (EVENT_COMMAND_PROGRESS, EVENT_COMMAND_COMPLETED, EVENT_COMMAND_FAILED):
+        hass.bus.async_listen(event_type, events.append)
+    electric, combustion = vehicles
+
+    response = await charge_limit(hass, list(vehicles.values()), **{ATTR_WAIT: False})
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    requests = {vin: result["request_id"] for vin, result in response["vehicles"].items()}
+    assert sorted(requests) == sorted(vehicles)
+    for vin, final in ((electric, EVENT_COMMAND_COMPLETED), (combustion, EVENT_COMMAND_FAILED)):
+        request_events = [event for event in events if event.data["request_id"] == requests[vin]]
+        assert [event.event_type for event in request_events] == [
+            EVENT_COMMAND_PROGRESS,
+            EVENT_COMMAND_PROGRESS,
+            final,
+        ]
+        assert [event.data["status"] for event in request_events][:2] == ["queued", "running"]
+        assert all(event.data["vin"] == vin for event in request_events)
+    failed = next(event for event in events if event.event_type == EVENT_COMMAND_FAILED)
+    assert failed.data["error"]
@@ -0,0 +1 @@
+"""Development tools for the Skoda Connect integration."""
@@ -0,0 +1,185 @@
+"""
+Benchmark of the coordinator to entity update path
+
+Sets up one config entry per vehicle against the Skoda Connect stand-in and
+measures refresh ticks of all vehicles, from SkodaCoordinator._async_update_data
+through the state writes of all entity platforms:
+
+    python -m tools.benchmark --cars 1 10 100 500 --ticks 20
+    python -m tools.benchmark --save-baseline
+    python -m tools.benchmark --baseline tools/benchmark_baseline.json
+
+Reported per tick: wall time, event loop blocking, allocated memory and state
+writes, and the median setup time of a config entry. Results are compared with a stored baseline, a metric that is worse than
+the baseline by more than the tolerance fails the run.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from .harness import (
+    LoopLagMonitor,
+    StateWriteCounter,
+    async_add_entry,
+    async_refresh_all,
+    coordinator,
+    async_start_hass,
+    async_stop_hass,
+    percentile,
+    use_standin,
+)
+from .standin import SkodaStandin
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CARS = [1, 10, 100, 500]
+DEFAULT_TICKS = 20
+DEFAULT_TOLERANCE = 0.2
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+
+# Metrics compared with the baseline, lower is better for all of them
+METRICS = [
+    "tick_median_ms",
+    "tick_p95_ms",
+    "loop_blocked_ms",
+    "loop_lag_max_ms",
+    "alloc_peak_kib",
+    "writes_per_tick",
+]
+
+
+async def async_benchmark(cars, ticks, change_rate, seed):
+    """Run the benchmark for a number of cars and return its metrics."""
+    standin = SkodaStandin(vehicles=cars, seed=seed)
+    url = await standin.async_start(port=0)
+    use_standin(url)
+    hass = await async_start_hass()
+    try:
+        setup_started = time.perf_counter()
+        entries = [await async_add_entry(hass, vin) for vin in standin.vehicles]
+        setup_time = time.perf_counter() - setup_started
+        # Time of async_setup_entry without the config flow and login
+        entry_setups = [coordinator(hass, entry).setup_time for entry in entries]
+        entities = len(hass.states.async_all())
+
+        # The first refresh after setup is a full update, leave it out
+        await async_refresh_all(hass, entries)
+
+        writes = StateWriteCounter(hass)
+        lag = LoopLagMonitor()
+        lag.start()
+        tracemalloc.start()
+        walls, blocked, lag_max, peaks, write_counts = [], [], [], [], []
+        for _ in range(ticks):
+            # Change part of the fleet between ticks like real vehicles do
+            for vehicle in standin.vehicles.values():
+                if standin.rng.random() < change_rate:
+                    vehicle.odometer += 1
+                    vehicle.soc = max(0, vehicle.soc - 1)
+                    vehicle.locked = not vehicle.locked
+            lag.reset()
+            writes.reset()
+            tracemalloc.reset_peak()
+            baseline_memory = tracemalloc.get_traced_memory()[0]
+
+            started = time.perf_counter()
+            await async_refresh_all(hass, entries)
+            walls.append(time.perf_counter() - started)
+
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline_memory)
+            samples = lag.reset()
+            blocked.append(sum(samples))
+            lag_max.append(max(samples, default=0.0))
+            write_counts.append(writes.reset())
+        tracemalloc.stop()
+        await lag.stop()
+        writes.close()
+
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+    finally:
+        await async_stop_hass(hass)
+        await standin.async_stop()
+
+    return {
+        "cars": cars,
+        "entities": entities,
+        "setup_s": round(setup_time, 3),
+        "entry_setup_ms": round(statistics.median(entry_setups) * 1000, 1),
+        "requests": sum(standin.stats.values()),
+        "tick_median_ms": round(statistics.median(walls) * 1000, 2),
+        "tick_p95_ms": round(percentile(walls, 95) * 1000, 2),
+        "loop_blocked_ms": round(statistics.median(blocked) * 1000, 2),
+        "loop_lag_max_ms": round(max(lag_max) * 1000, 2),
+        "alloc_peak_kib": round(statistics.median(peaks) / 1024, 1),
+        "writes_per_tick": statistics.median(write_counts),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return the metrics that regressed compared to the baseline."""
+    regressions = []
+    for cars, result in results.items():
+        previous = baseline.get(str(cars))
+        if previous is None:
+            continue
+        for metric in METRICS:
+            before, after = previous.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            # Ignore noise on values that are close to zero
+            if after > before * (1 + tolerance) and after - before > 1:
+                regressions.append((cars, metric, before, after))
+    return regressions
+
+
+def report(results):
+    """Print the results as a table."""
+    columns = ["cars", "entities", "requests", "entry_setup_ms"] + METRICS
+    print(" ".join(f"{column:>16}" for column in columns))
+    for result in results.values():
+        print(" ".join(f"{result[column]:>16}" for column in columns))
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the coordinator to entity update path")
+    parser.add_argument("--cars", type=int, nargs="+", default=DEFAULT_CARS)
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS)
+    parser.add_argument("--change-rate", type=float, default=0.2, help="fraction of vehicles changing per tick")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = {}
+    for cars in args.cars:
+        results[cars] = asyncio.run(
+            async_benchmark(cars, args.ticks, args.change_rate, args.seed)
+        )
+    report(results)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({str(k): v for k, v in results.items()}, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run with --save-baseline to store one")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for cars, metric, before, after in regressions:
+        print(f"Regression at {cars} cars: {metric} {before} -> {after}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Home Assistant harness for the benchmark and load test tools
+
+Starts a Home Assistant instance in a temporary config directory with this
+integration as custom component, and adds config entries through the config
+flow against the Skoda Connect stand-in.
+"""
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from homeassistant import bootstrap, core, loader
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.const import CONF_PASSWORD, CONF_RESOURCES, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+import custom_components.skodaconnect as integration
+from custom_components.skodaconnect import config_flow
+from custom_components.skodaconnect.const import (
+    CONF_CONVERT,
+    CONF_DEBUG,
+    CONF_MUTABLE,
+    CONF_NO_CONVERSION,
+    CONF_SAVESESSION,
+    CONF_SPIN,
+    CONF_VEHICLE,
+    DATA,
+    DOMAIN,
+)
+
+from .standin import STANDIN_PASSWORD, STANDIN_USERNAME, StandinSession
+
+_LOGGER = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Updates are driven by the tools, keep the own timers out of the way
+HARNESS_SCAN_INTERVAL = 900
+
+
+def percentile(values, percent):
+    """Return a percentile of a list of values."""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+class LoopLagMonitor:
+    """Measure how long the event loop is blocked.
+
+    A task sleeps for a short interval and records how much later than
+    requested it wakes up.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    def start(self):
+        """Start sampling."""
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+
+    async def stop(self):
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self):
+        """Return the samples so far and start over."""
+        samples, self.samples = self.samples, []
+        return samples
+
+    async def _sample(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+
+class StateWriteCounter:
+    """Count state writes, changed or not.
+
+    Listeners of state_reported are called for state_changed as well.
+    """
+
+    def __init__(self, hass):
+        self.count = 0
+        self._unsubs = [
+            hass.bus.async_listen("state_reported", self._count, event_filter=self._all)
+        ]
+
+    @staticmethod
+    @core.callback
+    def _all(event_data):
+        return True
+
+    @core.callback
+    def _count(self, event):
+        self.count += 1
+
+    def reset(self):
+        """Return the writes so far and start over."""
+        count, self.count = self.count, 0
+        return count
+
+    def close(self):
+        """Stop counting."""
+        for unsub in self._unsubs:
+            unsub()
+
+
+def use_session(wrap):
+    """Wrap the client session used by the integration.
+
+    Both the config flow and the account hub create their connection with the
+    shared client session, that session is wrapped.
+    """
+
+    def get_clientsession(hass, *args, **kwargs):
+        return wrap(async_get_clientsession(hass, *args, **kwargs))
+
+    integration.async_get_clientsession = get_clientsession
+    config_flow.async_get_clientsession = get_clientsession
+
+
+def use_standin(url):
+    """Send all requests of the integration to the stand-in."""
+    use_session(lambda session: StandinSession(session, url))
+
+
+async def async_start_hass(config_dir=None):
+    """Start a minimal Home Assistant with the integration as custom component."""
+    if config_dir is None:
+        config_dir = tempfile.mkdtemp(prefix="skodaconnect-")
+    custom_components = Path(config_dir, "custom_components")
+    custom_components.mkdir(parents=True, exist_ok=True)
+    link = custom_components / DOMAIN
+    if not link.exists():
+        os.symlink(REPO_ROOT / "custom_components" / DOMAIN, link)
+
+    hass = core.HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    if hasattr(loader, "async_setup"):
+        loader.async_setup(hass)
+    # Base functionality loads the registries and the config entries
+    hass.config_entries = ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await hass.async_start()
+    return hass
+
+
+async def async_stop_hass(hass):
+    """Stop Home Assistant."""
+    await hass.async_stop(force=True)
+
+
+async def async_add_entry(
+    hass, vin, options=None, username=STANDIN_USERNAME, password=STANDIN_PASSWORD
+):
+    """Add a config entry for a vehicle through the config flow."""
+    flow = hass.config_entries.flow
+    result = await flow.async_init(DOMAIN, context={"source": "user"})
+    result = await flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: username, CONF_PASSWORD: password}
+    )
+    # Login and vehicle discovery run as progress steps
+    while result["type"] in (FlowResultType.SHOW_PROGRESS, FlowResultType.SHOW_PROGRESS_DONE):
+        await hass.async_block_till_done()
+        result = await flow.async_configure(result["flow_id"])
+    if result["type"] != FlowResultType.FORM or result["step_id"] != "vehicle":
+        raise RuntimeError(f"Config flow for {vin} failed: {result}")
+
+    result = await flow.async_configure(
+        result["flow_id"],
+        {CONF_VEHICLE: vin, CONF_SPIN: "", CONF_SAVESESSION: False, CONF_MUTABLE: True},
+    )
+    # Enable all instruments, the form defaults to all
+    resources = next(
+        key.default() for key in result["data_schema"].schema if key == CONF_RESOURCES
+    )
+    result = await flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_RESOURCES: resources,
+            CONF_CONVERT: CONF_NO_CONVERSION,
+            CONF_SCAN_INTERVAL: HARNESS_SCAN_INTERVAL,
+            CONF_DEBUG: False,
+        },
+    )
+    if result["type"] != FlowResultType.CREATE_ENTRY:
+        raise RuntimeError(f"Config flow for {vin} failed: {result}")
+    entry = result["result"]
+    if options:
+        hass.config_entries.async_update_entry(entry, options={**entry.options, **options})
+    await hass.async_block_till_done()
+    return entry
+
+
+def coordinator(hass, entry):
+    """Return the coordinator of a loaded config entry."""
+    return hass.data[DOMAIN][entry.entry_id][DATA].coordinator
+
+
+async def async_refresh_all(hass, entries):
+    """Refresh all vehicles once, as their update timers would.
+
+    The fetched data is aged by one poll interval first, otherwise nothing is
+    due yet when ticks follow each other without waiting.
+    """
+    coordinators = [coordinator(hass, entry) for entry in entries]
+    for member in coordinators:
+        member.data_updated = {
+            group: updated - member.poll_interval
+            for group, updated in member.data_updated.items()
+        }
+    await asyncio.gather(*(member.async_refresh() for member in coordinators))
+    await hass.async_block_till_done()
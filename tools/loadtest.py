@@ -0,0 +1,222 @@
+"""
+Fleet-scale load test
+
+Runs the real lifecycle of many config entries against the Skoda Connect
+stand-in for a long time: setup through the config flow, refreshes, service
+calls targeting the whole fleet and unload, over and over:
+
+    python -m tools.loadtest --entries 50 --hours 4 --latency 100 --error-rate 0.01
+
+Every cycle records event loop lag percentiles, RSS, the number of asyncio
+tasks and the event bus listeners. Listener and task counts are compared at the
+same point of every cycle, anything that keeps growing is reported as a leak.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import sys
+import time
+
+from custom_components.skodaconnect import async_get_devices
+from custom_components.skodaconnect.const import DOMAIN, SERVICE_SET_CHARGE_LIMIT
+
+from .harness import (
+    LoopLagMonitor,
+    async_add_entry,
+    async_refresh_all,
+    async_start_hass,
+    async_stop_hass,
+    percentile,
+    use_standin,
+)
+from .standin import SkodaStandin
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_ENTRIES = 20
+DEFAULT_HOURS = 1.0
+DEFAULT_REFRESHES = 5
+# Allowed RSS growth between the first and last cycle
+DEFAULT_RSS_GROWTH = 0.25
+
+
+def rss_kib():
+    """Return the resident set size of the process in KiB."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # Peak RSS where /proc is not available
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def listeners(hass):
+    """Return the number of event bus listeners per event type."""
+    return dict(hass.bus.async_listeners())
+
+
+def integration_tasks():
+    """Return the number of asyncio tasks, without the stand-in request handlers."""
+    # Keep-alive connections to the stand-in run a handler task each in this loop
+    return sum(
+        1
+        for task in asyncio.all_tasks()
+        if getattr(task.get_coro(), "__qualname__", "") != "RequestHandler.start"
+    )
+
+
+async def async_cycle(hass, standin, entries, refreshes):
+    """Run one setup, refresh, service and unload cycle, return entries and samples."""
+    if not entries:
+        entries = [await async_add_entry(hass, vin) for vin in standin.vehicles]
+    else:
+        for entry in entries:
+            await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    after_setup = listeners(hass)
+    tasks = integration_tasks()
+
+    for _ in range(refreshes):
+        await async_refresh_all(hass, entries)
+
+    # A service for every electric vehicle, once waiting and once in the background
+    devices = [
+        device_id
+        for device_id, coordinator in async_get_devices(hass).items()
+        if standin.vehicles[coordinator.vin].electric
+    ]
+    for wait in (True, False):
+        try:
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_SET_CHARGE_LIMIT,
+                {"device_id": devices, "limit": 50, "wait": wait},
+                blocking=True,
+                return_response=True,
+            )
+        except Exception as e:
+            _LOGGER.warning(f"Service call failed: {e}")
+    await hass.async_block_till_done()
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    return entries, after_setup, tasks
+
+
+def growth(samples):
+    """Return the keys whose count grew in every cycle after the first."""
+    leaks = {}
+    for key in set().union(*samples):
+        counts = [sample.get(key, 0) for sample in samples]
+        if len(counts) > 2 and all(b > a for a, b in zip(counts[1:], counts[2:])):
+            leaks[key] = counts[-1] - counts[1]
+    return leaks
+
+
+async def async_loadtest(args):
+    """Run the load test and return its summary."""
+    standin = SkodaStandin(
+        vehicles=args.entries,
+        latency=args.latency,
+        jitter=args.latency / 2,
+        error_rate=args.error_rate,
+        command_delay=args.command_delay,
+        seed=args.seed,
+    )
+    url = await standin.async_start(port=0)
+    use_standin(url)
+    hass = await async_start_hass()
+    lag = LoopLagMonitor()
+    lag.start()
+
+    entries = []
+    cycles = []
+    after_setup = []
+    after_unload = []
+    deadline = time.monotonic() + args.hours * 3600
+    try:
+        while time.monotonic() < deadline or not cycles:
+            started = time.monotonic()
+            entries, setup_listeners, setup_tasks = await async_cycle(
+                hass, standin, entries, args.refreshes
+            )
+            samples = lag.reset()
+            cycle = {
+                "cycle": len(cycles) + 1,
+                "duration_s": round(time.monotonic() - started, 2),
+                "lag_p50_ms": round(percentile(samples, 50) * 1000, 2),
+                "lag_p95_ms": round(percentile(samples, 95) * 1000, 2),
+                "lag_p99_ms": round(percentile(samples, 99) * 1000, 2),
+                "lag_max_ms": round(max(samples, default=0.0) * 1000, 2),
+                "rss_kib": rss_kib(),
+                "tasks_loaded": setup_tasks,
+                "tasks_unloaded": integration_tasks(),
+                "listeners_loaded": sum(setup_listeners.values()),
+                "listeners_unloaded": sum(listeners(hass).values()),
+            }
+            cycles.append(cycle)
+            after_setup.append(setup_listeners)
+            after_unload.append(listeners(hass))
+            print(json.dumps(cycle), flush=True)
+    finally:
+        await lag.stop()
+        await async_stop_hass(hass)
+        await standin.async_stop()
+
+    # The first cycle loads the integration once, compare with the state after it
+    leaked = {
+        event: count - after_unload[0].get(event, 0)
+        for event, count in after_unload[-1].items()
+        if count > after_unload[0].get(event, 0)
+    }
+    first, last = cycles[0], cycles[-1]
+    return {
+        "entries": args.entries,
+        "cycles": len(cycles),
+        "requests": sum(standin.stats.values()),
+        "unrouted": standin.unrouted,
+        "lag_p99_ms": max(cycle["lag_p99_ms"] for cycle in cycles),
+        "lag_max_ms": max(cycle["lag_max_ms"] for cycle in cycles),
+        "rss_growth": round(last["rss_kib"] / first["rss_kib"] - 1, 3),
+        "tasks_leaked": last["tasks_unloaded"] - first["tasks_unloaded"],
+        "listeners_leaked": leaked,
+        "listeners_growing": {
+            **growth(after_setup),
+            **growth(after_unload),
+        },
+    }
+
+
+def main():
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description="Fleet-scale load test")
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES, help="number of config entries")
+    parser.add_argument("--hours", type=float, default=DEFAULT_HOURS, help="duration of the test")
+    parser.add_argument("--refreshes", type=int, default=DEFAULT_REFRESHES, help="refreshes per cycle")
+    parser.add_argument("--latency", type=float, default=50, help="stand-in latency per request in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing")
+    parser.add_argument("--command-delay", type=float, default=1, help="seconds until commands complete")
+    parser.add_argument("--max-rss-growth", type=float, default=DEFAULT_RSS_GROWTH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    summary = asyncio.run(async_loadtest(args))
+    print(json.dumps(summary, indent=2))
+    failed = (
+        summary["listeners_leaked"]
+        or summary["listeners_growing"]
+        or summary["tasks_leaked"] > 0
+        or summary["rss_growth"] > args.max_rss_growth
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
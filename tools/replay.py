@@ -0,0 +1,159 @@
+"""
+Replay of a recorded cassette through the integration
+
+Cassettes are recorded with the "Record API traffic" option of a config entry.
+The replay sets up a config entry for every vehicle in the cassette and answers
+all requests from the cassette, with the recorded latency divided by the speed:
+
+    python -m tools.replay skodaconnect/cassette-20261018-120000-a1b2c3.jsonl.gz
+    python -m tools.replay <cassette> --speed 0 --refreshes 100 --strict
+    python -m tools.replay <cassette> --summary
+
+Refreshes are spaced like the polls in the recording, divided by the speed.
+Setup logs in through the config flow, so record from a restart or reload with
+"Save session tokens" disabled to have the login in the cassette. Requests
+without a recorded response are answered with 404 and reported, --strict fails
+the replay on them. Recorded tokens lose their signature in the redaction, the
+library warns that it cannot verify them and carries on.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import statistics
+import sys
+import time
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.skodaconnect.cassette import (
+    REDACTED,
+    REDACTED_USERNAME,
+    REDACTED_VIN,
+    VIN,
+    CassettePlayer,
+    read_cassette,
+    request_key,
+)
+
+from .harness import (
+    LoopLagMonitor,
+    StateWriteCounter,
+    async_add_entry,
+    async_refresh_all,
+    async_start_hass,
+    async_stop_hass,
+    percentile,
+    use_session,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REFRESHES = 10
+# Pause between requests that separates two polls in a recording (seconds)
+POLL_GAP = 5
+
+
+def recorded_vins(entries):
+    """Return the redacted VINs in the recorded URLs and responses."""
+    vins = set()
+    for entry in entries:
+        for vin in VIN.findall(entry["u"] + entry.get("b", "")):
+            if vin.startswith(REDACTED_VIN[:11]):
+                vins.add(vin)
+    return sorted(vins)
+
+
+def recorded_interval(entries):
+    """Return the median time between the polls of a recording."""
+    times = [entry["t"] for entry in entries]
+    gaps = [later - earlier for earlier, later in zip(times, times[1:]) if later - earlier > POLL_GAP]
+    return statistics.median(gaps) if gaps else 0
+
+
+def summary(header, entries):
+    """Return the requests of a cassette per method and URL."""
+    requests = collections.Counter(" ".join(request_key(entry["m"], entry["u"])[2:]) for entry in entries)
+    return {
+        "recorded": header["recorded"],
+        "requests": len(entries),
+        "errors": sum(1 for entry in entries if "e" in entry),
+        "duration_s": entries[-1]["t"] if entries else 0,
+        "poll_interval_s": recorded_interval(entries),
+        "vins": recorded_vins(entries),
+        "urls": dict(requests.most_common()),
+    }
+
+
+async def async_replay(entries, speed, refreshes):
+    """Replay a cassette through the integration and return its metrics."""
+    hass = await async_start_hass()
+    player = CassettePlayer(entries, speed, async_get_clientsession(hass))
+    use_session(lambda session: player)
+    interval = recorded_interval(entries) / speed if speed else 0
+    try:
+        setup_started = time.perf_counter()
+        config_entries = [
+            await async_add_entry(hass, vin, username=REDACTED_USERNAME, password=REDACTED)
+            for vin in recorded_vins(entries)
+        ]
+        setup_time = time.perf_counter() - setup_started
+
+        writes = StateWriteCounter(hass)
+        lag = LoopLagMonitor()
+        lag.start()
+        ticks = []
+        for tick in range(refreshes):
+            if tick and interval:
+                await asyncio.sleep(interval)
+            started = time.perf_counter()
+            await async_refresh_all(hass, config_entries)
+            ticks.append(time.perf_counter() - started)
+        samples = lag.reset()
+        await lag.stop()
+        writes.close()
+
+        for entry in config_entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+    finally:
+        await async_stop_hass(hass)
+
+    return {
+        "vehicles": len(config_entries),
+        "setup_s": round(setup_time, 3),
+        "replayed": player.replayed,
+        "unmatched": dict(collections.Counter(player.unmatched).most_common()),
+        "tick_median_ms": round(statistics.median(ticks) * 1000, 2) if ticks else 0,
+        "tick_p95_ms": round(percentile(ticks, 95) * 1000, 2),
+        "loop_lag_max_ms": round(max(samples, default=0.0) * 1000, 2),
+        "state_writes": writes.reset(),
+    }
+
+
+def main():
+    """Replay a cassette from the command line."""
+    parser = argparse.ArgumentParser(description="Replay a recorded cassette through the integration")
+    parser.add_argument("cassette", help="cassette file")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, 0 for no delays")
+    parser.add_argument("--refreshes", type=int, default=DEFAULT_REFRESHES, help="refreshes of all vehicles")
+    parser.add_argument("--strict", action="store_true", help="fail on requests without recorded response")
+    parser.add_argument("--summary", action="store_true", help="only print what the cassette contains")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    header, entries = read_cassette(args.cassette)
+    if args.summary:
+        print(json.dumps(summary(header, entries), indent=2))
+        return 0
+
+    result = asyncio.run(async_replay(entries, args.speed, args.refreshes))
+    print(json.dumps(result, indent=2))
+    if not result["vehicles"]:
+        print("No vehicles in the cassette")
+        return 1
+    return 1 if args.strict and result["unmatched"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1007 @@
+"""
+Offline stand-in for the Skoda Connect API
+
+Serves the endpoints skodaconnect.Connection talks to with synthetic vehicles,
+so the coordinator, config flow and services can be exercised, measured and
+regression tested without the cloud:
+
+    python -m tools.standin --vehicles 20 --latency 150 --error-rate 0.02
+
+Requests are sent to the stand-in by wrapping the client session:
+
+    session = StandinSession(async_get_clientsession(hass), "http://127.0.0.1:8765")
+    connection = Connection(session, STANDIN_USERNAME, STANDIN_PASSWORD)
+
+Routes follow the paths used by skodaconnect 1.3.11, including its redirect
+based login through the sign-in service. Tokens are signed with a key the
+stand-in publishes, so the library verifies them like real ones. Requests
+without a route answer 404 and are counted in the statistics so missing
+coverage shows up.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+import jwt
+from aiohttp import web
+from cryptography.hazmat.primitives.asymmetric import rsa
+from yarl import URL
+
+_LOGGER = logging.getLogger(__name__)
+
+STANDIN_USERNAME = "standin@example.com"
+STANDIN_PASSWORD = "standin"
+STANDIN_SPIN = "1234"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Hosts the library talks to, requests to these are rewritten to the stand-in
+API_HOSTS = [
+    "identity.vwgroup.io",
+    "mbboauth-1d.prd.ece.vwg-connect.com",
+    "mal-1a.prd.ece.vwg-connect.com",
+    "msg.volkswagen.de",
+    "api.connect.skoda-auto.cz",
+    "profileintegrityservice.apps.emea.vwapps.io",
+    "customer-profile.vwgroup.io",
+    "iaservices.skoda-auto.com",
+]
+ISSUER = "https://identity.vwgroup.io"
+LOGIN_REDIRECT = "skodaconnect://oidc.login/"
+# Home region base URI that the library maps to msg.volkswagen.de
+HOME_REGION = "https://mal-1a.prd.ece.vwg-connect.com/api"
+STANDIN_SUBJECT = "8d2c5b0e-5a4c-4d3a-9b7e-standin00000"
+
+# Seconds until a command request completes
+DEFAULT_COMMAND_DELAY = 5
+
+MODELS = [
+    ("Enyaq iV 80", "iV", True),
+    ("Octavia Combi", "Octavia", False),
+    ("Superb iV", "Superb", True),
+    ("Kodiaq", "Kodiaq", False),
+]
+
+
+class StandinVehicle:
+    """Synthetic vehicle with state that changes over time and with commands."""
+
+    def __init__(self, index, rng):
+        title, model, electric = MODELS[index % len(MODELS)]
+        # Real VINs never contain I, O or Q
+        self.vin = f"TMBSTNDN{index:09d}"
+        self.title = title
+        self.model = model
+        self.electric = electric
+        self.model_year = 2019 + index % 5
+        self.odometer = rng.randint(1000, 150000)
+        self.soc = rng.randint(20, 90)
+        self.fuel = rng.randint(10, 100)
+        self.range = rng.randint(100, 600)
+        self.charging = False
+        self.plugged = electric and rng.random() < 0.5
+        self.max_current = 16
+        self.charge_limit = 50
+        self.climatisation = False
+        self.target_temperature = 21.0
+        self.window_heater = False
+        self.pheater = False
+        self.locked = True
+        self.moving = False
+        self.latitude = 50.0 + rng.random()
+        self.longitude = 14.0 + rng.random()
+        self.parked = datetime.now(timezone.utc) - timedelta(minutes=rng.randint(1, 600))
+        self.timers = {
+            timer_id: {
+                "id": timer_id,
+                "enabled": False,
+                "recurring": True,
+                "time": "07:00",
+                "days": "yyyyynn",
+            }
+            for timer_id in (1, 2, 3)
+        }
+        self._updated = time.monotonic()
+
+    def advance(self):
+        """Move the simulation forward to now."""
+        now = time.monotonic()
+        minutes = (now - self._updated) / 60
+        self._updated = now
+        if self.charging:
+            self.soc = min(100, self.soc + minutes)
+            if self.soc >= 100:
+                self.charging = False
+        if self.moving:
+            self.odometer += int(minutes)
+            self.latitude += 0.001 * minutes
+            self.soc = max(0, self.soc - minutes / 5)
+
+    def field(self, field_id, value, unit=None):
+        """Return a vehicle status report field."""
+        field = {"id": field_id, "value": str(value), "tsCarCaptured": self.timestamp()}
+        if unit is not None:
+            field["unit"] = unit
+        return field
+
+    @staticmethod
+    def timestamp(value=None):
+        """Return a timestamp in the format of the API."""
+        return (value or datetime.now(timezone.utc)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def status(self):
+        """Return the vehicle status report."""
+        # Field ids as mapped by the library: locks 2 is locked, doors and
+        # windows 3 is closed, lights 2 is off, drive 3 is electric
+        lock = 2 if self.locked else 3
+        fields = [
+            self.field("0x0101010002", self.odometer, "km"),
+            self.field("0x0203010001", 15000 - self.odometer % 15000, "km"),
+            self.field("0x0203010002", 200, "d"),
+            self.field("0x0203010003", 30000 - self.odometer % 30000, "km"),
+            self.field("0x0203010004", 365, "d"),
+            self.field("0x0301010001", 2),
+            self.field("0x0301020001", 2931, "dK"),
+            self.field("0x0301030002", int(self.soc) if self.electric else 0, "%"),
+            self.field("0x0301030005", self.range, "km"),
+            self.field("0x0301030006", self.range, "km"),
+            self.field("0x0301030007", 3 if self.electric else 6),
+            self.field("0x030103000A", 0 if self.electric else self.fuel, "%"),
+        ]
+        fields += [self.field(field_id, lock) for field_id in ("0x0301040001", "0x0301040004", "0x0301040007", "0x030104000A", "0x030104000D")]
+        fields += [
+            self.field(field_id, 3)
+            for field_id in (
+                "0x0301040002",
+                "0x0301040005",
+                "0x0301040008",
+                "0x030104000B",
+                "0x030104000E",
+                "0x0301040011",
+                "0x0301050001",
+                "0x0301050003",
+                "0x0301050005",
+                "0x0301050007",
+                "0x030105000B",
+            )
+        ]
+        return {
+            "StoredVehicleDataResponse": {
+                "vin": self.vin,
+                "vehicleData": {"data": [{"id": "0x0101010001", "field": fields}]},
+            }
+        }
+
+    def position(self):
+        """Return the parking position, None while moving."""
+        if self.moving:
+            return None
+        return {
+            "findCarResponse": {
+                "Position": {
+                    "timestampCarSentUTC": self.timestamp(),
+                    "carCoordinate": {
+                        "latitude": int(self.latitude * 1000000),
+                        "longitude": int(self.longitude * 1000000),
+                    },
+                },
+                "parkingTimeUTC": self.timestamp(self.parked),
+            }
+        }
+
+    def charger(self):
+        """Return the charger status."""
+        return {
+            "charger": {
+                "settings": {"maxChargeCurrent": {"content": self.max_current}},
+                "status": {
+                    "chargingStatusData": {
+                        "chargingState": {"content": "charging" if self.charging else "off"},
+                        "externalPowerSupplyState": {
+                            "content": "available" if self.plugged else "unavailable"
+                        },
+                        "energyFlow": {"content": "on" if self.charging else "off"},
+                    },
+                    "batteryStatusData": {
+                        "stateOfCharge": {"content": int(self.soc)},
+                        "remainingChargingTime": {
+                            "content": int((100 - self.soc) * 6) if self.charging else 65535
+                        },
+                    },
+                    "plugStatusData": {
+                        "plugState": {"content": "connected" if self.plugged else "disconnected"},
+                        "lockState": {"content": "locked" if self.plugged else "unlocked"},
+                    },
+                    "cruisingRangeStatusData": {
+                        "primaryEngineRange": {"content": self.range},
+                        "engineTypeFirstEngine": {
+                            "content": "typeIsElectric" if self.electric else "typeIsGasoline"
+                        },
+                    },
+                },
+            }
+        }
+
+    def climater(self):
+        """Return the climater status."""
+        return {
+            "climater": {
+                "settings": {
+                    "targetTemperature": {"content": int((self.target_temperature + 273) * 10)},
+                    "climatisationWithoutHVpower": {"content": False},
+                    "heaterSource": {"content": "electric"},
+                },
+                "status": {
+                    "climatisationStatusData": {
+                        "climatisationState": {
+                            "content": "heating" if self.climatisation else "off"
+                        },
+                    },
+                    "windowHeatingStatusData": {
+                        "windowHeatingStateFront": {"content": "on" if self.window_heater else "off"},
+                        "windowHeatingStateRear": {"content": "on" if self.window_heater else "off"},
+                    },
+                },
+            }
+        }
+
+    def preheater(self):
+        """Return the parking heater status."""
+        return {
+            "statusResponse": {
+                "climatisationStateReport": {
+                    "climatisationState": "heating" if self.pheater else "off",
+                    "climatisationDuration": 30,
+                    "remainingClimateTime": 30 if self.pheater else 0,
+                }
+            }
+        }
+
+    def timer(self):
+        """Return the departure timers with their profiles."""
+        return {
+            "timer": {
+                "timersAndProfiles": {
+                    "timerList": {
+                        "timer": [
+                            {
+                                "timerID": str(timer["id"]),
+                                "profileID": str(timer["id"]),
+                                "timerProgrammedStatus": "programmed" if timer["enabled"] else "notProgrammed",
+                                "timerFrequency": "cyclic" if timer["recurring"] else "single",
+                                "departureTimeOfDay": timer["time"],
+                                "departureWeekdayMask": timer["days"],
+                            }
+                            for timer in self.timers.values()
+                        ]
+                    },
+                    "timerProfileList": {
+                        "timerProfile": [
+                            {
+                                "profileID": str(timer["id"]),
+                                "profileName": f"Profile {timer['id']}",
+                                "operationCharging": self.electric,
+                                "operationClimatisation": True,
+                                "targetChargeLevel": 100,
+                                "chargeMaxCurrent": self.max_current,
+                                "nightRateActive": False,
+                            }
+                            for timer in self.timers.values()
+                        ]
+                    },
+                    "timerBasicSetting": {
+                        "chargeMinLimit": self.charge_limit,
+                        "heaterSource": "electric",
+                        "targetTemperature": int((self.target_temperature + 273) * 10),
+                    },
+                }
+            }
+        }
+
+    def trip(self):
+        """Return the latest trip statistics."""
+        return {
+            "tripData": {
+                "tripID": 1,
+                "averageSpeed": 45,
+                "averageElectricEngineConsumption": 170 if self.electric else None,
+                "averageFuelConsumption": None if self.electric else 62,
+                "mileage": 23,
+                "startMileage": self.odometer - 23,
+                "traveltime": 31,
+                "timestamp": self.timestamp(self.parked),
+            }
+        }
+
+    def garage(self):
+        """Return the vehicle as listed in the garage."""
+        specification = {
+            "title": self.title,
+            "model": self.model,
+            "modelYear": str(self.model_year),
+        }
+        if self.electric:
+            specification["battery"] = {"capacityInKWh": 77}
+        return {
+            "vin": self.vin,
+            "name": self.title,
+            "specification": specification,
+            # Data and commands are served through the VW-Group API routes
+            "connectivities": [{"type": "ONLINE"}],
+            "capabilities": {"capabilities": []},
+        }
+
+    def real_car(self):
+        """Return the vehicle as listed in the customer profile."""
+        return {
+            "vehicleIdentificationNumber": self.vin,
+            "nickname": f"{self.model} {self.vin[-3:]}",
+            "deactivated": False,
+        }
+
+    def command(self, service, action):
+        """Apply a command to the vehicle state when it completes."""
+        action = action or {}
+        kind = str(action.get("type", "")).lower()
+        if service == "batterycharge":
+            if kind == "start":
+                self.charging = self.plugged
+            elif kind == "stop":
+                self.charging = False
+            elif kind == "setsettings":
+                current = action.get("settings", {}).get("maxChargeCurrent")
+                if current is not None:
+                    self.max_current = current
+        elif service == "climatisation":
+            if kind == "startclimatisation":
+                self.climatisation = True
+            elif kind == "stopclimatisation":
+                self.climatisation = False
+            elif kind == "startwindowheating":
+                self.window_heater = True
+            elif kind == "stopwindowheating":
+                self.window_heater = False
+            elif kind == "setsettings":
+                temperature = action.get("settings", {}).get("targetTemperature")
+                if temperature is not None:
+                    self.target_temperature = round(temperature / 10 - 273, 1)
+        elif service == "rs":
+            self.pheater = "quickstart" in action.get("performAction", {})
+        elif service == "rlu":
+            self.locked = kind == "lock"
+        elif service == "departuretimer":
+            limit = action.get("chargeMinLimit")
+            if limit is not None:
+                self.charge_limit = limit
+            temperature = action.get("targetTemperature")
+            if temperature is not None:
+                self.target_temperature = round(temperature / 10 - 273, 1)
+            for timer in action.get("timers", []):
+                timer_id = int(timer.get("id", 0))
+                if timer_id in self.timers:
+                    self.timers[timer_id].update(timer)
+
+
+class StandinCommand:
+    """Command request that completes after a delay."""
+
+    def __init__(self, vehicle, service, action, delay, fail):
+        self.id = uuid.uuid4().hex
+        self.vehicle = vehicle
+        self.service = service
+        self.action = action
+        self.created = time.monotonic()
+        self.delay = delay
+        self.fail = fail
+        self.applied = False
+
+    @property
+    def state(self):
+        """Return queued, fetched, succeeded or failed."""
+        elapsed = time.monotonic() - self.created
+        if elapsed < self.delay / 2:
+            return "queued"
+        if elapsed < self.delay:
+            return "fetched"
+        if self.fail:
+            return "failed"
+        if not self.applied:
+            self.vehicle.command(self.service, self.action)
+            self.applied = True
+        return "succeeded"
+
+
+class SkodaStandin:
+    """Stand-in for the Skoda Connect cloud with synthetic vehicles.
+
+    Latency, errors and throttling can be injected for all routes. Every
+    request is counted per route for benchmarks and load tests.
+    """
+
+    def __init__(
+        self,
+        vehicles=1,
+        latency=0,
+        jitter=0,
+        error_rate=0.0,
+        throttle_rate=0.0,
+        rate_limit=None,
+        command_delay=DEFAULT_COMMAND_DELAY,
+        command_error_rate=0.0,
+        seed=0,
+    ):
+        self.rng = random.Random(seed)
+        self.vehicles = {
+            vehicle.vin: vehicle
+            for vehicle in (StandinVehicle(index, self.rng) for index in range(vehicles))
+        }
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.command_delay = command_delay
+        self.command_error_rate = command_error_rate
+        self.commands = {}
+        self.logins = {}
+        self.codes = {}
+        self.key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.key_id = uuid.uuid4().hex
+        self.stats = {}
+        self.unrouted = {}
+        self._window = []
+        self.runner = None
+        self.url = None
+        self.routes = [
+            # Identity, login pages redirect like the real sign-in service
+            ("GET", r"identity\.vwgroup\.io/\.well-known/openid-configuration", self.openid_configuration),
+            ("GET", r"identity\.vwgroup\.io/oidc/v1/authorize", self.authorize),
+            ("GET", r"identity\.vwgroup\.io/signin-service/v1/signin/(?P<client>[^/]+)", self.signin),
+            ("POST", r"identity\.vwgroup\.io/signin-service/v1/(?P<client>[^/]+)/login/identifier", self.identifier),
+            ("POST", r"identity\.vwgroup\.io/signin-service/v1/(?P<client>[^/]+)/login/authenticate", self.authenticate),
+            ("GET", r"identity\.vwgroup\.io/oidc/v1/oauth/client/callback", self.callback),
+            ("GET", r"identity\.vwgroup\.io/oidc/v1/keys", self.keys),
+            # Tokens
+            ("POST", r"api\.connect\.skoda-auto\.cz/api/v1/authentication/token", self.skoda_token),
+            ("POST", r"api\.connect\.skoda-auto\.cz/api/v1/authentication/token/refresh", self.skoda_refresh),
+            ("POST", r"api\.connect\.skoda-auto\.cz/api/v1/authentication/token/revoke", self.revoke),
+            ("POST", r"mbboauth-1d\.prd\.ece\.vwg-connect\.com/mbbcoauth/mobile/oauth2/v1/token", self.mbb_token),
+            ("POST", r"mbboauth-1d\.prd\.ece\.vwg-connect\.com/mbbcoauth/mobile/oauth2/v1/revoke", self.revoke),
+            ("GET", r"mbboauth-1d\.prd\.ece\.vwg-connect\.com/mbbcoauth/public/jwk/v1", self.keys),
+            # Profile
+            ("POST", r"profileintegrityservice\.apps\.emea\.vwapps\.io/iaa/pic/v1/users/[^/]+/check-profile", self.check_profile),
+            ("GET", r"customer-profile\.vwgroup\.io/v2/customers/[^/]+/realCarData", self.real_car_data),
+            # Vehicles
+            ("GET", r"api\.connect\.skoda-auto\.cz/api/v3/garage", self.garage),
+            ("GET", r"msg\.volkswagen\.de/fs-car/usermanagement/users/v1/skoda/[A-Z]+/vehicles", self.user_vehicles),
+            ("GET", r"mal-1a\.prd\.ece\.vwg-connect\.com/api/cs/vds/v1/vehicles/(?P<vin>\w+)/homeRegion", self.home_region),
+            ("GET", r"mal-1a\.prd\.ece\.vwg-connect\.com/api/rolesrights/operationlist/v3/vehicles/(?P<vin>\w+)", self.operations),
+            ("GET", r"iaservices\.skoda-auto\.com/ms/GetMODCWPImage", self.model_image),
+            # Data groups
+            ("GET", r".*/bs/vsr/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/status", self.data("status")),
+            ("GET", r".*/bs/cf/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/position", self.data("position")),
+            ("GET", r".*/bs/batterycharge/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/charger", self.data("charger")),
+            ("GET", r".*/bs/climatisation/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/climater", self.data("climater")),
+            ("GET", r".*/bs/rs/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/status", self.data("preheater")),
+            ("GET", r".*/bs/departuretimer/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/timer", self.data("timer")),
+            ("GET", r".*/bs/tripstatistics/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/tripdata/.*", self.data("trip")),
+            # Commands and their status
+            ("POST", r".*/bs/(?P<service>batterycharge|climatisation|departuretimer)/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/\w+/actions", self.action),
+            ("POST", r".*/bs/(?P<service>rs|rlu)/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/actions?", self.action),
+            ("POST", r".*/bs/(?P<service>vsr)/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/requests", self.action),
+            ("POST", r".*/bs/(?P<service>rhf)/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/honkAndFlash", self.action),
+            ("GET", r".*/bs/\w+/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/\w+/actions/(?P<id>\w+)", self.action_status),
+            ("GET", r".*/bs/\w+/v1/skoda/[A-Z]+/vehicles/(?P<vin>\w+)/(requests|honkAndFlash)/(?P<id>\w+)/(status|jobstatus)", self.action_status),
+            ("GET", r".*/rolesrights/authorization/v2/vehicles/(?P<vin>\w+)/services/.*/security-pin-auth-requested", self.spin_requested),
+            ("POST", r".*/rolesrights/authorization/v2/security-pin-auth-completed", self.spin_completed),
+        ]
+        self._routes = [
+            (method, re.compile(pattern), handler) for method, pattern, handler in self.routes
+        ]
+
+    # Server
+
+    def application(self):
+        """Return the web application."""
+        app = web.Application(middlewares=[self.inject])
+        app.router.add_route("*", "/{target:.*}", self.dispatch)
+        return app
+
+    async def async_start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Start serving, port 0 picks a free port."""
+        self.runner = web.AppRunner(self.application(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        _LOGGER.info(f"Skoda Connect stand-in with {len(self.vehicles)} vehicles at {self.url}")
+        return self.url
+
+    async def async_stop(self):
+        """Stop serving."""
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    @web.middleware
+    async def inject(self, request, handler):
+        """Add latency, errors and throttling to all routes."""
+        if self.latency or self.jitter:
+            await asyncio.sleep((self.latency + self.rng.uniform(0, self.jitter)) / 1000)
+        if self.throttled():
+            return web.json_response(
+                {"error": "Too many requests"}, status=429, headers={"Retry-After": "60"}
+            )
+        if self.rng.random() < self.error_rate:
+            return web.json_response({"error": "Injected error"}, status=500)
+        return await handler(request)
+
+    def throttled(self):
+        """Return true if the request exceeds the rate limit or is randomly throttled."""
+        if self.rng.random() < self.throttle_rate:
+            return True
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        self._window = [sent for sent in self._window if now - sent < 60]
+        if len(self._window) >= self.rate_limit:
+            return True
+        self._window.append(now)
+        return False
+
+    async def dispatch(self, request):
+        """Route a request by method, original host and path."""
+        target = request.match_info["target"]
+        for method, pattern, handler in self._routes:
+            if method != request.method:
+                continue
+            match = pattern.fullmatch(target)
+            if match:
+                self.stats[pattern.pattern] = self.stats.get(pattern.pattern, 0) + 1
+                return await handler(request, **match.groupdict())
+        key = f"{request.method} {target}"
+        self.unrouted[key] = self.unrouted.get(key, 0) + 1
+        _LOGGER.warning(f"No stand-in route for {key}")
+        return web.json_response({"error": "Not found"}, status=404)
+
+    def vehicle(self, vin):
+        """Return an advanced vehicle or raise not found."""
+        vehicle = self.vehicles.get(vin)
+        if vehicle is None:
+            raise web.HTTPNotFound()
+        vehicle.advance()
+        return vehicle
+
+    def token(self, audience=None, lifetime=3600, **claims):
+        """Return a token signed with the key the stand-in publishes."""
+        now = int(time.time())
+        payload = {"sub": STANDIN_SUBJECT, "iss": ISSUER, "iat": now, "exp": now + lifetime, **claims}
+        if audience is not None:
+            payload["aud"] = audience
+        return jwt.encode(payload, self.key, algorithm="RS256", headers={"kid": self.key_id})
+
+    def tokens(self, client_id):
+        """Return access, refresh and identity tokens for a client."""
+        return {
+            "accessToken": self.token(client_id),
+            "refreshToken": self.token(client_id, 86400, typ="refresh_token"),
+            "idToken": self.token(client_id, email=STANDIN_USERNAME),
+        }
+
+    def decode(self, token):
+        """Return the claims of a token issued by the stand-in, None if invalid."""
+        try:
+            return jwt.decode(
+                token,
+                self.key.public_key(),
+                algorithms=["RS256"],
+                options={"verify_aud": False},
+            )
+        except jwt.PyJWTError:
+            return None
+
+    @staticmethod
+    def hmac(relay, email):
+        """Return the form signature that ties the password step to the email step."""
+        return hashlib.sha256(f"{relay}:{email}".encode()).hexdigest()
+
+    # Identity
+
+    async def openid_configuration(self, request):
+        """Return the endpoints of the identity provider."""
+        return web.json_response(
+            {
+                "issuer": ISSUER,
+                "authorization_endpoint": f"{ISSUER}/oidc/v1/authorize",
+                "token_endpoint": f"{ISSUER}/oidc/v1/token",
+                "jwks_uri": f"{ISSUER}/oidc/v1/keys",
+            }
+        )
+
+    async def authorize(self, request):
+        """Redirect to the sign-in service, or back to the app with an error."""
+        client = request.query.get("client_id")
+        redirect = request.query.get("redirect_uri")
+        if not client or redirect != LOGIN_REDIRECT:
+            error = urlencode({"error": "invalid_request", "error_description": "Unknown client"})
+            raise web.HTTPFound(f"{LOGIN_REDIRECT}?{error}")
+        relay = uuid.uuid4().hex
+        self.logins[relay] = client
+        raise web.HTTPFound(f"{ISSUER}/signin-service/v1/signin/{client}?relayState={relay}")
+
+    async def signin(self, request, client):
+        """Return the email step of the login page as a plain HTML form."""
+        relay = request.query.get("relayState", "")
+        return web.Response(
+            content_type="text/html",
+            text=(
+                "<html><body>"
+                f'<form id="emailPasswordForm" method="POST" action="/signin-service/v1/{client}/login/identifier">'
+                '<input type="hidden" name="_csrf" value="standin-csrf"/>'
+                f'<input type="hidden" name="relayState" value="{relay}"/>'
+                '<input type="hidden" name="hmac" value="standin-hmac"/>'
+                '<input type="email" name="email"/>'
+                "</form></body></html>"
+            ),
+        )
+
+    async def identifier(self, request, client):
+        """Return the password step of the login page as a script built form."""
+        form = await request.post()
+        relay = form.get("relayState", "")
+        model = {
+            "hmac": self.hmac(relay, form.get("email")),
+            "relayState": relay,
+            "emailPasswordForm": {"email": form.get("email")},
+            "postAction": "login/authenticate",
+            "identifierUrl": "login/identifier",
+        }
+        if form.get("email") != STANDIN_USERNAME:
+            model["error"] = "login.errors.user_not_found"
+        # The library extracts the model up to the first comma and newline
+        return web.Response(
+            content_type="text/html",
+            text=(
+                "<html><head><script>\n"
+                "window._IDK = {\n"
+                f"    templateModel: {json.dumps(model)},\n"
+                "    csrf_parameterName: '_csrf',\n"
+                "    csrf_token: 'standin-csrf'\n"
+                "};\n</script></head><body></body></html>"
+            ),
+        )
+
+    async def authenticate(self, request, client):
+        """Redirect to the login callback, or back to the login page with an error."""
+        form = await request.post()
+        relay = form.get("relayState", "")
+        if (
+            self.logins.get(relay) != client
+            or form.get("hmac") != self.hmac(relay, form.get("email"))
+            or form.get("email") != STANDIN_USERNAME
+            or form.get("password") != STANDIN_PASSWORD
+        ):
+            query = urlencode({"relayState": relay, "error": "login.errors.password_invalid"})
+            raise web.HTTPFound(f"{ISSUER}/signin-service/v1/{client}/login/authenticate?{query}")
+        raise web.HTTPFound(f"{ISSUER}/oidc/v1/oauth/client/callback?relayState={relay}")
+
+    async def callback(self, request):
+        """Redirect to the app with an authorization code in the fragment."""
+        client = self.logins.pop(request.query.get("relayState", ""), None)
+        if client is None:
+            raise web.HTTPFound(f"{LOGIN_REDIRECT}?error=invalid_request")
+        code = uuid.uuid4().hex
+        self.codes[code] = client
+        fragment = urlencode({"code": code, "id_token": self.token(client), "token_type": "bearer"})
+        raise web.HTTPFound(f"{LOGIN_REDIRECT}#{fragment}")
+
+    async def keys(self, request):
+        """Return the key that signs all tokens."""
+        key = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.key.public_key()))
+        key.update(kid=self.key_id, use="sig", alg="RS256")
+        return web.json_response({"keys": [key]})
+
+    # Tokens
+
+    async def skoda_token(self, request):
+        """Exchange an authorization code for Skoda API tokens."""
+        body = await request.json()
+        client = self.codes.pop(body.get("authorizationCode"), None)
+        if client is None:
+            return web.json_response({"error": "invalid_grant"}, status=400)
+        return web.json_response(self.tokens(client))
+
+    async def skoda_refresh(self, request):
+        """Exchange a refresh token for new Skoda API tokens."""
+        body = await request.json()
+        claims = self.decode(body.get("refreshToken", ""))
+        if claims is None or claims.get("typ") != "refresh_token":
+            return web.json_response({"error": "invalid_grant"}, status=400)
+        return web.json_response(self.tokens(claims["aud"]))
+
+    async def mbb_token(self, request):
+        """Exchange an identity or refresh token for VW-Group API tokens."""
+        form = await request.post()
+        claims = self.decode(form.get("token", ""))
+        if claims is None or form.get("grant_type") not in ("id_token", "refresh_token"):
+            return web.json_response({"error": "invalid_grant"}, status=400)
+        return web.json_response(
+            {
+                "access_token": self.token("mal.prd.ece.vwg-connect.com"),
+                # The library expects no audience in the refresh token
+                "refresh_token": self.token(lifetime=86400, jtt="RT"),
+                "token_type": "bearer",
+                "expires_in": 3600,
+            }
+        )
+
+    async def revoke(self, request):
+        """Accept any token revocation."""
+        return web.Response(status=200)
+
+    # Profile
+
+    async def check_profile(self, request):
+        """Return a profile without missing consent."""
+        return web.json_response(
+            {"mandatoryConsentInfo": {"status": "VALID", "id": "standin-terms"}}
+        )
+
+    async def real_car_data(self, request):
+        """Return nicknames and activation of the vehicles."""
+        return web.json_response(
+            {"realCars": [vehicle.real_car() for vehicle in self.vehicles.values()]}
+        )
+
+    # Vehicles
+
+    async def garage(self, request):
+        """Return the vehicles of the account."""
+        return web.json_response(
+            {"vehicles": [vehicle.garage() for vehicle in self.vehicles.values()]}
+        )
+
+    async def user_vehicles(self, request):
+        """Return the VINs of the account."""
+        return web.json_response({"userVehicles": {"vehicle": list(self.vehicles)}})
+
+    async def home_region(self, request, vin):
+        """Return the home region of a vehicle, the default region."""
+        self.vehicle(vin)
+        return web.json_response({"homeRegion": {"baseUri": {"content": HOME_REGION}}})
+
+    async def operations(self, request, vin):
+        """Return the services and operations a vehicle supports."""
+        vehicle = self.vehicle(vin)
+        services = [
+            "statusreport_v1",
+            "rheating_v1",
+            "rclima_v1",
+            "carfinder_v1",
+            "trip_statistic_v1",
+            "rlu_v1",
+            "rhonk_v1",
+        ]
+        if vehicle.electric:
+            services += ["rbatterycharge_v1", "timerprogramming_v1"]
+        return web.json_response(
+            {
+                "operationList": {
+                    "vin": vin,
+                    "serviceInfo": [
+                        {
+                            "serviceId": service,
+                            "serviceStatus": {"status": "Enabled"},
+                            "licenseRequired": False,
+                            "cumulatedLicense": {
+                                "expirationDate": {"content": "2099-12-31T00:00:00Z"}
+                            },
+                            "operation": [{"id": "all"}],
+                        }
+                        for service in services
+                    ],
+                }
+            }
+        )
+
+    async def model_image(self, request):
+        """Redirect to a model image."""
+        vin = request.query.get("vin", "")
+        view = request.query.get("view", "")
+        raise web.HTTPFound(f"https://iaservices.skoda-auto.com/standin/{vin}-{view}.png")
+
+    def data(self, group):
+        """Return a handler for a data group of a vehicle."""
+
+        async def handler(request, vin):
+            body = getattr(self.vehicle(vin), group)()
+            if body is None:
+                return web.Response(status=204)
+            return web.json_response(body)
+
+        return handler
+
+    # Commands
+
+    async def action(self, request, service, vin):
+        """Queue a command request that completes asynchronously."""
+        vehicle = self.vehicle(vin)
+        text = await request.text()
+        try:
+            body = json.loads(text) if text else {}
+        except ValueError:
+            # Lock and unlock are sent as XML
+            match = re.search(r"<action>(\w+)</action>", text)
+            body = {"action": {"type": match.group(1)}} if match else {}
+        action = body.get("action", body)
+        if service == "departuretimer":
+            timers = action.get("timersAndProfiles", {})
+            settings = timers.get("timerBasicSetting", {})
+            action = {
+                "timers": [
+                    {
+                        "id": timer.get("timerID"),
+                        "enabled": timer.get("timerProgrammedStatus") == "programmed",
+                        "recurring": timer.get("timerFrequency") == "cyclic",
+                        "time": timer.get("departureTimeOfDay"),
+                        "days": timer.get("departureWeekdayMask"),
+                    }
+                    for timer in timers.get("timerList", {}).get("timer", [])
+                ],
+                "chargeMinLimit": settings.get("chargeMinLimit"),
+                "targetTemperature": settings.get("targetTemperature"),
+            }
+        command = StandinCommand(
+            vehicle,
+            service,
+            action,
+            self.command_delay,
+            self.rng.random() < self.command_error_rate,
+        )
+        self.commands[command.id] = command
+        if service == "rlu":
+            return web.json_response({"rluActionResponse": {"requestId": command.id}})
+        if service == "rs":
+            return web.json_response({"performActionResponse": {"requestId": command.id}})
+        if service == "vsr":
+            return web.json_response({"CurrentVehicleDataResponse": {"requestId": command.id, "vin": vin}})
+        if service == "rhf":
+            return web.json_response({"honkAndFlashRequest": {"id": command.id, "status": {"statusCode": "queued"}}})
+        return web.json_response({"action": {"actionId": command.id, "actionState": "queued"}})
+
+    async def action_status(self, request, vin, id, **kwargs):
+        """Return the progress of a command request."""
+        command = self.commands.get(id)
+        if command is None:
+            raise web.HTTPNotFound()
+        state = command.state
+        if command.service in ("rlu", "rs", "vsr", "rhf"):
+            status = {
+                "queued": "request_in_progress",
+                "fetched": "request_in_progress",
+                "succeeded": "request_successful",
+                "failed": "request_fail",
+            }[state]
+            return web.json_response({"requestStatusResponse": {"status": status}})
+        return web.json_response({"action": {"actionId": id, "actionState": state}})
+
+    async def spin_requested(self, request, vin):
+        """Return an S-PIN challenge."""
+        self.vehicle(vin)
+        return web.json_response(
+            {
+                "securityPinAuthInfo": {
+                    "securityToken": uuid.uuid4().hex,
+                    "securityPinTransmission": {
+                        "challenge": uuid.uuid4().hex + uuid.uuid4().hex,
+                        "hashProcedureVersion": 1,
+                        "userChallenge": uuid.uuid4().hex[:16],
+                    },
+                }
+            }
+        )
+
+    async def spin_completed(self, request):
+        """Return a security token if the S-PIN hash matches the challenge."""
+        body = (await request.json()).get("securityPinAuthentication", {})
+        challenge = body.get("securityPin", {}).get("challenge", "")
+        expected = hashlib.sha512(bytes.fromhex(STANDIN_SPIN) + bytes.fromhex(challenge)).hexdigest()
+        if body.get("securityPin", {}).get("securityPinHash") != expected:
+            return web.json_response({"error": "Invalid S-PIN"}, status=403)
+        return web.json_response({"securityToken": uuid.uuid4().hex})
+
+
+class StandinSession:
+    """Client session that sends requests for the API hosts to the stand-in.
+
+    Wraps an aiohttp ClientSession, everything but the request URL is passed on.
+    """
+
+    def __init__(self, session, url):
+        self._session = session
+        self._url = URL(url)
+
+    def rewrite(self, url):
+        """Return the stand-in URL for a request to an API host."""
+        url = URL(str(url))
+        if url.host not in API_HOSTS:
+            return url
+        return self._url.with_path(f"/{url.host}{url.path}").with_query(url.query)
+
+    def request(self, method, url, **kwargs):
+        """Send a request, to the stand-in if it is for an API host."""
+        return self._session.request(method, self.rewrite(url), **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def main():
+    """Run the stand-in from the command line."""
+    parser = argparse.ArgumentParser(description="Offline Skoda Connect API stand-in")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--vehicles", type=int, default=1, help="number of vehicles")
+    parser.add_argument("--latency", type=float, default=0, help="latency per request in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="random extra latency in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests throttled with 429")
+    parser.add_argument("--rate-limit", type=int, default=None, help="requests per minute before throttling")
+    parser.add_argument("--command-delay", type=float, default=DEFAULT_COMMAND_DELAY, help="seconds until commands complete")
+    parser.add_argument("--command-error-rate", type=float, default=0.0, help="fraction of commands failing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    standin = SkodaStandin(
+        vehicles=args.vehicles,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit,
+        command_delay=args.command_delay,
+        command_error_rate=args.command_error_rate,
+        seed=args.seed,
+    )
+
+    async def serve():
+        await standin.async_start(args.host, args.port)
+        print(f"Username: {STANDIN_USERNAME}, password: {STANDIN_PASSWORD}, S-PIN: {STANDIN_SPIN}")
+        print("VINs: " + ", ".join(standin.vehicles))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await standin.async_stop()
+            print(json.dumps({"requests": standin.stats, "unrouted": standin.unrouted}, indent=2))
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()